@@ -1,3 +1,6 @@
+// Plots are served on demand by the backend; the report only carries their URLs.
+const API_BASE = "https://automl-backend-izju.onrender.com";
+
 export default function EdaStep({ backendData, setStep }) {
   const { eda, plots } = backendData;
 
@@ -52,7 +55,7 @@ export default function EdaStep({ backendData, setStep }) {
                   {plots[`hist_${col}`] && (
                     <div className="bg-gray-900/50 p-3 rounded-xl border border-gray-700">
                       <img
-                        src={`data:image/png;base64,${plots[`hist_${col}`]}`}
+                        src={`${API_BASE}${plots[`hist_${col}`].url}`}
                         alt={`Histogram of ${col}`}
                         className="w-full rounded-lg"
                       />
@@ -61,7 +64,7 @@ export default function EdaStep({ backendData, setStep }) {
                   {plots[`box_${col}`] && (
                     <div className="bg-gray-900/50 p-3 rounded-xl border border-gray-700">
                       <img
-                        src={`data:image/png;base64,${plots[`box_${col}`]}`}
+                        src={`${API_BASE}${plots[`box_${col}`].url}`}
                         alt={`Boxplot of ${col}`}
                         className="w-full rounded-lg"
                       />
@@ -108,7 +111,7 @@ export default function EdaStep({ backendData, setStep }) {
                   {plots[`count_${col}`] && (
                     <div className="bg-gray-900/50 p-3 rounded-xl border border-gray-700">
                       <img
-                        src={`data:image/png;base64,${plots[`count_${col}`]}`}
+                        src={`${API_BASE}${plots[`count_${col}`].url}`}
                         alt={`Countplot of ${col}`}
                         className="w-full rounded-lg"
                       />
@@ -117,7 +120,7 @@ export default function EdaStep({ backendData, setStep }) {
                   {plots[`pie_${col}`] && (
                     <div className="bg-gray-900/50 p-3 rounded-xl border border-gray-700">
                       <img
-                        src={`data:image/png;base64,${plots[`pie_${col}`]}`}
+                        src={`${API_BASE}${plots[`pie_${col}`].url}`}
                         alt={`Pie chart of ${col}`}
                         className="w-full rounded-lg"
                       />
@@ -142,7 +145,7 @@ export default function EdaStep({ backendData, setStep }) {
           
           <div className="bg-gray-900/50 p-5 rounded-2xl border border-gray-700">
             <img
-              src={`data:image/png;base64,${plots.correlation_heatmap}`}
+              src={`${API_BASE}${plots.correlation_heatmap.url}`}
               alt="Correlation Heatmap"
               className="w-full rounded-lg"
             />
@@ -2,12 +2,12 @@ import axios from "axios";
 import toast from "react-hot-toast";
 
 export default function TrainingStep({ backendData, setStep }) {
-  const { model_comparison, best_model } = backendData;
+  const { model_comparison, best_model, run_id } = backendData;
   
   const handleDownload = async () => {
     try {
       const res = await axios.get(
-        `https://automl-backend-izju.onrender.com/download-model/${best_model.name}`,
+        `https://automl-backend-izju.onrender.com/download-model/?run_id=${encodeURIComponent(run_id)}`,
         {
           responseType: "blob",
         }
@@ -16,7 +16,9 @@ export default function TrainingStep({ backendData, setStep }) {
       const url = window.URL.createObjectURL(new Blob([res.data]));
       const link = document.createElement("a");
       link.href = url;
-      link.setAttribute("download", "trained_model.pkl");
+      // The backend names the file after its format (.joblib, .ubj, legacy .pkl, ...)
+      const match = /filename="?([^"]+)"?/.exec(res.headers["content-disposition"] || "");
+      link.setAttribute("download", match ? match[1] : "trained_model.joblib");
       document.body.appendChild(link);
       link.click();
       link.remove();
@@ -3,11 +3,105 @@ import { useState } from "react";
 import axios from "axios";
 import toast, { Toaster } from "react-hot-toast";
 
+const JOB_POLL_INTERVAL_MS = 2000;
+
+const STAGE_LABELS = {
+  load: "Loading data",
+  split: "Splitting",
+  clean: "Cleaning",
+  feature_engineering: "Feature engineering",
+  train_candidates: "Training candidates",
+  tune: "Tuning",
+  save_model: "Saving model",
+  report: "Building report",
+};
+
+const formatEta = (seconds) => {
+  if (seconds === null || seconds === undefined) return "";
+  if (seconds < 60) return `~${Math.ceil(seconds)}s left`;
+  return `~${Math.ceil(seconds / 60)} min left`;
+};
+
+// Poll /jobs/{id} until the job leaves the queued / running states.
+const pollJob = async (jobId) => {
+  let job = { status: "queued" };
+  while (job.status === "queued" || job.status === "running") {
+    await new Promise((resolve) => setTimeout(resolve, JOB_POLL_INTERVAL_MS));
+    const poll = await axios.get(
+      `https://automl-backend-izju.onrender.com/jobs/${jobId}`
+    );
+    job = poll.data;
+  }
+  return job;
+};
+
+// Follow a job's Server-Sent Events (stage, candidate, tuning, ETA) and resolve with
+// the finished job; falls back to polling if the stream can't be opened or drops.
+const followJob = (jobId, onProgress) =>
+  new Promise((resolve, reject) => {
+    if (typeof EventSource === "undefined") {
+      pollJob(jobId).then(resolve, reject);
+      return;
+    }
+    const source = new EventSource(
+      `https://automl-backend-izju.onrender.com/jobs/${jobId}/events`
+    );
+    let settled = false;
+    const settle = (promise) => {
+      if (settled) return;
+      settled = true;
+      source.close();
+      promise.then(resolve, reject);
+    };
+
+    ["snapshot", "resync"].forEach((type) =>
+      source.addEventListener(type, (event) => {
+        const snapshot = JSON.parse(event.data);
+        onProgress(() => ({ ...snapshot, leaderboard: snapshot.leaderboard || [] }));
+      })
+    );
+    source.addEventListener("stage", (event) => {
+      const data = JSON.parse(event.data);
+      onProgress((progress) => ({
+        ...progress,
+        eta_s: data.eta_s,
+        ...(data.status === "started" ? { stage: data.stage, stage_index: data.index } : {}),
+      }));
+    });
+    source.addEventListener("candidate", (event) => {
+      const data = JSON.parse(event.data);
+      onProgress((progress) => {
+        const others = (progress.leaderboard || []).filter((entry) => entry.Model !== data.result.Model);
+        const leaderboard = [...others, data.result].sort(
+          (a, b) => (b.Score ?? -Infinity) - (a.Score ?? -Infinity)
+        );
+        return { ...progress, leaderboard, eta_s: data.eta_s };
+      });
+    });
+    source.addEventListener("tuning", (event) => {
+      const data = JSON.parse(event.data);
+      onProgress((progress) => ({ ...progress, tuning: data, eta_s: data.eta_s }));
+    });
+    source.addEventListener("search", (event) => {
+      const data = JSON.parse(event.data);
+      onProgress((progress) => ({ ...progress, search: data, eta_s: data.eta_s }));
+    });
+    source.addEventListener("finished", () =>
+      settle(
+        axios
+          .get(`https://automl-backend-izju.onrender.com/jobs/${jobId}`)
+          .then((res) => res.data)
+      )
+    );
+    source.onerror = () => settle(pollJob(jobId));
+  });
+
 export default function UploadSection({ setStep, setBackendData, filename, setFilename, columns, setColumns }) {
   const [file, setFile] = useState(null);
   const [target, setTarget] = useState("");
   const [loading, setLoading] = useState(false);
   const [isDragging, setIsDragging] = useState(false);
+  const [progress, setProgress] = useState(null);
 
   const handleDragOver = (e) => {
     e.preventDefault();
@@ -80,8 +174,20 @@ export default function UploadSection({ setStep, setBackendData, filename, setFi
         { headers: { "Content-Type": "multipart/form-data" } }
       );
 
+      // The backend queues the run and returns a job ID (or the cached result right away);
+      // follow its progress stream until it finishes.
+      let job = res.data;
+      if (job.job_id && (job.status === "queued" || job.status === "running")) {
+        setProgress({ status: "queued", leaderboard: [] });
+        job = await followJob(job.job_id, setProgress);
+      }
+
+      if (job.status !== "succeeded") {
+        throw { response: { data: { error: job.error || `Job ${job.status}` } } };
+      }
+
       toast.success("AutoML process completed!");
-      setBackendData(res.data);
+      setBackendData(job.result);
       setStep(1);
     } catch (error) {
       console.error("AutoML failed:", error.response?.data || error.message);
@@ -90,6 +196,7 @@ export default function UploadSection({ setStep, setBackendData, filename, setFi
       );
     } finally {
       setLoading(false);
+      setProgress(null);
     }
   };
 
@@ -242,6 +349,68 @@ export default function UploadSection({ setStep, setBackendData, filename, setFi
                   </>
                 )}
               </button>
+
+              {loading && progress && (
+                <div className="mt-6 p-6 bg-gray-800/60 rounded-xl border border-gray-700 space-y-4">
+                  <div className="flex items-center justify-between text-sm">
+                    <span className="text-white font-medium">
+                      {progress.stage ? STAGE_LABELS[progress.stage] || progress.stage : "Queued"}
+                    </span>
+                    <span className="text-gray-400">{formatEta(progress.eta_s)}</span>
+                  </div>
+                  <div className="w-full h-2 bg-gray-700 rounded-full overflow-hidden">
+                    <div
+                      className="h-2 bg-gradient-to-r from-purple-600 to-cyan-500 transition-all duration-500"
+                      style={{
+                        width: `${Math.round(
+                          (100 * ((progress.stage_index ?? -1) + 1)) / Object.keys(STAGE_LABELS).length
+                        )}%`,
+                      }}
+                    />
+                  </div>
+
+                  {progress.tuning && (
+                    <p className="text-sm text-gray-300">
+                      Tuning {progress.tuning.model}: {progress.tuning.completed}/{progress.tuning.total} configurations
+                      {progress.tuning.best_score !== null && progress.tuning.best_score !== undefined
+                        ? `, best CV score ${progress.tuning.best_score.toFixed(4)}`
+                        : ""}
+                    </p>
+                  )}
+
+                  {progress.search && (
+                    <p className="text-sm text-gray-300">
+                      Search: {progress.search.completed} fits
+                      {progress.search.best_family
+                        ? `, best so far ${progress.search.best_family} (${progress.search.best_score.toFixed(4)})`
+                        : ""}
+                    </p>
+                  )}
+
+                  {progress.leaderboard && progress.leaderboard.length > 0 && (
+                    <table className="w-full text-sm text-left">
+                      <thead className="text-gray-400">
+                        <tr>
+                          <th className="py-1">Model</th>
+                          <th className="py-1">Score</th>
+                          <th className="py-1">Rows</th>
+                        </tr>
+                      </thead>
+                      <tbody className="text-gray-200">
+                        {progress.leaderboard.map((entry) => (
+                          <tr key={entry.Model} className="border-t border-gray-700">
+                            <td className="py-1">{entry.Model}</td>
+                            <td className="py-1">
+                              {entry.Score !== null && entry.Score !== undefined ? entry.Score.toFixed(4) : entry.Status}
+                            </td>
+                            <td className="py-1">{entry.Train_Rows ?? ""}</td>
+                          </tr>
+                        ))}
+                      </tbody>
+                    </table>
+                  )}
+                </div>
+              )}
             </div>
           )}
         </div>
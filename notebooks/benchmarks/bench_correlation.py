@@ -0,0 +1,92 @@
+# bench_correlation.py
+"""
+Correlation cost of the report on wide synthetic data (benchmarks/datasets.py).
+
+    python benchmarks/bench_correlation.py --rows 50000 --numeric 100 500 1000 --categorical 20
+
+For every case the previous approach (DataFrame.corr over all numeric
+columns for the target correlations, again for the heatmap, drawn with
+one annotation per cell) is compared with correlation.correlation_summary
+(float32 blockwise pass, sampled rows, top-k pairs, categorical
+associations) plus correlation.heatmap_frame (capped, clustered).
+Reported: wall time, peak traced allocation and heatmap render time.
+--skip-pandas-heatmap avoids drawing the annotated full-size heatmap,
+which takes minutes at 500+ columns.
+"""
+import os
+import sys
+import json
+import argparse
+import itertools
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import numpy as np
+
+from datasets import make_dataset
+from bench_pipeline import measure, environment
+from correlation import correlation_summary, heatmap_frame
+from reporting import render_plot
+
+
+def bench_case(df, repeats=1, pandas_heatmap=True):
+    num_cols = df.select_dtypes(include=[np.number]).columns.tolist()
+    cat_cols = df.select_dtypes(exclude=[np.number]).columns.tolist()
+    results = {}
+
+    def previous():
+        target = df.corr(numeric_only=True)["target"] if "target" in num_cols else None
+        return target, df[num_cols].corr()
+    (_, matrix), results["pandas"] = measure(previous, repeats)
+    if pandas_heatmap:
+        _, render = measure(lambda: render_plot("heatmap", None, matrix), 1, memory=False)
+        results["pandas"]["heatmap_render_s"] = render["wall_s"]
+
+    summary, results["engine"] = measure(
+        lambda: correlation_summary(df, num_cols, cat_cols, target="target"), repeats)
+    frame, heatmap = measure(lambda: heatmap_frame(df), repeats)
+    _, render = measure(lambda: render_plot("heatmap", None, frame), 1, memory=False)
+    results["engine"].update(heatmap_s=heatmap["wall_s"], heatmap_peak_mb=heatmap["peak_mb"],
+                             heatmap_render_s=render["wall_s"], heatmap_columns=len(frame.columns),
+                             n_pairs=len(summary["top_pairs"]), n_associations=len(summary["associations"]))
+    return results
+
+
+def run(grid, repeats=1, pandas_heatmap=True, output=None):
+    cases = []
+    keys = list(grid)
+    for values in itertools.product(*(grid[k] for k in keys)):
+        case = dict(zip(keys, values))
+        print(f"--- {','.join(f'{k}={v}' for k, v in case.items())}")
+        results = bench_case(make_dataset(**case), repeats, pandas_heatmap)
+        p, e = results["pandas"], results["engine"]
+        print(f"pandas {p['wall_s']:8.3f}s{p['peak_mb']:9.1f} MB peak  heatmap render "
+              f"{p.get('heatmap_render_s', float('nan')):8.3f}s")
+        print(f"engine {e['wall_s']:8.3f}s{e['peak_mb']:9.1f} MB peak  heatmap {e['heatmap_s']:8.3f}s + render "
+              f"{e['heatmap_render_s']:8.3f}s ({e['heatmap_columns']} columns)")
+        cases.append({"case": case, "results": results})
+
+    report = {"environment": environment(), "grid": grid, "repeats": repeats, "cases": cases}
+    if output:
+        with open(output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"results written to {output}")
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, nargs="+", default=[50000])
+    parser.add_argument("--numeric", type=int, nargs="+", default=[50, 500])
+    parser.add_argument("--categorical", type=int, nargs="+", default=[10])
+    parser.add_argument("--cardinality", type=int, nargs="+", default=[20])
+    parser.add_argument("--repeats", type=int, default=1)
+    parser.add_argument("--skip-pandas-heatmap", action="store_true")
+    parser.add_argument("--output", default="bench_correlation.json")
+    args = parser.parse_args()
+
+    grid = {
+        "rows": args.rows, "n_numeric": args.numeric, "n_categorical": args.categorical,
+        "cardinality": args.cardinality, "problem_type": ["regression"],
+    }
+    run(grid, args.repeats, not args.skip_pandas_heatmap, args.output)
@@ -0,0 +1,111 @@
+# bench_encoding.py
+"""
+Memory and fit time of PreprocessingPipeline's categorical encodings on
+wide, high-cardinality synthetic data (benchmarks/datasets.py).
+
+    python benchmarks/bench_encoding.py --rows 20000 --categorical 20 --cardinality 10 1000
+
+For every case the "label" pipeline (one dense float matrix of integer
+codes) is compared with encoding="auto" (sparse one-hot up to
+AUTOML_ONEHOT_MAX_CATEGORIES levels, out-of-fold target / frequency
+encoding above): encode time, peak traced allocation, size of the encoded
+training matrix and the fit time and test score of a LogisticRegression and
+an XGBoost model on it.
+"""
+import os
+import sys
+import json
+import argparse
+import itertools
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from scipy import sparse
+from sklearn.linear_model import LogisticRegression, Ridge
+from sklearn.model_selection import train_test_split
+from xgboost import XGBClassifier, XGBRegressor
+
+from datasets import make_dataset
+from bench_pipeline import measure, environment
+from functions import score_model
+from preprocessing import TargetEncoder, PreprocessingPipeline
+
+
+def matrix_mb(X):
+    if sparse.issparse(X):
+        return (X.data.nbytes + X.indices.nbytes + X.indptr.nbytes) / 1024 ** 2
+    return X.memory_usage(deep=True).sum() / 1024 ** 2 if hasattr(X, "memory_usage") else X.nbytes / 1024 ** 2
+
+
+def bench_case(df, problem_type, repeats=1):
+    X, y = df.drop(columns=["target"]), df["target"]
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
+    target_encoder = TargetEncoder().fit(y)
+    y_train_enc, y_test_enc = target_encoder.transform(y_train), target_encoder.transform(y_test)
+    linear = LogisticRegression(max_iter=500) if problem_type == "classification" else Ridge()
+    boosted = (XGBClassifier if problem_type == "classification" else XGBRegressor)(
+        n_estimators=100, max_depth=3, learning_rate=0.1, tree_method="hist")
+
+    results = {}
+    for encoding in ("label", "auto"):
+        def encode():
+            pre = PreprocessingPipeline(encoding=encoding, target_type=problem_type)
+            return pre, pre.fit_transform(X_train, y_train_enc), pre.transform(X_test)
+        (pre, X_tr, X_te), stats = measure(encode, repeats)
+        stats["matrix_mb"] = matrix_mb(X_tr)
+        stats["n_features"] = X_tr.shape[1]
+        stats["sparse"] = sparse.issparse(X_tr)
+
+        views = {"linear": (linear, X_tr, X_te)}
+        if encoding == "auto" and pre.view_ != "dense":
+            views["xgboost"] = (boosted.set_params(enable_categorical=True),
+                                pre.transform(X_train, view="xgboost", oof_target=y_train_enc),
+                                pre.transform(X_test, view="xgboost"))
+        else:
+            views["xgboost"] = (boosted.set_params(enable_categorical=False), X_tr, X_te)
+        for name, (model, A, B) in views.items():
+            _, fit = measure(lambda: model.fit(A, y_train_enc), repeats, memory=False)
+            stats[f"{name}_fit_s"] = fit["wall_s"]
+            stats[f"{name}_score"] = score_model(model, B, y_test_enc, problem_type)[1]
+        results[encoding] = stats
+    return results
+
+
+def run(grid, repeats=1, output=None):
+    cases = []
+    keys = list(grid)
+    for values in itertools.product(*(grid[k] for k in keys)):
+        case = dict(zip(keys, values))
+        print(f"--- {','.join(f'{k}={v}' for k, v in case.items())}")
+        results = bench_case(make_dataset(**case), case["problem_type"], repeats)
+        for encoding, s in results.items():
+            print(f"{encoding:<6}{s['wall_s']:8.3f}s encode{s['peak_mb']:9.1f} MB peak{s['matrix_mb']:9.1f} MB matrix"
+                  f"{s['n_features']:6d} cols  linear {s['linear_fit_s']:7.3f}s / {s['linear_score']:.3f}"
+                  f"  xgboost {s['xgboost_fit_s']:7.3f}s / {s['xgboost_score']:.3f}")
+        cases.append({"case": case, "results": results})
+
+    report = {"environment": environment(), "grid": grid, "repeats": repeats, "cases": cases}
+    if output:
+        with open(output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"results written to {output}")
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, nargs="+", default=[20000])
+    parser.add_argument("--numeric", type=int, nargs="+", default=[10])
+    parser.add_argument("--categorical", type=int, nargs="+", default=[20])
+    parser.add_argument("--cardinality", type=int, nargs="+", default=[10, 1000])
+    parser.add_argument("--problem", nargs="+", choices=["classification", "regression"],
+                        default=["classification"])
+    parser.add_argument("--repeats", type=int, default=1)
+    parser.add_argument("--output", default="bench_encoding.json")
+    args = parser.parse_args()
+
+    grid = {
+        "rows": args.rows, "n_numeric": args.numeric, "n_categorical": args.categorical,
+        "cardinality": args.cardinality, "problem_type": args.problem,
+    }
+    run(grid, args.repeats, args.output)
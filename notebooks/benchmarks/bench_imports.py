@@ -0,0 +1,102 @@
+# bench_imports.py
+"""
+Cold-start cost of the backend modules: wall time, peak RSS and which heavy
+libraries each import drags in, every module in a fresh interpreter.
+
+    python benchmarks/bench_imports.py
+    python benchmarks/bench_imports.py --modules main jobs --repeats 5 --top 10 --output imports.json
+
+`main` is what a uvicorn worker pays before serving its first request and
+`jobs` what a spawned job worker pays before starting a run; `warmup` rows
+show the cost AUTOML_PREWARM moves off the request path. --top lists the
+slowest imports (cumulative, from python -X importtime) of each module.
+"""
+import os
+import sys
+import json
+import argparse
+import subprocess
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_pipeline import environment
+
+NOTEBOOKS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+HEAVY = ("scipy", "scipy.stats", "sklearn", "xgboost", "matplotlib", "seaborn", "pyarrow")
+
+_CHILD = """
+import sys, time, json, resource
+sys.path.insert(0, {path!r})
+started = time.perf_counter()
+{statement}
+wall = time.perf_counter() - started
+try:
+    # VmHWM: ru_maxrss can carry over the peak of the process that spawned this one
+    with open("/proc/self/status") as f:
+        peak = next(int(l.split()[1]) for l in f if l.startswith("VmHWM")) / 1024
+except (OSError, StopIteration):
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / (1 if sys.platform == "darwin" else 1024) / 1024
+print(json.dumps({{"wall_s": wall, "peak_rss_mb": peak, "loaded": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+
+def measure_import(statement, repeats=3):
+    """Best-of-`repeats` wall time of `statement` in a fresh interpreter, with its peak RSS."""
+    runs = []
+    for _ in range(repeats):
+        code = _CHILD.format(path=NOTEBOOKS, statement=statement, heavy=HEAVY)
+        out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, cwd=NOTEBOOKS,
+                             check=True)
+        runs.append(json.loads(out.stdout.strip().splitlines()[-1]))
+    return min(runs, key=lambda r: r["wall_s"])
+
+
+def slowest_imports(module, top=10):
+    """(cumulative seconds, module) of the `top` slowest imports under `import module`."""
+    out = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"], capture_output=True,
+                         text=True, cwd=NOTEBOOKS)
+    rows = []
+    for line in out.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        try:
+            rows.append((int(cumulative) / 1e6, name.strip()))
+        except ValueError:
+            continue
+    return sorted(rows, reverse=True)[:top]
+
+
+def run(modules, repeats=3, top=0, output=None):
+    statements = {m: f"import {m}" for m in modules}
+    statements["warmup.prewarm(TRAINING_MODULES)"] = "import warmup; warmup.prewarm(warmup.TRAINING_MODULES)"
+    statements["warmup.prewarm(SERVING_MODULES)"] = "import warmup; warmup.prewarm(warmup.SERVING_MODULES)"
+    baseline = measure_import("pass", repeats)
+    print(f"{'interpreter':<36}{baseline['wall_s']:8.3f}s{baseline['peak_rss_mb']:9.1f} MB")
+    results = []
+    for name, statement in statements.items():
+        r = dict(measure_import(statement, repeats), module=name)
+        print(f"{name:<36}{r['wall_s']:8.3f}s{r['peak_rss_mb']:9.1f} MB  loads: {', '.join(r['loaded']) or '-'}")
+        if top and name in modules:
+            r["slowest"] = slowest_imports(name, top)
+            for seconds, imported in r["slowest"]:
+                print(f"    {seconds:8.3f}s  {imported}")
+        results.append(r)
+
+    report = {"environment": environment(), "interpreter": baseline, "results": results}
+    if output:
+        with open(output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"results written to {output}")
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--modules", nargs="+",
+                        default=["main", "jobs", "pipeline", "registry", "reporting", "functions"])
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--top", type=int, default=0, help="list the N slowest imports per module")
+    parser.add_argument("--output", default="bench_imports.json")
+    args = parser.parse_args()
+    run(args.modules, args.repeats, args.top, args.output)
@@ -0,0 +1,227 @@
+# bench_pipeline.py
+"""
+Time and memory of every pipeline stage in functions.py, and of the whole
+run_automl_pipeline, over a grid of synthetic datasets (benchmarks/datasets.py).
+
+    python benchmarks/bench_pipeline.py --rows 1000 10000 --numeric 10 50 --categorical 5 \\
+        --cardinality 10 1000 --missing 0.05 --problem classification regression \\
+        --output bench.json
+    python benchmarks/bench_pipeline.py ... --output new.json --compare bench.json
+
+Each function is timed `--repeats` times (best wall / CPU seconds kept),
+then run once more under tracemalloc for its peak Python + numpy
+allocation (native buffers of XGBoost or sklearn's C code aren't traced). Candidate screening runs in-process (n_jobs=1) so it is
+measured; tune_best_model's cross-validation workers are not covered by
+tracemalloc. The full run executes in a fresh spawned process whose peak
+RSS is reported. Results go to a JSON file; --compare flags entries that got
+slower than --threshold times the baseline and exits non-zero.
+"""
+import os
+import sys
+import json
+import time
+import platform
+import argparse
+import itertools
+import subprocess
+import tempfile
+import tracemalloc
+import multiprocessing as mp
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from datasets import make_dataset
+from functions import (
+    load_and_validate_csv, automated_train_test_split, clean_data, feature_engineering, detect_problem_type,
+    get_candidate_models, train_candidates, select_best_model, tune_best_model, evaluate_model,
+    generate_report_json
+)
+from preprocessing import PreprocessingPipeline, TargetEncoder
+
+STAGE_ORDER = ["load_and_validate_csv", "automated_train_test_split", "clean_data", "feature_engineering",
+               "PreprocessingPipeline", "detect_problem_type", "train_candidates", "tune_best_model",
+               "evaluate_model", "generate_report_json"]
+
+
+def measure(fn, repeats=1, memory=True):
+    """Run fn `repeats` times; returns (last result, {wall_s, cpu_s, peak_mb})."""
+    walls, cpus = [], []
+    for _ in range(repeats):
+        w, c = time.perf_counter(), time.process_time()
+        out = fn()
+        walls.append(time.perf_counter() - w)
+        cpus.append(time.process_time() - c)
+    stats = {"wall_s": min(walls), "cpu_s": min(cpus)}
+    if memory:
+        tracemalloc.start()
+        try:
+            out = fn()
+            stats["peak_mb"] = tracemalloc.get_traced_memory()[1] / 1024 ** 2
+        finally:
+            tracemalloc.stop()
+    return out, stats
+
+
+def bench_functions(csv_path, repeats=1, memory=True, tune_iter=5):
+    """Per-stage measurements for one dataset; stages consume the previous stage's output."""
+    results = {}
+
+    def run(name, fn):
+        out, results[name] = measure(fn, repeats, memory)
+        return out
+
+    df = run("load_and_validate_csv", lambda: load_and_validate_csv(csv_path))
+    X, y = df.drop(columns=["target"]), df["target"]
+    X_train, X_test, y_train, y_test = run("automated_train_test_split", lambda: automated_train_test_split(X, y))
+
+    Xtr, Xte, _, cleaning = run("clean_data", lambda: clean_data(X_train, X_test, verbose=False))
+    # feature_engineering encodes in place, so every repeat gets fresh copies
+    run("feature_engineering", lambda: feature_engineering(Xtr.copy(), Xte.copy(), y_train.loc[Xtr.index], y_test))
+
+    def preprocess():
+        pre = PreprocessingPipeline().fit(X_train)
+        return pre.transform(X_train), pre.transform(X_test)
+    X_train_enc, X_test_enc = run("PreprocessingPipeline", preprocess)
+
+    problem_type = run("detect_problem_type", lambda: detect_problem_type(y))
+    target_encoder = TargetEncoder().fit(y)
+    y_train_enc, y_test_enc = target_encoder.transform(y_train), target_encoder.transform(y_test)
+
+    candidates = get_candidate_models(problem_type)
+    metrics_list, scores_list, models_list, names_list = run("train_candidates", lambda: train_candidates(
+        candidates, X_train_enc, X_test_enc, y_train_enc, y_test_enc, problem_type, n_jobs=1))
+    best_model, best_name, _ = select_best_model(scores_list, models_list, names_list)
+    tuned = run("tune_best_model", lambda: tune_best_model(
+        best_name, best_model, X_train_enc, y_train_enc, problem_type, n_iter=tune_iter))
+    run("evaluate_model", lambda: evaluate_model(tuned, X_train_enc, X_test_enc, y_train_enc, y_test_enc,
+                                                 problem_type))
+
+    feature_summary = {
+        "categorical_features": X.select_dtypes(include=["object", "category"]).columns.tolist(),
+        "numerical_features": X.select_dtypes(exclude=["object", "category"]).columns.tolist(),
+    }
+    run("generate_report_json", lambda: generate_report_json(
+        df, cleaning, feature_summary, list(zip(names_list, scores_list)),
+        {"name": best_name, "score": max(scores_list)}, target="target"))
+    results["train_candidates"]["best_model"] = best_name
+    return results
+
+
+def _full_run_child(csv_path, work_dir):
+    import resource
+    os.chdir(work_dir)
+    from pipeline import run_automl_pipeline
+    w, c = time.perf_counter(), time.process_time()
+    run_automl_pipeline(csv_path, "target", candidate_n_jobs=1, incremental=False, out_of_core=False)
+    stats = {"wall_s": time.perf_counter() - w, "cpu_s": time.process_time() - c}
+    # ru_maxrss is in KiB on Linux, bytes on macOS
+    scale = 1 if sys.platform == "darwin" else 1024
+    stats["peak_rss_mb"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale / 1024 ** 2
+    return stats
+
+
+def bench_full_run(csv_path):
+    """run_automl_pipeline on csv_path in a fresh process, with its own dataset store and model dir."""
+    with tempfile.TemporaryDirectory() as work_dir, \
+            mp.get_context("spawn").Pool(1) as pool:
+        return pool.apply(_full_run_child, (os.path.abspath(csv_path), work_dir))
+
+
+def environment():
+    import numpy, pandas, sklearn, xgboost
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        commit = None
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "git_commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "versions": {m.__name__: m.__version__ for m in (numpy, pandas, sklearn, xgboost)},
+    }
+
+
+def case_key(case):
+    return ",".join(f"{k}={case[k]}" for k in sorted(case))
+
+
+def compare(results, baseline, threshold=1.25, min_seconds=0.05):
+    """Entries whose wall time grew past threshold * baseline (ignoring ones under min_seconds)."""
+    old = {(r["case_key"], r["function"]): r for r in baseline["results"]}
+    regressions = []
+    for r in results:
+        b = old.get((r["case_key"], r["function"]))
+        if b is None or max(r["wall_s"], b["wall_s"]) < min_seconds:
+            continue
+        ratio = r["wall_s"] / max(b["wall_s"], 1e-9)
+        if ratio > threshold:
+            regressions.append({"case_key": r["case_key"], "function": r["function"],
+                                "baseline_s": b["wall_s"], "wall_s": r["wall_s"], "ratio": ratio})
+    return regressions
+
+
+def run(grid, repeats=1, memory=True, full_run=True, tune_iter=5, output=None):
+    results = []
+    keys = list(grid)
+    for values in itertools.product(*(grid[k] for k in keys)):
+        case = dict(zip(keys, values))
+        print(f"--- {case_key(case)}")
+        df = make_dataset(**case)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            csv_path = os.path.join(tmp_dir, "data.csv")
+            df.to_csv(csv_path, index=False)
+            stages = bench_functions(csv_path, repeats, memory, tune_iter)
+            if full_run:
+                stages["run_automl_pipeline"] = bench_full_run(csv_path)
+        for name in STAGE_ORDER + ["run_automl_pipeline"]:
+            if name not in stages:
+                continue
+            s = stages[name]
+            results.append(dict(s, case=case, case_key=case_key(case), function=name))
+            mem = s.get("peak_mb", s.get("peak_rss_mb"))
+            print(f"{name:<28}{s['wall_s']:9.3f}s wall{s['cpu_s']:9.3f}s cpu"
+                  + (f"{mem:10.1f} MB" if mem is not None else ""))
+
+    report = {"environment": environment(), "grid": grid, "repeats": repeats, "results": results}
+    if output:
+        with open(output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"results written to {output}")
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--numeric", type=int, nargs="+", default=[10])
+    parser.add_argument("--categorical", type=int, nargs="+", default=[5])
+    parser.add_argument("--cardinality", type=int, nargs="+", default=[10])
+    parser.add_argument("--missing", type=float, nargs="+", default=[0.05])
+    parser.add_argument("--outliers", type=float, nargs="+", default=[0.01])
+    parser.add_argument("--problem", nargs="+", choices=["classification", "regression"],
+                        default=["classification"])
+    parser.add_argument("--repeats", type=int, default=1)
+    parser.add_argument("--tune-iter", type=int, default=5, help="RandomizedSearchCV iterations")
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc pass")
+    parser.add_argument("--no-full-run", action="store_true", help="skip run_automl_pipeline")
+    parser.add_argument("--output", default="bench_pipeline.json")
+    parser.add_argument("--compare", help="baseline JSON written by an earlier run")
+    parser.add_argument("--threshold", type=float, default=1.25)
+    args = parser.parse_args()
+
+    grid = {
+        "rows": args.rows, "n_numeric": args.numeric, "n_categorical": args.categorical,
+        "cardinality": args.cardinality, "missing_rate": args.missing, "outlier_rate": args.outliers,
+        "problem_type": args.problem,
+    }
+    report = run(grid, args.repeats, not args.no_memory, not args.no_full_run, args.tune_iter, args.output)
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(report["results"], json.load(f), args.threshold)
+        for r in regressions:
+            print(f"REGRESSION {r['function']} [{r['case_key']}]: "
+                  f"{r['baseline_s']:.3f}s -> {r['wall_s']:.3f}s ({r['ratio']:.2f}x)")
+        sys.exit(1 if regressions else 0)
@@ -0,0 +1,69 @@
+# bench_preprocessing.py
+"""
+Compare clean_data + feature_engineering against PreprocessingPipeline on a
+wide frame.
+
+    python benchmarks/bench_preprocessing.py --rows 5000 --numeric 700 --categorical 300
+"""
+import os
+import sys
+import time
+import argparse
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from functions import clean_data, feature_engineering, automated_train_test_split
+from preprocessing import PreprocessingPipeline
+
+
+def make_frame(rows, n_num, n_cat, missing_rate=0.05, seed=0):
+    rng = np.random.default_rng(seed)
+    num = rng.normal(size=(rows, n_num))
+    num[rng.random(num.shape) < missing_rate] = np.nan
+    data = {f"num_{i}": num[:, i] for i in range(n_num)}
+    letters = np.array(list("abcdefghij"), dtype=object)
+    for i in range(n_cat):
+        col = letters[rng.integers(0, 10, rows)]
+        col[rng.random(rows) < missing_rate] = None
+        data[f"cat_{i}"] = col
+    X = pd.DataFrame(data)
+    y = pd.Series(rng.integers(0, 2, rows), name="target")
+    return X, y
+
+
+def run(rows, n_num, n_cat, repeats):
+    X, y = make_frame(rows, n_num, n_cat)
+    X_train, X_test, y_train, y_test = automated_train_test_split(X, y)
+
+    def legacy():
+        Xtr, Xte, _, _ = clean_data(X_train, X_test, verbose=False)
+        feature_engineering(Xtr, Xte, y_train.loc[Xtr.index], y_test)
+
+    def pipeline():
+        pre = PreprocessingPipeline().fit(X_train)
+        pre.transform(X_train)
+        pre.transform(X_test)
+
+    results = {}
+    for name, fn in (("clean_data+feature_engineering", legacy), ("PreprocessingPipeline", pipeline)):
+        times = []
+        for _ in range(repeats):
+            t = time.perf_counter()
+            fn()
+            times.append(time.perf_counter() - t)
+        results[name] = min(times)
+        print(f"{name:<32} best of {repeats}: {min(times):8.3f}s")
+    print(f"speed-up: {results['clean_data+feature_engineering'] / results['PreprocessingPipeline']:.1f}x")
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--numeric", type=int, default=700)
+    parser.add_argument("--categorical", type=int, default=300)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+    run(args.rows, args.numeric, args.categorical, args.repeats)
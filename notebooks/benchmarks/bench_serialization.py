@@ -0,0 +1,82 @@
+# bench_serialization.py
+"""
+Save time, load time, file size and first-prediction latency of every
+model format (model_formats) for each candidate model family.
+
+    python benchmarks/bench_serialization.py --rows 20000 --features 50 --problem classification
+"""
+import os
+import sys
+import time
+import argparse
+import tempfile
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from functions import get_candidate_models
+import model_formats
+
+
+def make_data(rows, n_features, problem_type, seed=0):
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(rows, n_features)).astype(np.float32)
+    signal = X[:, :5].sum(axis=1) + rng.normal(scale=0.5, size=rows)
+    y = (signal > 0).astype(int) if problem_type == "classification" else signal
+    return X, y
+
+
+def _timed(fn):
+    t = time.perf_counter()
+    out = fn()
+    return out, time.perf_counter() - t
+
+
+def bench_format(model, fmt, X, tmp_dir):
+    base = os.path.join(tmp_dir, f"{type(model).__name__}_{fmt}")
+    if fmt == "onnx":
+        import onnxruntime
+        path, save_s = _timed(lambda: model_formats.export_onnx(model, base + model_formats.ONNX_EXTENSION))
+        session, load_s = _timed(lambda: onnxruntime.InferenceSession(path, providers=["CPUExecutionProvider"]))
+        name = session.get_inputs()[0].name
+        _, predict_s = _timed(lambda: session.run(None, {name: X[:1]}))
+    else:
+        path, save_s = _timed(lambda: model_formats.save(model, base, fmt, export_onnx_copy=False))
+        loaded, load_s = _timed(lambda: model_formats.load(base))
+        _, predict_s = _timed(lambda: loaded.predict(X[:1]))
+    return {"save_s": save_s, "load_s": load_s, "first_predict_s": predict_s,
+            "size_mb": os.path.getsize(path) / 1024 ** 2}
+
+
+def run(rows, n_features, problem_type, families=None):
+    X, y = make_data(rows, n_features, problem_type)
+    formats = ["joblib", "joblib-mmap", "xgboost-ubj", "xgboost-json", "onnx"]
+    results = {}
+    print(f"{'model':<20}{'format':<14}{'save s':>9}{'load s':>9}{'1st pred s':>12}{'size MB':>10}")
+    for name, model in get_candidate_models(problem_type).items():
+        if families and name not in families:
+            continue
+        model.fit(X, y)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            for fmt in formats:
+                if fmt.startswith("xgboost") and not model_formats.is_xgboost(model):
+                    continue
+                try:
+                    r = bench_format(model, fmt, X, tmp_dir)
+                except (model_formats.ONNXExportError, ImportError) as e:
+                    print(f"{name:<20}{fmt:<14} skipped: {e}")
+                    continue
+                results[(name, fmt)] = r
+                print(f"{name:<20}{fmt:<14}{r['save_s']:9.3f}{r['load_s']:9.3f}"
+                      f"{r['first_predict_s']:12.4f}{r['size_mb']:10.2f}")
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--features", type=int, default=50)
+    parser.add_argument("--problem", choices=["classification", "regression"], default="classification")
+    parser.add_argument("--families", nargs="*", help="subset of get_candidate_models names")
+    args = parser.parse_args()
+    run(args.rows, args.features, args.problem, args.families)
@@ -0,0 +1,94 @@
+# bench_tuning.py
+"""
+tune_best_model with engine="sklearn" (RandomizedSearchCV) against
+engine="fold_cache" (tuning.cached_random_search) on synthetic data.
+
+    python benchmarks/bench_tuning.py --rows 20000 100000 --models XGBoost RandomForest
+
+For each engine it reports the tuning wall time, the summed fit time of all
+(configuration, fold) pairs and the overhead: wall time minus fit time
+spread over the CPUs, i.e. what splitting, pickling, matrix building and
+scoring cost on top of fitting. Exits non-zero when every fit of a model
+failed, since its timings then measure nothing.
+"""
+import os
+import sys
+import json
+import math
+import time
+import argparse
+import itertools
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from datasets import make_dataset
+from bench_pipeline import environment
+from functions import get_candidate_models, tune_best_model
+from preprocessing import PreprocessingPipeline, TargetEncoder
+
+
+def bench_case(df, problem_type, models, n_iter):
+    X, y = df.drop(columns=["target"]), df["target"]
+    y = TargetEncoder().fit(y).transform(y)
+    X_enc = PreprocessingPipeline(encoding="auto", target_type=problem_type).fit_transform(X, y)
+    n_cpus = os.cpu_count() or 1
+    results = []
+    for name in models:
+        model = get_candidate_models(problem_type).get(name)
+        if model is None:
+            continue
+        for engine in ("sklearn", "fold_cache"):
+            log = []
+            started = time.perf_counter()
+            try:
+                tune_best_model(name, model, X_enc, y, problem_type, n_iter=n_iter, fit_log=log, engine=engine)
+            except ValueError as e:
+                # Both engines raise when no configuration could be fitted at all
+                print(f"{name:<20}{engine:<12}every fit failed: {e}")
+                results.append({"model": name, "engine": engine, "error": str(e), "failed_fits": None})
+                continue
+            wall = time.perf_counter() - started
+            fit = sum(e["fit_s"] for e in log)
+            scores = [e["cv_score"] for e in log if not math.isnan(e["cv_score"])]
+            results.append({"model": name, "engine": engine, "wall_s": wall, "fit_s": fit,
+                            "overhead_s": wall - fit / n_cpus,
+                            "best_cv_score": max(scores, default=None),
+                            "failed_fits": len(log) - len(scores)})
+            r = results[-1]
+            print(f"{name:<20}{engine:<12}{wall:9.2f}s wall{fit:9.2f}s fit{r['overhead_s']:9.2f}s overhead"
+                  + (f"  {r['failed_fits']}/{len(log)} configurations failed" if r["failed_fits"] else ""))
+    return results
+
+
+def all_failed(results):
+    """(model, engine) pairs of which no configuration produced a score."""
+    return [(r["model"], r["engine"]) for r in results if r.get("best_cv_score") is None]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, nargs="+", default=[20000])
+    parser.add_argument("--numeric", type=int, nargs="+", default=[20])
+    parser.add_argument("--categorical", type=int, nargs="+", default=[5])
+    parser.add_argument("--cardinality", type=int, nargs="+", default=[10])
+    parser.add_argument("--problem", nargs="+", choices=["classification", "regression"],
+                        default=["classification"])
+    parser.add_argument("--models", nargs="+", default=["XGBoost", "RandomForest", "LogisticRegression"])
+    parser.add_argument("--n-iter", type=int, default=10)
+    parser.add_argument("--output", default="bench_tuning.json")
+    args = parser.parse_args()
+
+    cases = []
+    for rows, n_num, n_cat, card, problem in itertools.product(
+            args.rows, args.numeric, args.categorical, args.cardinality, args.problem):
+        case = {"rows": rows, "n_numeric": n_num, "n_categorical": n_cat, "cardinality": card,
+                "problem_type": problem}
+        print(f"--- {','.join(f'{k}={v}' for k, v in case.items())}")
+        cases.append({"case": case, "results": bench_case(make_dataset(**case), problem, args.models, args.n_iter)})
+    with open(args.output, "w") as f:
+        json.dump({"environment": environment(), "cases": cases}, f, indent=2)
+    print(f"results written to {args.output}")
+
+    failed = sorted({pair for c in cases for pair in all_failed(c["results"])})
+    if failed:
+        sys.exit("every fit failed for: " + ", ".join(f"{model} ({engine})" for model, engine in failed))
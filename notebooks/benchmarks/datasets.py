@@ -0,0 +1,50 @@
+# datasets.py
+"""Synthetic classification / regression frames of controlled shape for the benchmarks."""
+import numpy as np
+import pandas as pd
+
+
+def make_dataset(rows, n_numeric=10, n_categorical=5, cardinality=10, missing_rate=0.05,
+                 outlier_rate=0.01, problem_type="classification", n_classes=2, seed=0):
+    """
+    A frame of `n_numeric` float columns, `n_categorical` string columns
+    with `cardinality` levels each (Zipf-like frequencies) and a "target"
+    column that depends on both.
+
+    A `missing_rate` share of feature cells is NaN / None and an
+    `outlier_rate` share of numeric cells is multiplied by 20-50. The target
+    is class labels "class_<k>" for classification (quantiles of a noisy
+    linear score, so classes are balanced) or the score itself for
+    regression.
+    """
+    rng = np.random.default_rng(seed)
+    data = {}
+    score = np.zeros(rows)
+
+    num = rng.normal(size=(rows, n_numeric))
+    weights = rng.normal(size=n_numeric)
+    score += num @ weights if n_numeric else 0
+    outliers = rng.random(num.shape) < outlier_rate
+    num[outliers] *= rng.uniform(20, 50, size=outliers.sum())
+    num[rng.random(num.shape) < missing_rate] = np.nan
+    for i in range(n_numeric):
+        data[f"num_{i}"] = num[:, i]
+
+    ranks = np.arange(1, cardinality + 1)
+    freq = (1.0 / ranks) / (1.0 / ranks).sum()
+    for i in range(n_categorical):
+        codes = rng.choice(cardinality, size=rows, p=freq)
+        effects = rng.normal(scale=0.5, size=cardinality)
+        score += effects[codes]
+        levels = np.array([f"c{i}_{k}" for k in range(cardinality)], dtype=object)
+        col = levels[codes]
+        col[rng.random(rows) < missing_rate] = None
+        data[f"cat_{i}"] = col
+
+    score += rng.normal(scale=0.5, size=rows)
+    if problem_type == "classification":
+        edges = np.quantile(score, np.linspace(0, 1, n_classes + 1)[1:-1])
+        data["target"] = np.array([f"class_{k}" for k in range(n_classes)], dtype=object)[np.digitize(score, edges)]
+    else:
+        data["target"] = score
+    return pd.DataFrame(data)
@@ -0,0 +1,342 @@
+# correlation.py
+import os
+import numpy as np
+import pandas as pd
+
+# -----------------------------
+# Defaults
+# -----------------------------
+# Rows used for correlations / associations; taller frames are sampled down to this
+CORR_SAMPLE_ROWS = int(os.environ.get("AUTOML_CORR_SAMPLE_ROWS", 100_000))
+# Columns per block of the blockwise Pearson computation (a block pair is one float32 GEMM)
+CORR_BLOCK_COLUMNS = int(os.environ.get("AUTOML_CORR_BLOCK_COLUMNS", 512))
+# Strongest pairs / target correlations reported instead of the full matrix
+CORR_TOP_K = int(os.environ.get("AUTOML_CORR_TOP_K", 25))
+# Heatmaps show at most this many columns (the most strongly correlated ones), clustered
+HEATMAP_MAX_COLUMNS = int(os.environ.get("AUTOML_HEATMAP_MAX_COLUMNS", 30))
+HEATMAP_ANNOTATE_MAX_COLUMNS = 12
+# Levels per categorical column in association measures; rarer levels (and missing) share one
+ASSOCIATION_MAX_LEVELS = int(os.environ.get("AUTOML_ASSOCIATION_MAX_LEVELS", 50))
+
+
+def sample_frame(df, max_rows=CORR_SAMPLE_ROWS, random_state=42):
+    """`df`, or a uniform sample of `max_rows` of its rows."""
+    if max_rows is None or len(df) <= max_rows:
+        return df
+    return df.sample(n=max_rows, random_state=random_state)
+
+
+class NumericBlock:
+    """
+    float32 columns centred on their means with NaNs set to 0, plus the
+    float32 mask of present values (None when nothing is missing), the
+    form every Pearson product below works on.
+    """
+
+    def __init__(self, values):
+        X = np.asarray(values, dtype=np.float32)
+        if X.ndim == 1:
+            X = X[:, None]
+        present = ~np.isnan(X)
+        n = present.sum(axis=0)
+        mean = np.where(present, X, 0).sum(axis=0, dtype=np.float64) / np.maximum(n, 1)
+        self.values = np.where(present, X - mean.astype(np.float32), np.float32(0))
+        self.mask = None if present.all() else present.astype(np.float32)
+        self.shape = X.shape
+
+    def columns(self, start, stop):
+        return self.take(slice(start, stop))
+
+    def take(self, index):
+        """The columns at `index` (a slice or integer positions) as a NumericBlock."""
+        block = NumericBlock.__new__(NumericBlock)
+        block.values = self.values[:, index]
+        block.mask = None if self.mask is None else self.mask[:, index]
+        block.shape = block.values.shape
+        return block
+
+
+def pearson(a, b):
+    """
+    Pearson correlation between the columns of NumericBlocks `a` and `b`
+    (a.shape[1] x b.shape[1], float32) over pairwise-complete rows, like
+    DataFrame.corr(). NaN where a pair has < 2 rows or no variance.
+    """
+    A, B = a.values, b.values
+    with np.errstate(invalid="ignore", divide="ignore"):
+        if a.mask is None and b.mask is None:
+            # Nothing missing: one GEMM over the centred columns
+            norm_a = np.sqrt((A * A).sum(axis=0))
+            norm_b = np.sqrt((B * B).sum(axis=0))
+            r = (A.T @ B) / np.outer(norm_a, norm_b)
+        else:
+            # Pairwise-complete sums as products with the masks (rows missing in either column drop out)
+            ma = a.mask if a.mask is not None else np.ones_like(A)
+            mb = b.mask if b.mask is not None else np.ones_like(B)
+            n = ma.T @ mb
+            sx, sy = A.T @ mb, ma.T @ B
+            cov = A.T @ B - sx * sy / n
+            var_x = (A * A).T @ mb - sx * sx / n
+            var_y = ma.T @ (B * B) - sy * sy / n
+            r = cov / np.sqrt(var_x * var_y)
+            r[n < 2] = np.nan
+    r[~np.isfinite(r)] = np.nan
+    return np.clip(r, -1, 1).astype(np.float32, copy=False)
+
+
+def correlation_matrix(df, columns=None):
+    """Pearson matrix of `columns` (default: the numeric ones) as a float32 DataFrame."""
+    columns = list(df.select_dtypes(include=[np.number, "bool"]).columns) if columns is None else list(columns)
+    block = NumericBlock(df[columns].to_numpy(dtype=np.float32, na_value=np.nan))
+    r = pearson(block, block)
+    np.fill_diagonal(r, 1.0)
+    return pd.DataFrame(r, index=columns, columns=columns)
+
+
+def _keep_top(best, values, rows, cols, k):
+    """Merge candidate (|value| ranked) entries into `best` = (values, rows, cols), keeping k."""
+    values = np.concatenate([best[0], values])
+    rows, cols = np.concatenate([best[1], rows]), np.concatenate([best[2], cols])
+    if len(values) > k:
+        keep = np.argpartition(-np.abs(values), k - 1)[:k]
+        values, rows, cols = values[keep], rows[keep], cols[keep]
+    return values, rows, cols
+
+
+def scan_pairs(block, top_k=CORR_TOP_K, block_columns=CORR_BLOCK_COLUMNS):
+    """
+    One blockwise pass over all column pairs of `block` without building
+    the full matrix. Returns ((values, i, j) of the `top_k` strongest pairs
+    by |r|, per-column strongest |r| with any other column).
+    """
+    p = block.shape[1]
+    best = (np.empty(0, np.float32), np.empty(0, np.int64), np.empty(0, np.int64))
+    strongest = np.zeros(p, dtype=np.float32)
+    for i0 in range(0, p, block_columns):
+        left = block.columns(i0, i0 + block_columns)
+        for j0 in range(i0, p, block_columns):
+            r = pearson(left, block.columns(j0, j0 + block_columns))
+            if i0 == j0:
+                r[np.tril_indices(r.shape[0], 0, r.shape[1])] = np.nan
+            a = np.abs(np.nan_to_num(r, nan=0.0))
+            strongest[i0:i0 + r.shape[0]] = np.maximum(strongest[i0:i0 + r.shape[0]], a.max(axis=1, initial=0))
+            strongest[j0:j0 + r.shape[1]] = np.maximum(strongest[j0:j0 + r.shape[1]], a.max(axis=0, initial=0))
+            if not top_k:
+                continue
+            flat = np.flatnonzero(~np.isnan(r))
+            if len(flat) > top_k:
+                flat = flat[np.argpartition(-a.ravel()[flat], top_k - 1)[:top_k]]
+            rows, cols = np.unravel_index(flat, r.shape)
+            best = _keep_top(best, r.ravel()[flat], rows + i0, cols + j0, top_k)
+    order = np.argsort(-np.abs(best[0]), kind="stable")
+    return tuple(x[order] for x in best), strongest
+
+
+def category_codes(series, max_levels=ASSOCIATION_MAX_LEVELS):
+    """
+    Integer codes of the `max_levels` most frequent values of `series`;
+    rarer values and missing share one extra code. Returns (codes, n_levels).
+    """
+    counts = series.value_counts()
+    keep = pd.Index(counts.index[counts.to_numpy() > 0][:max_levels].astype(object))
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        # Remap the category codes: the kept levels are not the first max_levels categories
+        lookup = keep.get_indexer(series.cat.categories.astype(object))
+        raw = series.cat.codes.to_numpy()
+        codes = np.where(raw >= 0, lookup[raw], -1).astype(np.int64)
+    else:
+        codes = keep.get_indexer(series.astype(object)).astype(np.int64)
+    n_levels = len(keep)
+    rest = codes < 0
+    if rest.any():
+        codes[rest] = n_levels
+        n_levels += 1
+    return codes, max(n_levels, 1)
+
+
+def one_hot(codes, n_levels):
+    from scipy import sparse
+    n = len(codes)
+    return sparse.csr_matrix((np.ones(n, dtype=np.float32), (np.arange(n), codes)), shape=(n, n_levels))
+
+
+def correlation_ratio(indicator, block):
+    """
+    Correlation ratio (eta) of one categorical column, given as its one-hot
+    `indicator` matrix, with every column of NumericBlock `block` at once:
+    sqrt(between-level sum of squares / total sum of squares).
+    """
+    sums = np.asarray(indicator.T @ block.values)
+    counts = (np.asarray(indicator.sum(axis=0)).T if block.mask is None
+              else np.asarray(indicator.T @ block.mask))
+    with np.errstate(invalid="ignore", divide="ignore"):
+        between = (sums * sums / np.where(counts > 0, counts, 1)).sum(axis=0)
+        total = (block.values * block.values).sum(axis=0)
+        eta = np.sqrt(np.clip(between / total, 0, 1))
+    eta[~np.isfinite(eta)] = np.nan
+    return eta.astype(np.float32, copy=False)
+
+
+def cramers_v(indicator, indicators, offsets):
+    """
+    Cramér's V of one categorical column (one-hot `indicator`) with every
+    column stacked in `indicators` (hstacked one-hots, column k at
+    offsets[k]:offsets[k + 1]), from one sparse contingency product.
+    """
+    table = np.asarray((indicator.T @ indicators).todense(), dtype=np.float64)
+    # Every stacked column partitions the same rows, so any one block gives the row totals
+    rows, cols = table[:, offsets[0]:offsets[1]].sum(axis=1), table.sum(axis=0)
+    n = rows.sum()
+    with np.errstate(invalid="ignore", divide="ignore"):
+        # phi^2 = sum(O^2 / (row * col)) - 1, summed per stacked column
+        ratio = np.where(table > 0, table * table / np.outer(rows, cols), 0).sum(axis=0)
+        phi2 = np.add.reduceat(ratio, offsets[:-1]) - 1
+        levels = np.array([(rows > 0).sum()] * (len(offsets) - 1))
+        other_levels = np.add.reduceat((cols > 0).astype(np.int64), offsets[:-1])
+        k = np.minimum(levels, other_levels) - 1
+        v = np.sqrt(np.clip(phi2 / k, 0, 1))
+    v[(k < 1) | ~np.isfinite(v)] = np.nan
+    if n == 0:
+        v[:] = np.nan
+    return v.astype(np.float32, copy=False)
+
+
+def _top_entries(entries, k):
+    entries = [e for e in entries if e["value"] is not None and np.isfinite(e["value"])]
+    return sorted(entries, key=lambda e: -abs(e["value"]))[:k]
+
+
+def correlation_summary(df, num_cols, cat_cols, target=None, top_k=CORR_TOP_K, sample_rows=CORR_SAMPLE_ROWS,
+                        max_levels=ASSOCIATION_MAX_LEVELS, block_columns=CORR_BLOCK_COLUMNS, random_state=42):
+    """
+    Correlations of a (possibly very wide) frame without the full matrix.
+
+    One float32 pass over (a sample of `sample_rows` rows of) the numeric
+    columns yields the `top_k` strongest pairs and the target
+    correlations; categorical columns are related to numeric ones by the
+    correlation ratio and to each other by Cramér's V, one batch of
+    sparse products per categorical column.
+
+    Returns {"target_correlation": {column: r} (numeric target) or None,
+    "target_association": [{"feature", "measure", "value"}],
+    "top_pairs": [{"a", "b", "r"}], "associations": [{"a", "b", "measure",
+    "value"}], "heatmap_columns", "heatmap_matrix", "rows_used", "sampled",
+    ...}. "heatmap_matrix" is the Pearson matrix of "heatmap_columns" (at
+    most HEATMAP_MAX_COLUMNS, target excluded) taken from the same block,
+    so heatmap_frame can draw it without another pass over the data.
+    """
+    sample = sample_frame(df, sample_rows, random_state)
+    num = [c for c in num_cols if c != target and c in sample.columns]
+    cat = [c for c in cat_cols if c != target and c in sample.columns]
+    block = NumericBlock(sample[num].to_numpy(dtype=np.float32, na_value=np.nan)) if num else None
+
+    top_pairs, heatmap_columns, heatmap_matrix = [], num, None
+    if block is not None and len(num) > 1:
+        (values, rows, cols), strongest = scan_pairs(block, top_k, block_columns)
+        top_pairs = [{"a": num[i], "b": num[j], "r": float(v)} for v, i, j in zip(values, rows, cols)]
+        selected = np.argsort(-strongest, kind="stable")[:HEATMAP_MAX_COLUMNS]
+        heatmap_columns = [num[i] for i in selected]
+        heatmap = block.take(selected)
+        r = pearson(heatmap, heatmap)
+        np.fill_diagonal(r, 1.0)
+        # NaN (no variance / too few rows) -> None keeps the report strict JSON
+        heatmap_matrix = [[round(float(v), 4) if np.isfinite(v) else None for v in row] for row in r]
+
+    indicators, offsets = [], [0]
+    for col in cat:
+        codes, n_levels = category_codes(sample[col], max_levels)
+        indicators.append(one_hot(codes, n_levels))
+        offsets.append(offsets[-1] + n_levels)
+    stacked = None
+    if indicators:
+        from scipy import sparse
+        stacked = sparse.hstack(indicators, format="csr")
+
+    associations = []
+    for a, (col, indicator) in enumerate(zip(cat, indicators)):
+        if block is not None:
+            associations += [{"a": col, "b": other, "measure": "correlation_ratio", "value": float(v)}
+                             for other, v in zip(num, correlation_ratio(indicator, block))]
+        if a + 1 < len(cat):
+            later = np.asarray(offsets[a + 1:]) - offsets[a + 1]
+            v = cramers_v(indicator, stacked[:, offsets[a + 1]:], later)
+            associations += [{"a": col, "b": other, "measure": "cramers_v", "value": float(x)}
+                             for other, x in zip(cat[a + 1:], v)]
+
+    target_correlation, target_association = None, []
+    if target is not None and target in sample.columns:
+        y = sample[target]
+        if pd.api.types.is_numeric_dtype(y) and not pd.api.types.is_bool_dtype(y):
+            y_block = NumericBlock(y.to_numpy(dtype=np.float32, na_value=np.nan))
+            if block is not None:
+                r = pearson(block, y_block)[:, 0]
+                target_association += [{"feature": c, "measure": "pearson", "value": float(v)}
+                                       for c, v in zip(num, r)]
+            target_association += [{"feature": c, "measure": "correlation_ratio",
+                                    "value": float(correlation_ratio(ind, y_block)[0])}
+                                   for c, ind in zip(cat, indicators)]
+            target_correlation = {e["feature"]: e["value"] for e in sorted(
+                _top_entries([e for e in target_association if e["measure"] == "pearson"], top_k),
+                key=lambda e: -e["value"])}
+        else:
+            codes, n_levels = category_codes(y, max_levels)
+            indicator = one_hot(codes, n_levels)
+            if block is not None:
+                target_association += [{"feature": c, "measure": "correlation_ratio", "value": float(v)}
+                                       for c, v in zip(num, correlation_ratio(indicator, block))]
+            if stacked is not None:
+                target_association += [{"feature": c, "measure": "cramers_v", "value": float(v)}
+                                       for c, v in zip(cat, cramers_v(indicator, stacked, np.asarray(offsets)))]
+
+    return {
+        "method": "pearson (numeric), correlation ratio (categorical-numeric), Cramér's V (categorical)",
+        "dtype": "float32",
+        "rows_used": int(len(sample)),
+        "sampled": len(sample) < len(df),
+        "n_numeric": len(num),
+        "n_categorical": len(cat),
+        "target_correlation": target_correlation,
+        "target_association": _top_entries(target_association, top_k),
+        "top_pairs": top_pairs,
+        "associations": _top_entries(associations, top_k),
+        "heatmap_columns": heatmap_columns,
+        "heatmap_matrix": heatmap_matrix,
+    }
+
+
+def heatmap_frame(df, max_columns=HEATMAP_MAX_COLUMNS, sample_rows=CORR_SAMPLE_ROWS, columns=None, matrix=None,
+                  exclude=None, n_columns_total=None):
+    """
+    The correlation matrix drawn by the heatmap: at most `max_columns`
+    numeric columns (those with the strongest correlation to any other),
+    ordered by average-linkage clustering on 1 - |r| so correlated groups
+    sit together. attrs["n_columns_total"] holds the number of numeric columns.
+
+    `columns` + `matrix` (correlation_summary's "heatmap_columns" /
+    "heatmap_matrix") are drawn as given without reading `df`, which may
+    then be None. Otherwise the matrix is computed from `df`, leaving out
+    the `exclude` column (the target, as correlation_summary does).
+    """
+    if matrix is not None:
+        selected = list(columns)
+        corr = pd.DataFrame(np.array(matrix, dtype=np.float32), index=selected, columns=selected)
+        numeric = selected
+    else:
+        sample = sample_frame(df, sample_rows)
+        numeric = list(sample.select_dtypes(include=[np.number, "bool"]).columns) if columns is None else list(columns)
+        numeric = [c for c in numeric if c != exclude]
+        selected = numeric
+        if len(numeric) > max_columns:
+            block = NumericBlock(sample[numeric].to_numpy(dtype=np.float32, na_value=np.nan))
+            _, strongest = scan_pairs(block, top_k=0)
+            selected = [numeric[i] for i in np.argsort(-strongest, kind="stable")[:max_columns]]
+        corr = correlation_matrix(sample, selected)
+    if len(selected) > 2:
+        from scipy.cluster.hierarchy import linkage, leaves_list
+        from scipy.spatial.distance import squareform
+        distance = 1 - np.abs(np.nan_to_num(corr.to_numpy(dtype=np.float64), nan=0.0))
+        np.fill_diagonal(distance, 0)
+        order = leaves_list(linkage(squareform(np.clip(distance, 0, None), checks=False), method="average"))
+        corr = corr.iloc[order, order]
+    corr.attrs["n_columns_total"] = len(numeric) if n_columns_total is None else n_columns_total
+    return corr
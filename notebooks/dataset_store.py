@@ -0,0 +1,523 @@
+# dataset_store.py
+import os
+import json
+import time
+import uuid
+import shutil
+import hashlib
+import threading
+from contextlib import contextmanager
+import numpy as np
+import pandas as pd
+
+from ingestion import read_csv_optimized, iter_csv_chunks, CHUNK_ROWS
+from eda_stats import StatsAccumulator
+from fingerprint import (
+    FINGERPRINT_FILE, DatasetFingerprint, row_fingerprints, duplicate_mask, write_fingerprints, read_fingerprints
+)
+
+# -----------------------------
+# Defaults
+# -----------------------------
+STORE_DIR = os.path.join("uploads", "datasets")
+MAX_STORE_BYTES = int(os.environ.get("AUTOML_STORE_MAX_BYTES", 20 * 1024 ** 3))
+MAX_STORE_ENTRIES = int(os.environ.get("AUTOML_STORE_MAX_ENTRIES", 100))
+HASH_CHUNK_BYTES = 8 * 1024 * 1024
+LOCK_FILE = ".meta.lock"
+PIN_PREFIX = ".pin."
+
+
+def hash_file(path, chunk_size=HASH_CHUNK_BYTES):
+    """SHA-256 of a file, read in fixed-size chunks."""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(chunk_size), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def prefix_hashes(path, sizes, chunk_size=HASH_CHUNK_BYTES):
+    """
+    SHA-256 of the first n bytes of a file for every n in `sizes`, in one
+    read. Only prefixes that end on a line boundary are returned.
+    """
+    h = hashlib.sha256()
+    out, pos, last = {}, 0, b""
+    with open(path, "rb") as f:
+        for size in sorted(sizes):
+            while pos < size:
+                block = f.read(min(chunk_size, size - pos))
+                if not block:
+                    return out
+                h.update(block)
+                pos += len(block)
+                last = block[-1:]
+            if last == b"\n" or f.peek(1)[:1] in (b"\n", b"\r"):
+                out[size] = h.hexdigest()
+    return out
+
+
+def _flock(f):
+    """Exclusive advisory lock on an open file (no-op where fcntl is unavailable, e.g. Windows)."""
+    try:
+        import fcntl
+    except ImportError:
+        return
+    fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+
+
+def _pid_alive(pid):
+    if os.name == "nt":
+        return True   # os.kill(pid, 0) would terminate the process on Windows
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except (PermissionError, OSError):
+        pass
+    return True
+
+
+def _has_pyarrow():
+    try:
+        import pyarrow  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def convert_json_safe(obj):
+    """NaN / inf -> None and numpy scalars -> Python, so meta.json stays strict JSON."""
+    if isinstance(obj, dict):
+        return {k: convert_json_safe(v) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [convert_json_safe(v) for v in obj]
+    if isinstance(obj, (float, np.floating)):
+        return float(obj) if np.isfinite(obj) else None
+    if isinstance(obj, np.integer):
+        return int(obj)
+    return obj
+
+
+def summarize_frame(df):
+    """Schema and cheap per-column statistics stored alongside a dataset."""
+    schema = {col: str(dtype) for col, dtype in df.dtypes.items()}
+    nulls = df.isnull().sum()
+    num = df.select_dtypes(include=[np.number])
+    stats = {col: {"nulls": int(nulls[col])} for col in df.columns}
+    if not num.empty:
+        desc = num.agg(["min", "max", "mean"])
+        for col in num.columns:
+            stats[col].update({k: float(desc.at[k, col]) for k in ("min", "max", "mean")})
+    return schema, stats
+
+
+class DatasetStore:
+    """
+    Content-addressed store of uploaded datasets.
+
+    Each upload is hashed (SHA-256) and converted once to a columnar file
+    (Parquet when pyarrow is available, pickle otherwise) under
+    `<root>/<dataset_id>/`, next to the original CSV and a meta.json with the
+    schema and basic statistics. Identical re-uploads resolve to the same
+    dataset_id. Least-recently-used datasets are evicted when the store
+    exceeds `max_bytes` or `max_entries`; datasets pinned by a running job
+    (in_use) are skipped.
+
+    meta.json is updated read-modify-write under an flock on
+    `<dataset_id>/.meta.lock`, so the API process and job workers (each with
+    their own DatasetStore) never lose each other's updates.
+    """
+
+    def __init__(self, root=STORE_DIR, max_bytes=MAX_STORE_BYTES, max_entries=MAX_STORE_ENTRIES):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        os.makedirs(root, exist_ok=True)
+
+    # --- paths ---
+    def _dir(self, dataset_id):
+        if not dataset_id or os.sep in dataset_id or dataset_id.startswith("."):
+            raise ValueError(f"Invalid dataset id '{dataset_id}'")
+        return os.path.join(self.root, dataset_id)
+
+    def _meta_path(self, dataset_id):
+        return os.path.join(self._dir(dataset_id), "meta.json")
+
+    def source_path(self, dataset_id):
+        return os.path.join(self._dir(dataset_id), "source.csv")
+
+    def _write_meta(self, dataset_id, meta):
+        # Unique temp name per writer: a shared one could be replaced away under a concurrent writer
+        tmp = f"{self._meta_path(dataset_id)}.{os.getpid()}.{uuid.uuid4().hex}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(meta, f)
+        os.replace(tmp, self._meta_path(dataset_id))
+
+    @contextmanager
+    def _meta_lock(self, dataset_id):
+        """Cross-process lock around a read-modify-write of one dataset's meta.json."""
+        with self._lock:
+            with open(os.path.join(self._dir(dataset_id), LOCK_FILE), "a") as f:
+                _flock(f)   # released when the file is closed
+                yield
+
+    def _update_meta(self, dataset_id, fields):
+        """Merge `fields` into the stored meta.json under the meta lock and return the result."""
+        if not self.exists(dataset_id):
+            raise KeyError(f"Dataset '{dataset_id}' not found")
+        with self._meta_lock(dataset_id):
+            meta = self.get_meta(dataset_id)
+            meta.update(fields)
+            self._write_meta(dataset_id, meta)
+        return meta
+
+    # --- public API ---
+    def exists(self, dataset_id):
+        try:
+            return os.path.exists(self._meta_path(dataset_id))
+        except ValueError:
+            return False
+
+    def get_meta(self, dataset_id):
+        if not self.exists(dataset_id):
+            raise KeyError(f"Dataset '{dataset_id}' not found")
+        with open(self._meta_path(dataset_id)) as f:
+            return json.load(f)
+
+    def touch(self, dataset_id):
+        return self._update_meta(dataset_id, {"last_access": time.time()})
+
+    @contextmanager
+    def in_use(self, dataset_id):
+        """Pin a dataset for the duration of the block so no process evicts it."""
+        pin = os.path.join(self._dir(dataset_id), f"{PIN_PREFIX}{os.getpid()}.{uuid.uuid4().hex}")
+        open(pin, "w").close()
+        try:
+            yield
+        finally:
+            try:
+                os.remove(pin)
+            except FileNotFoundError:
+                pass
+
+    def _pinned(self, dataset_id):
+        """Whether a live process holds an in_use pin on the dataset (stale pins are removed)."""
+        pinned = False
+        d = self._dir(dataset_id)
+        for name in os.listdir(d) if os.path.isdir(d) else ():
+            if not name.startswith(PIN_PREFIX):
+                continue
+            try:
+                pid = int(name[len(PIN_PREFIX):].split(".")[0])
+            except ValueError:
+                continue
+            if _pid_alive(pid):
+                pinned = True
+            else:
+                try:
+                    os.remove(os.path.join(d, name))
+                except FileNotFoundError:
+                    pass
+        return pinned
+
+    def add_file(self, src_path, content_hash=None, original_name=None, move=True,
+                 convert=True, header_info=None):
+        """
+        Register a CSV file and return its metadata.
+
+        `content_hash` may be supplied when the caller already hashed the
+        bytes (e.g. while streaming the upload). A file whose hash is already
+        stored is deduplicated: the new copy is discarded.
+
+        With convert=False only the header information (`header_info`, as
+        returned by upload_stream.sniff_csv) is recorded; the columnar copy and
+        statistics are built on the first load().
+        """
+        content_hash = content_hash or hash_file(src_path)
+        dataset_id = content_hash[:32]
+
+        if self.exists(dataset_id):
+            if move and os.path.abspath(src_path) != os.path.abspath(self.source_path(dataset_id)):
+                os.remove(src_path)
+            meta = self.touch(dataset_id)
+            meta["deduplicated"] = True
+            return meta
+
+        target_dir = self._dir(dataset_id)
+        os.makedirs(target_dir, exist_ok=True)
+        with self._meta_lock(dataset_id):
+            if self.exists(dataset_id):
+                # Registered by another process while this one was hashing
+                if move:
+                    os.remove(src_path)
+                meta = self.get_meta(dataset_id)
+                meta["deduplicated"] = True
+                return meta
+            (shutil.move if move else shutil.copyfile)(src_path, self.source_path(dataset_id))
+            now = time.time()
+            meta = {
+                "dataset_id": dataset_id,
+                "sha256": content_hash,
+                "original_name": original_name,
+                "format": None,
+                "rows": None,
+                "columns": (header_info or {}).get("columns"),
+                "row_estimate": (header_info or {}).get("row_estimate"),
+                "source_bytes": os.path.getsize(self.source_path(dataset_id)),
+                "created_at": now,
+                "last_access": now,
+                "size_bytes": self._dir_size(dataset_id),
+            }
+            self._write_meta(dataset_id, meta)
+
+        if convert:
+            try:
+                meta = self._convert(dataset_id)
+            except Exception:
+                shutil.rmtree(target_dir, ignore_errors=True)
+                raise
+
+        self.evict(keep={dataset_id})
+        meta["deduplicated"] = False
+        return meta
+
+    def _convert(self, dataset_id):
+        """Parse the source CSV once into the columnar file and fill in statistics."""
+        acc = StatsAccumulator()
+        df, ingestion = read_csv_optimized(self.source_path(dataset_id), stats=acc)
+        fmt = self._write_columnar(df, self._dir(dataset_id))
+        fingerprints = row_fingerprints(df)
+        self._write_fingerprints(dataset_id, [fingerprints])
+        schema, stats = summarize_frame(df)
+        return self._update_meta(dataset_id, {
+            "fingerprint": DatasetFingerprint(df.columns).update(fingerprints).hexdigest(),
+            "duplicate_rows": int(duplicate_mask(fingerprints).sum()),
+            "format": fmt,
+            "rows": int(len(df)),
+            "columns": df.columns.tolist(),
+            "schema": schema,
+            "stats": stats,
+            "ingestion": ingestion,
+            "eda_stats": convert_json_safe(acc.result()),
+            "size_bytes": self._dir_size(dataset_id),
+        })
+
+    def _convert_chunked(self, dataset_id, chunksize=CHUNK_ROWS):
+        """
+        Out-of-core variant of _convert: stream the source CSV chunk by chunk
+        into the Parquet file and the statistics, never holding the whole
+        dataset. Without pyarrow only the statistics are computed and the
+        format is "csv" (iter_chunks then streams the source itself).
+        """
+        acc = StatsAccumulator()
+        target_dir = self._dir(dataset_id)
+        writer, schema, rows, n_chunks, digest = None, None, 0, 0, None
+        tmp = os.path.join(target_dir, f".data.parquet.{os.getpid()}.tmp")
+        fp_tmp = os.path.join(target_dir, f".{FINGERPRINT_FILE}.{os.getpid()}.tmp")
+        fp_file = open(fp_tmp, "wb")
+        try:
+            for chunk in iter_csv_chunks(self.source_path(dataset_id), chunksize=chunksize):
+                acc.update(chunk)
+                fingerprints = row_fingerprints(chunk)
+                write_fingerprints(fingerprints, fp_file)
+                digest = (digest or DatasetFingerprint(chunk.columns)).update(fingerprints)
+                if _has_pyarrow():
+                    import pyarrow as pa
+                    import pyarrow.parquet as pq
+                    table = pa.Table.from_pandas(chunk, schema=schema, preserve_index=False)
+                    if writer is None:
+                        # An all-null first chunk would pin a column to the null type
+                        schema = pa.schema([f.with_type(pa.string()) if pa.types.is_null(f.type) else f
+                                            for f in table.schema], metadata=table.schema.metadata)
+                        table = table.cast(schema)
+                        writer = pq.ParquetWriter(tmp, schema)
+                    writer.write_table(table)
+                rows += len(chunk)
+                n_chunks += 1
+                dtypes = {col: str(dtype) for col, dtype in chunk.dtypes.items()}
+        finally:
+            fp_file.close()
+            if writer is not None:
+                writer.close()
+        if not n_chunks:
+            os.remove(fp_tmp)
+            raise ValueError("Dataset is empty")
+        if writer is not None:
+            os.replace(tmp, os.path.join(target_dir, "data.parquet"))
+        os.replace(fp_tmp, os.path.join(target_dir, FINGERPRINT_FILE))
+
+        stats = acc.result()
+        return self._update_meta(dataset_id, {
+            "format": "parquet" if writer is not None else "csv",
+            "rows": rows,
+            "columns": list(dtypes),
+            "schema": dtypes,
+            "stats": {col: {"nulls": n} for col, n in stats["missing_values"].items()},
+            "ingestion": {"rows": rows, "columns": len(dtypes), "chunks": n_chunks,
+                          "parser": "c-chunked", "dtypes": dtypes},
+            # Counting duplicates would need every fingerprint in memory at once; done per run instead
+            "fingerprint": digest.hexdigest(),
+            "duplicate_rows": None,
+            "eda_stats": convert_json_safe(stats),
+            "size_bytes": self._dir_size(dataset_id),
+        })
+
+    def _write_fingerprints(self, dataset_id, chunks):
+        tmp = os.path.join(self._dir(dataset_id), f".{FINGERPRINT_FILE}.{os.getpid()}.tmp")
+        with open(tmp, "wb") as f:
+            for fingerprints in chunks:
+                write_fingerprints(fingerprints, f)
+        os.replace(tmp, os.path.join(self._dir(dataset_id), FINGERPRINT_FILE))
+
+    def fingerprints(self, dataset_id):
+        """
+        The 64-bit row fingerprints computed at conversion (fingerprint.py),
+        memory-mapped, in row order; None for datasets converted before they
+        existed or not converted yet.
+        """
+        path = os.path.join(self._dir(dataset_id), FINGERPRINT_FILE)
+        if not os.path.exists(path) or os.path.getsize(path) == 0:
+            return None
+        return read_fingerprints(path)
+
+    def _write_columnar(self, df, target_dir):
+        # Write to a temp name first so concurrent loaders never see a partial file
+        if _has_pyarrow():
+            fmt, name = "parquet", "data.parquet"
+            tmp = os.path.join(target_dir, f".{name}.{os.getpid()}.tmp")
+            df.to_parquet(tmp, index=False)
+        else:
+            fmt, name = "pickle", "data.pkl"
+            tmp = os.path.join(target_dir, f".{name}.{os.getpid()}.tmp")
+            df.to_pickle(tmp)
+        os.replace(tmp, os.path.join(target_dir, name))
+        return fmt
+
+    def load(self, dataset_id, columns=None):
+        """
+        Load a stored dataset, optionally only `columns`. Parquet files are
+        memory-mapped and only the requested columns are decoded.
+        """
+        meta = self.touch(dataset_id)
+        if meta["format"] in (None, "csv"):
+            meta = self._convert(dataset_id)
+        if meta["format"] == "parquet":
+            df = pd.read_parquet(os.path.join(self._dir(dataset_id), "data.parquet"),
+                                 columns=columns, memory_map=True)
+        else:
+            df = pd.read_pickle(os.path.join(self._dir(dataset_id), "data.pkl"))
+            if columns is not None:
+                df = df[columns]
+        df.attrs["ingestion"] = meta.get("ingestion")
+        df.attrs["fingerprint"] = meta.get("fingerprint")
+        if columns is None:
+            df.attrs["eda_stats"] = meta.get("eda_stats")
+        df.attrs["dataset_id"] = dataset_id
+        return df
+
+    def iter_chunks(self, dataset_id, chunksize=CHUNK_ROWS, columns=None):
+        """
+        Yield the dataset as DataFrames of at most `chunksize` rows without
+        loading it whole; a dataset that was never converted is converted
+        chunk by chunk first (_convert_chunked).
+        """
+        meta = self.touch(dataset_id)
+        if meta["format"] is None:
+            meta = self._convert_chunked(dataset_id, chunksize)
+        if meta["format"] == "parquet":
+            import pyarrow.parquet as pq
+            pf = pq.ParquetFile(os.path.join(self._dir(dataset_id), "data.parquet"), memory_map=True)
+            for batch in pf.iter_batches(batch_size=chunksize, columns=columns):
+                yield batch.to_pandas()
+        elif meta["format"] == "csv":
+            yield from iter_csv_chunks(self.source_path(dataset_id), chunksize=chunksize, usecols=columns)
+        else:
+            df = self.load(dataset_id, columns=columns)
+            for start in range(0, len(df), chunksize):
+                yield df.iloc[start:start + chunksize]
+
+    def record_run(self, dataset_id, target, run):
+        """Remember the model trained on this dataset for `target` (see find_parent)."""
+        if not self.exists(dataset_id):
+            raise KeyError(f"Dataset '{dataset_id}' not found")
+        with self._meta_lock(dataset_id):
+            meta = self.get_meta(dataset_id)
+            meta.setdefault("runs", {})[target] = convert_json_safe(run)
+            self._write_meta(dataset_id, meta)
+        return meta
+
+    def find_parent(self, dataset_id, target):
+        """
+        Find the largest stored dataset this one extends with appended rows:
+        same columns, a model recorded for `target`, and a source CSV whose
+        bytes are a prefix of this dataset's source ending on a row boundary.
+
+        Returns (parent_meta, run) or None.
+        """
+        meta = self.get_meta(dataset_id)
+        size = meta["source_bytes"]
+        candidates = []
+        for other in self.list_datasets():
+            run = other.get("runs", {}).get(target)
+            if (run is None or other["dataset_id"] == dataset_id
+                    or other.get("source_bytes", size) >= size
+                    or other.get("columns") != meta.get("columns")):
+                continue
+            candidates.append((other["source_bytes"], other, run))
+        if not candidates:
+            return None
+
+        hashes = prefix_hashes(self.source_path(dataset_id), {c[0] for c in candidates})
+        for nbytes, other, run in sorted(candidates, key=lambda c: c[0], reverse=True):
+            if hashes.get(nbytes) == other["sha256"]:
+                return other, run
+        return None
+
+    def resolve(self, file_path):
+        """Map a stored source.csv path back to its dataset_id, or None."""
+        head, name = os.path.split(os.path.normpath(file_path))
+        if name == "source.csv" and os.path.normpath(os.path.dirname(head)) == os.path.normpath(self.root):
+            dataset_id = os.path.basename(head)
+            return dataset_id if self.exists(dataset_id) else None
+        return None
+
+    # --- eviction ---
+    def _dir_size(self, dataset_id):
+        d = self._dir(dataset_id)
+        total = 0
+        for name in os.listdir(d):
+            try:
+                total += os.path.getsize(os.path.join(d, name))
+            except FileNotFoundError:
+                pass   # another writer's temp file, already renamed
+        return total
+
+    def list_datasets(self):
+        metas = []
+        for name in os.listdir(self.root):
+            if self.exists(name):
+                try:
+                    metas.append(self.get_meta(name))
+                except (OSError, ValueError):
+                    continue
+        return metas
+
+    def evict(self, keep=()):
+        """Drop least-recently-used datasets until size and count limits hold."""
+        with self._lock:
+            metas = sorted(self.list_datasets(), key=lambda m: m.get("last_access", 0))
+            total = sum(m.get("size_bytes", 0) for m in metas)
+            count = len(metas)
+            evicted = []
+            for meta in metas:
+                if total <= self.max_bytes and count <= self.max_entries:
+                    break
+                if meta["dataset_id"] in keep or self._pinned(meta["dataset_id"]):
+                    continue
+                shutil.rmtree(self._dir(meta["dataset_id"]), ignore_errors=True)
+                total -= meta.get("size_bytes", 0)
+                count -= 1
+                evicted.append(meta["dataset_id"])
+            return evicted
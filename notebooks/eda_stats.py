@@ -0,0 +1,222 @@
+# eda_stats.py
+import os
+import warnings
+import numpy as np
+import pandas as pd
+
+# -----------------------------
+# Defaults
+# -----------------------------
+EXACT_MAX_ROWS = int(os.environ.get("AUTOML_STATS_EXACT_MAX_ROWS", 200_000))
+MAX_SAMPLE_CELLS = 10_000_000   # caps the quantile sample at ~80 MB of float64
+TOP_K = 20
+MAX_TRACKED_CATEGORIES = 10_000
+OTHER_BUCKET = "(other)"
+
+
+class StatsAccumulator:
+    """
+    Single-pass, mergeable EDA statistics.
+
+    Feed the data with `update(chunk)` (the whole frame, or chunk by chunk
+    while streaming) and read the summaries with `result()`.
+
+    Numeric columns keep count, null count, min, max and a Chan/Welford
+    running mean and M2 (for std), all updated with one vectorised reduction
+    per chunk. Quantiles and IQR outlier counts come from a uniform row
+    sample of at most `exact_max_rows` rows (fewer for very wide frames, see
+    MAX_SAMPLE_CELLS) kept by bottom-k random keys; as long as the data has
+    no more rows than that the sample is the data and the results are exact.
+
+    Categorical columns keep merged value counts, pruned to the
+    `max_tracked` most frequent values (the pruned mass goes to the
+    "(other)" bucket), and report the `top_k` values plus "(other)".
+
+    Column kinds are fixed by the first chunk. A numeric column that reads
+    as text in a later chunk is coerced with pd.to_numeric (unparseable
+    values count as nulls); other columns (datetimes, ...) only get null
+    counts in missing_values.
+    """
+
+    def __init__(self, exact_max_rows=EXACT_MAX_ROWS, top_k=TOP_K,
+                 max_tracked=MAX_TRACKED_CATEGORIES, random_state=42):
+        self.exact_max_rows = exact_max_rows
+        self.top_k = top_k
+        self.max_tracked = max_tracked
+        self._rng = np.random.default_rng(random_state)
+        self.n_rows = 0
+        self.num_cols = None
+        self.cat_cols = None
+        self.other_cols = None
+        # numeric state (vectors aligned with num_cols)
+        self._count = self._nulls = self._mean = self._m2 = self._min = self._max = None
+        self._sample = None        # (n, n_num) float64
+        self._sample_keys = None   # (n,) random keys
+        # categorical state
+        self._counts = {}
+        self._pruned = {}
+        self._cat_nulls = {}
+        self._other_nulls = None
+
+    # --- accumulation ---
+    def update(self, chunk):
+        if self.num_cols is None:
+            self.num_cols = chunk.select_dtypes(include=[np.number]).columns.tolist()
+            self.cat_cols = chunk.select_dtypes(include=['object', 'category', 'bool']).columns.tolist()
+            kinds = set(self.num_cols) | set(self.cat_cols)
+            self.other_cols = [c for c in chunk.columns if c not in kinds]
+            self._other_nulls = np.zeros(len(self.other_cols), dtype=np.int64)
+            k = len(self.num_cols)
+            self._count, self._nulls = np.zeros(k), np.zeros(k)
+            self._mean, self._m2 = np.zeros(k), np.zeros(k)
+            self._min, self._max = np.full(k, np.inf), np.full(k, -np.inf)
+            self.sample_rows = max(1000, min(self.exact_max_rows, MAX_SAMPLE_CELLS // max(k, 1)))
+            self._sample = np.empty((0, k))
+            self._sample_keys = np.empty(0)
+
+        self.n_rows += len(chunk)
+        if self.num_cols:
+            numeric = chunk[self.num_cols]
+            widened = [c for c in self.num_cols if not pd.api.types.is_numeric_dtype(numeric[c])]
+            if widened:
+                numeric = numeric.copy()
+                for col in widened:
+                    numeric[col] = pd.to_numeric(numeric[col], errors="coerce")
+            self._update_numeric(numeric.to_numpy(dtype=np.float64, na_value=np.nan))
+        for col in self.cat_cols:
+            self._update_categorical(col, chunk[col])
+        if self.other_cols:
+            self._other_nulls += chunk[self.other_cols].isna().sum().to_numpy(dtype=np.int64)
+        return self
+
+    def _update_numeric(self, X):
+        mask = ~np.isnan(X)
+        n_b = mask.sum(axis=0).astype(np.float64)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean_b = np.where(n_b > 0, np.nansum(X, axis=0) / n_b, 0.0)
+            m2_b = np.nansum((X - mean_b) ** 2, axis=0)
+            n_a = self._count
+            n = n_a + n_b
+            delta = mean_b - self._mean
+            self._mean = np.where(n > 0, self._mean + delta * n_b / n, 0.0)
+            self._m2 = self._m2 + m2_b + np.where(n > 0, delta ** 2 * n_a * n_b / n, 0.0)
+        self._count = n
+        self._nulls += (~mask).sum(axis=0)
+        if len(X):
+            with np.errstate(invalid="ignore"):
+                self._min = np.fmin(self._min, np.nanmin(np.where(mask, X, np.inf), axis=0))
+                self._max = np.fmax(self._max, np.nanmax(np.where(mask, X, -np.inf), axis=0))
+
+        # Bottom-k sampling: keep the rows with the smallest random keys
+        keys = self._rng.random(len(X))
+        if len(self._sample_keys) + len(X) > self.sample_rows:
+            keys_all = np.concatenate([self._sample_keys, keys])
+            keep = np.argpartition(keys_all, self.sample_rows - 1)[:self.sample_rows]
+            self._sample = np.concatenate([self._sample, X])[keep]
+            self._sample_keys = keys_all[keep]
+        else:
+            self._sample = np.concatenate([self._sample, X])
+            self._sample_keys = np.concatenate([self._sample_keys, keys])
+
+    def _update_categorical(self, col, s):
+        self._cat_nulls[col] = self._cat_nulls.get(col, 0) + int(s.isna().sum())
+        counts = s.value_counts(dropna=True)
+        if isinstance(counts.index, pd.CategoricalIndex):
+            counts = counts[counts > 0]
+            counts.index = counts.index.astype(object)
+        prev = self._counts.get(col)
+        merged = counts if prev is None else prev.add(counts, fill_value=0)
+        if len(merged) > self.max_tracked:
+            merged = merged.sort_values(ascending=False)
+            self._pruned[col] = self._pruned.get(col, 0) + int(merged.iloc[self.max_tracked:].sum())
+            merged = merged.iloc[:self.max_tracked]
+        self._counts[col] = merged
+
+    # --- results ---
+    @property
+    def approximate(self):
+        return self.num_cols is not None and self.n_rows > self.sample_rows
+
+    def numeric_summary(self):
+        if not self.num_cols:
+            return {}
+        S = self._sample
+        with np.errstate(invalid="ignore"), warnings.catch_warnings():
+            warnings.simplefilter("ignore", RuntimeWarning)
+            if len(S):
+                q1, median, q3 = np.nanquantile(S, [0.25, 0.5, 0.75], axis=0)
+            else:
+                q1 = median = q3 = np.full(len(self.num_cols), np.nan)
+            iqr = q3 - q1
+            out_mask = (S < q1 - 1.5 * iqr) | (S > q3 + 1.5 * iqr)
+            non_null_sample = (~np.isnan(S)).sum(axis=0)
+            outlier_frac = np.where(non_null_sample > 0, out_mask.sum(axis=0) / np.maximum(non_null_sample, 1), 0.0)
+            std = np.where(self._count > 1, np.sqrt(self._m2 / np.maximum(self._count - 1, 1)), np.nan)
+
+        summary = {}
+        for i, col in enumerate(self.num_cols):
+            has = self._count[i] > 0
+            summary[col] = {
+                "mean": float(self._mean[i]) if has else np.nan,
+                "median": float(median[i]),
+                "std": float(std[i]),
+                "min": float(self._min[i]) if has else np.nan,
+                "max": float(self._max[i]) if has else np.nan,
+                "q1": float(q1[i]),
+                "q3": float(q3[i]),
+                "outliers": int(round(outlier_frac[i] * self._count[i])),
+                "count": int(self._count[i]),
+                "nulls": int(self._nulls[i]),
+            }
+        return summary
+
+    def value_counts(self, col):
+        """Top-k value counts for `col` as a Series (descending)."""
+        counts = self._counts.get(col)
+        if counts is None:
+            return pd.Series(dtype="int64")
+        return counts.sort_values(ascending=False).iloc[:self.top_k].astype("int64")
+
+    def categorical_summary(self):
+        summary = {}
+        for col in self.cat_cols or []:
+            counts = self._counts.get(col, pd.Series(dtype="int64")).sort_values(ascending=False)
+            top = counts.iloc[:self.top_k]
+            entry = {str(k): int(v) for k, v in top.items()}
+            other = int(counts.iloc[self.top_k:].sum()) + self._pruned.get(col, 0)
+            if other:
+                entry[OTHER_BUCKET] = other
+            summary[col] = entry
+        return summary
+
+    def cardinality(self):
+        """Distinct non-null values per categorical column (a lower bound once pruned)."""
+        return {col: int(len(self._counts.get(col, ()))) + (1 if self._pruned.get(col) else 0)
+                for col in self.cat_cols or []}
+
+    def missing_values(self):
+        missing = {col: int(self._nulls[i]) for i, col in enumerate(self.num_cols or [])}
+        missing.update(self._cat_nulls)
+        missing.update({col: int(n) for col, n in zip(self.other_cols or [], self._other_nulls)})
+        return missing
+
+    def result(self):
+        return {
+            "rows": self.n_rows,
+            "approximate": self.approximate,
+            "sample_rows": int(len(self._sample_keys)) if self._sample_keys is not None else 0,
+            "numeric_summary": self.numeric_summary(),
+            "categorical_summary": self.categorical_summary(),
+            "categorical_cardinality": self.cardinality(),
+            "missing_values": self.missing_values(),
+        }
+
+
+def compute_eda_stats(df, chunksize=None, **kwargs):
+    """Convenience wrapper: accumulate statistics for a whole frame (optionally chunked)."""
+    acc = StatsAccumulator(**kwargs)
+    if chunksize is None or len(df) <= chunksize:
+        return acc.update(df)
+    for start in range(0, len(df), chunksize):
+        acc.update(df.iloc[start:start + chunksize])
+    return acc
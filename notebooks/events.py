@@ -0,0 +1,190 @@
+# events.py
+import os
+import json
+import time
+import asyncio
+import threading
+from collections import deque
+
+import metrics
+from dataset_store import convert_json_safe
+from pipeline import STAGES
+
+# -----------------------------
+# Defaults
+# -----------------------------
+# Events kept per job for reconnecting / late clients; older ones are dropped
+MAX_EVENTS_PER_JOB = int(os.environ.get("AUTOML_MAX_EVENTS_PER_JOB", 1000))
+# Comment line sent on an idle stream so proxies don't close it
+HEARTBEAT_SECONDS = float(os.environ.get("AUTOML_SSE_HEARTBEAT_SECONDS", 15))
+
+# Stage durations assumed for the ETA until jobs have finished and /metrics has real ones
+DEFAULT_STAGE_SECONDS = {"load": 2, "split": 1, "clean": 2, "feature_engineering": 1, "train_candidates": 60,
+                         "tune": 60, "save_model": 1, "report": 5}
+
+
+def expected_stage_seconds(stage):
+    """Mean wall time of `stage` over finished jobs (/metrics), or its default."""
+    return metrics.STAGE_SECONDS.mean(stage) or DEFAULT_STAGE_SECONDS.get(stage, 0)
+
+
+def format_sse(event=None, comment=None):
+    """One Server-Sent Events message: id / event / data lines, or a comment line."""
+    if event is None:
+        return f": {comment or 'keep-alive'}\n\n"
+    data = json.dumps(convert_json_safe(event), default=str)
+    return f"id: {event.get('seq', '')}\nevent: {event['type']}\ndata: {data}\n\n"
+
+
+class EventLog:
+    """
+    Progress events of one job, in order, with the state they add up to.
+
+    Events are dicts with a "type" ("queued", "stage", "candidate",
+    "tuning", "search", "finished") and get a sequence number ("seq")
+    and the job's ETA ("eta_s") when appended. Only the last `max_events`
+    are kept: a reader whose cursor fell out of that window resyncs from
+    snapshot(), which is also what a client gets when it connects.
+
+    append() may be called from any thread; async readers block in
+    wait() until something newer than their cursor arrives.
+    """
+
+    def __init__(self, job_id, max_events=MAX_EVENTS_PER_JOB):
+        self.job_id = job_id
+        self.closed = False
+        self._events = deque(maxlen=max_events)
+        self._seq = 0
+        self._lock = threading.Lock()
+        self._waiters = set()   # (loop, asyncio.Event) of blocked readers
+        self._state = {"status": "queued", "stage": None, "stage_index": None, "stage_started_at": None,
+                       "started_at": None, "fraction": None, "leaderboard": [], "tuning": None,
+                       "search": None, "best_model": None, "error": None}
+
+    @property
+    def seq(self):
+        return self._seq
+
+    def append(self, event, close=False):
+        """Record `event`, wake the readers and return it with its "seq" and "eta_s"."""
+        with self._lock:
+            self._seq += 1
+            event = convert_json_safe(dict(event, seq=self._seq))
+            event.setdefault("time", time.time())
+            self._update(event)
+            event["eta_s"] = self._eta(event["time"])
+            self._events.append(event)
+            self.closed = self.closed or close
+            waiters = list(self._waiters)
+        for loop, ready in waiters:
+            try:
+                loop.call_soon_threadsafe(ready.set)
+            except RuntimeError:   # the reader's loop is gone
+                pass
+        return event
+
+    def _update(self, event):
+        state, kind = self._state, event["type"]
+        if kind == "stage" and event.get("status") == "started":
+            state.update(status="running", stage=event["stage"], stage_index=event.get("index"),
+                         stage_started_at=event["time"], fraction=None)
+            state["started_at"] = state["started_at"] or event["time"]
+        elif kind == "candidate":
+            state["leaderboard"] = [e for e in state["leaderboard"] if e.get("Model") != event["result"]["Model"]]
+            state["leaderboard"].append(event["result"])
+            state["leaderboard"].sort(key=lambda e: (e.get("Score") is None, -(e.get("Score") or 0)))
+            if event.get("total"):
+                state["fraction"] = min(event["completed"] / event["total"], 1.0)
+        elif kind == "tuning":
+            state["tuning"] = {k: event.get(k) for k in ("model", "completed", "total", "best_score",
+                                                           "best_params")}
+            if event.get("total"):
+                state["fraction"] = event["completed"] / event["total"]
+        elif kind == "search":
+            state["search"] = {k: event.get(k) for k in ("completed", "best_score", "best_family")}
+            # The search stops at whichever budget runs out first
+            fractions = []
+            if event.get("max_fits"):
+                fractions.append(event["completed"] / event["max_fits"])
+            if event.get("time_budget"):
+                fractions.append((event["time"] - state["stage_started_at"]) / event["time_budget"])
+            state["fraction"] = min(max(fractions), 1.0) if fractions else None
+        elif kind == "finished":
+            state.update(status=event.get("status"), error=event.get("error"),
+                         best_model=event.get("best_model"), fraction=None)
+
+    def _eta(self, now):
+        """
+        Seconds left: the current stage's share extrapolated from its progress
+        fraction (or its expected duration), plus the expected duration of
+        every later stage.
+        """
+        state = self._state
+        if state["status"] != "running" or state["stage"] not in STAGES:
+            return None
+        elapsed = now - state["stage_started_at"]
+        if state["fraction"]:
+            remaining = elapsed * (1 - state["fraction"]) / state["fraction"]
+        else:
+            remaining = max(0.0, expected_stage_seconds(state["stage"]) - elapsed)
+        later = STAGES[STAGES.index(state["stage"]) + 1:]
+        return round(remaining + sum(expected_stage_seconds(s) for s in later), 1)
+
+    def snapshot(self):
+        """The job's state as of the last event, as a "snapshot" event with the current seq."""
+        with self._lock:
+            now = time.time()
+            state = dict(self._state, leaderboard=list(self._state["leaderboard"]))
+            return dict(state, type="snapshot", job_id=self.job_id, seq=self._seq, time=now,
+                        elapsed_s=now - state["started_at"] if state["started_at"] else None,
+                        eta_s=self._eta(now), closed=self.closed)
+
+    def since(self, seq):
+        """(events after `seq`, whether some were already dropped from the window)."""
+        with self._lock:
+            events = [e for e in self._events if e["seq"] > seq]
+            missed = bool(self._events) and self._events[0]["seq"] > seq + 1
+            return events, missed
+
+    async def wait(self, seq, timeout=HEARTBEAT_SECONDS):
+        """Block until an event newer than `seq` exists or the log closes; False on timeout."""
+        ready = asyncio.Event()
+        waiter = (asyncio.get_running_loop(), ready)
+        with self._lock:
+            if self._seq > seq or self.closed:
+                return True
+            self._waiters.add(waiter)
+        try:
+            await asyncio.wait_for(ready.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+        finally:
+            with self._lock:
+                self._waiters.discard(waiter)
+
+    async def stream(self, since=None, heartbeat=HEARTBEAT_SECONDS):
+        """
+        Server-Sent Events for one client: a snapshot (unless resuming from
+        `since`), then every new event until the job finished, with comment
+        heartbeats while idle. A client that falls behind the retained
+        window gets a fresh snapshot instead of the events it missed.
+        """
+        if since is None or since > self._seq:
+            snapshot = self.snapshot()
+            since = snapshot["seq"]
+            yield format_sse(snapshot)
+        while True:
+            events, missed = self.since(since)
+            if missed:
+                snapshot = self.snapshot()
+                events = [e for e in events if e["seq"] > snapshot["seq"]]
+                yield format_sse(dict(snapshot, type="resync"))
+                since = snapshot["seq"]
+            for event in events:
+                yield format_sse(event)
+                since = event["seq"]
+            if self.closed and since >= self._seq:
+                return
+            if not await self.wait(since, heartbeat):
+                yield format_sse(comment="keep-alive")
@@ -0,0 +1,96 @@
+# fingerprint.py
+import json
+import hashlib
+import numpy as np
+import pandas as pd
+
+# -----------------------------
+# Defaults
+# -----------------------------
+# Per-row fingerprints of a stored dataset, raw little-endian uint64 next to its data file
+FINGERPRINT_FILE = "fingerprints.u64"
+
+
+def _hashable(df):
+    """
+    Integer, nullable-integer, boolean and float columns as float64, so the
+    downcast (int8, float32) and nullable (Int64) spellings of a value hash
+    alike; strings and categoricals already hash by value.
+    """
+    convert = {col: "float64" for col, dtype in df.dtypes.items()
+               if (pd.api.types.is_integer_dtype(dtype) or pd.api.types.is_bool_dtype(dtype)
+                   or (pd.api.types.is_float_dtype(dtype) and dtype != np.float64))}
+    return df.astype(convert) if convert else df
+
+
+def row_fingerprints(df, columns=None):
+    """
+    64-bit fingerprint of every row (pandas.util.hash_pandas_object over
+    the values, index excluded) as a uint64 array. Equal rows get equal
+    fingerprints; distinct rows collide with probability ~n^2 / 2^65.
+    """
+    frame = df if columns is None else df[columns]
+    return pd.util.hash_pandas_object(_hashable(frame), index=False).to_numpy(dtype=np.uint64)
+
+
+def _mix(fingerprints):
+    """splitmix64 finalizer, so sums / xors of related fingerprints don't cancel."""
+    x = np.asarray(fingerprints, dtype=np.uint64)
+    with np.errstate(over="ignore"):
+        x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+        x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return x ^ (x >> np.uint64(31))
+
+
+class DatasetFingerprint:
+    """
+    Order-independent digest of a dataset's rows and column names, built
+    from row fingerprints one chunk at a time: the same rows in any order
+    (or re-serialised with different quoting / line endings) give the same
+    digest, so it can key caches of order-free results such as plots.
+    """
+
+    def __init__(self, columns):
+        self.columns = [str(c) for c in columns]
+        self.rows = 0
+        self._sum = np.uint64(0)
+        self._xor = np.uint64(0)
+
+    def update(self, fingerprints):
+        mixed = _mix(fingerprints)
+        with np.errstate(over="ignore"):
+            self._sum = self._sum + mixed.sum(dtype=np.uint64)
+        self._xor ^= np.bitwise_xor.reduce(mixed, initial=np.uint64(0))
+        self.rows += len(mixed)
+        return self
+
+    def hexdigest(self):
+        payload = json.dumps([self.columns, self.rows, int(self._sum), int(self._xor)])
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:32]
+
+
+def dataset_fingerprint(fingerprints, columns):
+    return DatasetFingerprint(columns).update(fingerprints).hexdigest()
+
+
+def duplicate_mask(fingerprints):
+    """True for every row whose fingerprint already occurred earlier (drop_duplicates' keep="first")."""
+    return pd.Series(np.asarray(fingerprints, dtype=np.uint64)).duplicated().to_numpy()
+
+
+def count_shared(fingerprints, reference):
+    """Number of `fingerprints` that also occur in `reference` (hash lookup, no sort)."""
+    if len(fingerprints) == 0 or len(reference) == 0:
+        return 0
+    return int(pd.Series(np.asarray(fingerprints, dtype=np.uint64)).isin(
+        pd.Index(np.asarray(reference, dtype=np.uint64))).sum())
+
+
+def write_fingerprints(fingerprints, f):
+    """Append a chunk of fingerprints to the open binary file `f`."""
+    np.asarray(fingerprints, dtype="<u8").tofile(f)
+
+
+def read_fingerprints(path):
+    """The fingerprints written by write_fingerprints, memory-mapped."""
+    return np.memmap(path, dtype="<u8", mode="r")
@@ -1,28 +1,31 @@
 # functions.py
 import pandas as pd
 import numpy as np
-from scipy import stats
-from sklearn.model_selection import train_test_split, RandomizedSearchCV
+from sklearn.model_selection import train_test_split, RandomizedSearchCV, ParameterSampler
 from sklearn.preprocessing import StandardScaler, LabelEncoder
-from sklearn.ensemble import RandomForestClassifier, RandomForestRegressor
-from sklearn.linear_model import LinearRegression, LogisticRegression
-from sklearn.svm import SVC, SVR
-from xgboost import XGBClassifier, XGBRegressor
 from sklearn.metrics import accuracy_score, f1_score, r2_score, mean_squared_error, mean_absolute_error, roc_auc_score
 from sklearn.utils.class_weight import compute_sample_weight
 from sklearn.impute import SimpleImputer
-import matplotlib.pyplot as plt
-import seaborn as sns
 import os
 import joblib
-import pickle
-import io
-import base64
 
 # -----------------------------
 # Basic Data Functions
 # -----------------------------
-def load_and_validate_csv(file_path):
+def load_and_validate_csv(file_path, optimize=True, **read_kwargs):
+    """
+    Load a CSV and check it isn't empty.
+
+    With optimize=True the file is parsed in chunks with compact dtypes
+    (downcast numerics, low-cardinality strings as category); the memory
+    report is attached as df.attrs["ingestion"]. See ingestion.read_csv_optimized.
+    """
+    if optimize:
+        from ingestion import read_csv_optimized
+        df, report = read_csv_optimized(file_path, **read_kwargs)
+        df.attrs["ingestion"] = report
+        return df
+
     df = pd.read_csv(file_path)
     if df.empty:
         raise ValueError("Dataset is empty")
@@ -84,8 +87,16 @@ def impute_missing(X_train, X_test, strategies=None, default="auto"):
 
     return X_train, X_test, imputers
 
-def remove_duplicates(df):
-    return df.drop_duplicates()
+def remove_duplicates(df, fingerprints=None):
+    """
+    drop_duplicates(keep="first") on 64-bit row fingerprints (fingerprint.py):
+    one vectorised hash per row instead of hashing whole object rows.
+    Pass `fingerprints` when they were already computed (e.g. at ingestion).
+    """
+    from fingerprint import row_fingerprints, duplicate_mask
+    if fingerprints is None:
+        fingerprints = row_fingerprints(df)
+    return df.loc[~duplicate_mask(fingerprints)]
 
 def fit_outlier_caps(X_train, method="iqr"):
     """Compute outlier caps/thresholds from training data only."""
@@ -186,9 +197,9 @@ def feature_engineering(X_train, X_test, y_train, y_test):
 # Problem Detection
 # -----------------------------
 def detect_problem_type(y):
-    if y.dtype == 'object' or y.dtype.name == 'category':
+    if not pd.api.types.is_numeric_dtype(y):
         return "classification"
-    elif y.nunique() <= 20 and y.dtype in [int, np.int64]:
+    elif y.nunique() <= 20 and pd.api.types.is_integer_dtype(y):
         return "classification"
     else:
         return "regression"
@@ -197,6 +208,11 @@ def detect_problem_type(y):
 # Candidate Models
 # -----------------------------
 def get_candidate_models(problem_type="classification"):
+    # Model libraries load here, with the first candidate list, rather than with this module
+    from sklearn.ensemble import RandomForestClassifier, RandomForestRegressor
+    from sklearn.linear_model import LinearRegression, LogisticRegression
+    from sklearn.svm import SVC, SVR
+    from xgboost import XGBClassifier, XGBRegressor
     if problem_type == "classification":
         models = {
             "LogisticRegression": LogisticRegression(max_iter=500, C=1.0, solver='lbfgs'),
@@ -226,6 +242,11 @@ def evaluate_model(model, X_train, X_test, y_train, y_test, problem_type="classi
             model.set_params(sample_weight=class_weights)
 
     model.fit(X_train, y_train)
+    metrics, score = score_model(model, X_test, y_test, problem_type)
+    return metrics, score, model
+
+def score_model(model, X_test, y_test, problem_type="classification"):
+    """Test-set metrics of an already fitted model; returns (metrics, score)."""
     y_pred = model.predict(X_test)
 
     if problem_type == "classification":
@@ -235,7 +256,7 @@ def evaluate_model(model, X_train, X_test, y_train, y_test, problem_type="classi
 
         roc_auc = np.nan
         if y_proba is not None:
-            if len(np.unique(y_test)) <= 2 and y_proba.ndim == 2 and y_proba.shape[1] == 2:
+            if len(np.unique(y_test)) == 2 and y_proba.ndim == 2 and y_proba.shape[1] == 2:
                 roc_auc = roc_auc_score(y_test, y_proba[:, 1])
             elif len(np.unique(y_test)) > 2 and y_proba.ndim > 1:
                 roc_auc = roc_auc_score(y_test, y_proba, multi_class="ovr")
@@ -249,29 +270,213 @@ def evaluate_model(model, X_train, X_test, y_train, y_test, problem_type="classi
         metrics = {"MAE": mae, "RMSE": rmse, "R2": r2}
         score = r2
 
-    return metrics, score, model
+    return metrics, score
+
+def _set_thread_budget(model, n_threads):
+    """Cap the estimator's own threading (RandomForest / XGBoost expose n_jobs)."""
+    if "n_jobs" in model.get_params():
+        model.set_params(n_jobs=n_threads)
+    return model
+
+
+def _fit_candidate_worker(conn, model, X_train, X_test, y_train, y_test, problem_type, n_threads):
+    """Child-process entry point: fit one candidate and send the result and its profile back."""
+    from threadpoolctl import threadpool_limits
+    from profiling import measure
+    try:
+        with threadpool_limits(limits=n_threads), measure() as stats:
+            result = evaluate_model(
+                _set_thread_budget(model, n_threads), X_train, X_test, y_train, y_test, problem_type
+            )
+        conn.send(("ok", result, stats))
+    except Exception as e:
+        conn.send(("failed", f"{type(e).__name__}: {e}", None))
+    finally:
+        conn.close()
+
 
-def train_candidates(candidates, X_train, X_test, y_train, y_test, problem_type):
+def candidate_view(X, name):
+    """
+    The encoding candidate `name` is fitted on: X itself, or X[name] /
+    X["default"] when X maps candidate names to encoded views.
+    """
+    if isinstance(X, dict):
+        return X.get(name, X["default"])
+    return X
+
+
+def _subset_rows(X, y, rows):
+    """Rows `rows` (positions) of X and y, or both unchanged when rows is None."""
+    if rows is None:
+        return X, y
+    X = X.iloc[rows] if hasattr(X, "iloc") else X[rows] if hasattr(X, "tocsr") else np.asarray(X)[rows]
+    y = y.iloc[rows] if hasattr(y, "iloc") else np.asarray(y)[rows]
+    return X, y
+
+
+def _train_candidates_parallel(candidates, X_train, X_test, y_train, y_test, problem_type,
+                               n_jobs, timeout, train_rows=None, on_outcome=None):
+    """
+    Fit candidates in separate processes, at most `n_jobs` at a time.
+    `on_outcome(name, outcome)` is called as each candidate finishes.
+
+    Each process gets cpu_count // n_jobs BLAS/OpenMP threads so XGBoost and
+    RandomForest don't oversubscribe the machine. A candidate still running
+    `timeout` seconds after it started is terminated.
+    """
+    import multiprocessing as mp
+    from multiprocessing.connection import wait
+    import time
+
+    ctx = mp.get_context("spawn")
+    n_threads = max(1, (os.cpu_count() or 1) // n_jobs)
+    pending = list(candidates.items())
+    running = {}  # conn -> (name, process, started_at)
+    outcomes = {}
+
+    while pending or running:
+        while pending and len(running) < n_jobs:
+            name, model = pending.pop(0)
+            X_fit, y_fit = _subset_rows(candidate_view(X_train, name), y_train, (train_rows or {}).get(name))
+            parent_conn, child_conn = ctx.Pipe(duplex=False)
+            proc = ctx.Process(
+                target=_fit_candidate_worker,
+                args=(child_conn, model, X_fit, candidate_view(X_test, name), y_fit, y_test, problem_type, n_threads),
+                daemon=True,
+            )
+            proc.start()
+            child_conn.close()
+            running[parent_conn] = (name, proc, time.monotonic())
+
+        if timeout is None:
+            wait_for = None
+        else:
+            now = time.monotonic()
+            wait_for = max(0.0, min(started + timeout - now for _, _, started in running.values()))
+
+        for conn in wait(list(running), timeout=wait_for):
+            name, proc, started = running.pop(conn)
+            try:
+                outcomes[name] = conn.recv()
+            except EOFError:
+                outcomes[name] = ("failed", f"worker exited with code {proc.exitcode}",
+                                  {"wall_s": time.monotonic() - started})
+            conn.close()
+            proc.join()
+            if on_outcome is not None:
+                on_outcome(name, outcomes[name])
+
+        if timeout is not None:
+            now = time.monotonic()
+            for conn, (name, proc, started) in list(running.items()):
+                if now - started >= timeout:
+                    proc.terminate()
+                    proc.join()
+                    conn.close()
+                    del running[conn]
+                    outcomes[name] = ("timed out", None, {"wall_s": now - started})
+                    if on_outcome is not None:
+                        on_outcome(name, outcomes[name])
+
+    # Keep the original candidate order in the leaderboard
+    return [(name, outcomes[name]) for name in candidates]
+
+
+def _metrics_entry(name, status, payload):
+    """Leaderboard entry of one candidate outcome."""
+    if status != "ok":
+        entry = {"Model": name, "Status": status}
+        if payload:
+            entry["Error"] = payload
+        return entry
+    metrics = payload[0]
+    metrics["Model"] = name
+    metrics["Status"] = status
+    return metrics
+
+
+def train_candidates(candidates, X_train, X_test, y_train, y_test, problem_type,
+                     n_jobs=1, timeout=None, train_rows=None, fit_log=None, on_result=None):
+    """
+    Train and evaluate every candidate model.
+
+    n_jobs : int, default=1
+        Number of candidates fitted concurrently in worker processes
+        (-1 = one per CPU). 1 with no timeout fits them in-process, one after another.
+    timeout : float, optional
+        Wall-clock budget in seconds per candidate. Candidates that exceed it
+        are dropped and reported with Status "timed out" in metrics_list.
+    train_rows : dict, optional
+        Candidate name -> row positions of X_train/y_train to fit on
+        (None or missing = all rows); see screening.screen_candidates.
+    X_train / X_test may be dicts of per-candidate encodings ({"default": ...,
+    "<name>": ...}, see candidate_view), e.g. sparse one-hot for most
+    models and native categoricals for XGBoost.
+    fit_log : list, optional
+        Gets one {"model", "status", "rows", "wall_s", "cpu_s", "peak_rss_mb"}
+        entry per candidate (profiling.measure, in the worker when parallel).
+    on_result : callable, optional
+        Called with each candidate's metrics entry (plus "Score", "Train_Rows"
+        and "Wall_s") as soon as that candidate finishes, for live progress.
+    """
     metrics_list, scores_list, models_list, names_list = [], [], [], []
 
-    for name, model in candidates.items():
-        metrics, score, trained_model = evaluate_model(
-            model, X_train, X_test, y_train, y_test, problem_type
+    if n_jobs == -1:
+        n_jobs = os.cpu_count() or 1
+    n_jobs = max(1, min(n_jobs, len(candidates)))
+
+    def n_rows(name):
+        rows = (train_rows or {}).get(name)
+        return len(y_train) if rows is None else len(rows)
+
+    def finished(name, outcome):
+        if on_result is not None:
+            status, payload, stats = outcome
+            on_result(dict(_metrics_entry(name, status, payload), Train_Rows=n_rows(name),
+                           Score=payload[1] if status == "ok" else None, Wall_s=(stats or {}).get("wall_s")))
+
+    if n_jobs == 1 and timeout is None:
+        from profiling import measure
+        outcomes = []
+        for name, model in candidates.items():
+            X_fit, y_fit = _subset_rows(candidate_view(X_train, name), y_train, (train_rows or {}).get(name))
+            # A failing candidate is recorded and skipped, as in the parallel path
+            try:
+                with measure() as stats:
+                    result = evaluate_model(model, X_fit, candidate_view(X_test, name), y_fit, y_test, problem_type)
+            except Exception as e:
+                outcomes.append((name, ("failed", f"{type(e).__name__}: {e}", stats)))
+            else:
+                outcomes.append((name, ("ok", result, stats)))
+            finished(name, outcomes[-1][1])
+    else:
+        outcomes = _train_candidates_parallel(
+            candidates, X_train, X_test, y_train, y_test, problem_type, n_jobs, timeout, train_rows,
+            on_outcome=finished
         )
-        metrics["Model"] = name
-        metrics_list.append(metrics)
+
+    for name, (status, payload, stats) in outcomes:
+        if fit_log is not None:
+            fit_log.append(dict(stats or {}, model=name, status=status, rows=n_rows(name)))
+        metrics_list.append(_metrics_entry(name, status, payload))
+        if status != "ok":
+            continue
+        _, score, trained_model = payload
         scores_list.append(score)
         models_list.append(trained_model)
         names_list.append(name)
 
+    if not models_list:
+        raise RuntimeError("No candidate model finished successfully within the time budget.")
+
     return metrics_list, scores_list, models_list, names_list
 
 def select_best_model(scores_list, models_list, names_list):
     best_idx = np.argmax(scores_list)
     return models_list[best_idx], names_list[best_idx], best_idx
 
-def tune_best_model(best_model_name, best_model, X_train, y_train, problem_type="classification",
-                    n_iter=20, random_state=42):
+def get_param_distributions(problem_type="classification"):
+    """Hyperparameter search space per model family, and the matching sklearn scorer."""
     if problem_type == "classification":
         param_distributions = {
             "LogisticRegression": {"C": [0.01,0.1,1,10], "solver": ["lbfgs"]},
@@ -288,19 +493,71 @@ def tune_best_model(best_model_name, best_model, X_train, y_train, problem_type=
             "XGBoost": {"n_estimators":[50,100,200], "max_depth":[3,5,7], "learning_rate":[0.01,0.05,0.1]}
         }
         scoring = "r2"
+    return param_distributions, scoring
+
+def tune_best_model(best_model_name, best_model, X_train, y_train, problem_type="classification",
+                    n_iter=20, random_state=42, fit_log=None, engine=None, on_result=None):
+    """
+    Randomized search over get_param_distributions for the chosen family.
+    With engine="fold_cache" (tuning.TUNING_ENGINE) the folds are built
+    once and shared memory-mapped with the workers
+    (tuning.cached_random_search); "sklearn" runs RandomizedSearchCV.
+    `fit_log` (a list) gets one entry per sampled configuration with its
+    summed fit and score seconds over the CV folds. `on_result` is called
+    with {"model", "iteration", "completed", "total", "params", "cv_score",
+    "best_score", "best_params"} per configuration as it finishes (all at
+    the end with the sklearn engine).
+    """
+    from tuning import TUNING_ENGINE, cached_random_search
+    param_distributions, scoring = get_param_distributions(problem_type)
+    engine = engine or TUNING_ENGINE
+    cv = 3
+    best = {"score": None, "params": None, "completed": 0}
+
+    def scored(i, params, score, total):
+        best["completed"] += 1
+        if best["score"] is None or score > best["score"]:
+            best["score"], best["params"] = score, params
+        if on_result is not None:
+            on_result({"model": best_model_name, "iteration": i, "completed": best["completed"], "total": total,
+                       "params": params, "cv_score": score, "best_score": best["score"],
+                       "best_params": best["params"]})
 
     if best_model_name in param_distributions and param_distributions[best_model_name]:
-        random_search = RandomizedSearchCV(
-            estimator=best_model,
-            param_distributions=param_distributions[best_model_name],
-            n_iter=n_iter,
-            cv=3,
-            scoring=scoring,
-            n_jobs=-1,
-            random_state=random_state
-        )
-        random_search.fit(X_train, y_train)
-        best_model = random_search.best_estimator_
+        total = len(ParameterSampler(param_distributions[best_model_name], n_iter, random_state=random_state))
+        if engine == "fold_cache":
+            best_model, results = cached_random_search(
+                best_model, param_distributions[best_model_name], X_train, y_train, problem_type, scoring,
+                n_iter=n_iter, cv=cv, n_jobs=-1, random_state=random_state, family=best_model_name,
+                on_result=lambda i, params, score: scored(i, params, score, total)
+            )
+        elif engine == "sklearn":
+            random_search = RandomizedSearchCV(
+                estimator=best_model,
+                param_distributions=param_distributions[best_model_name],
+                n_iter=n_iter,
+                cv=cv,
+                scoring=scoring,
+                n_jobs=-1,
+                random_state=random_state
+            )
+            random_search.fit(X_train, y_train)
+            best_model = random_search.best_estimator_
+            results = random_search.cv_results_
+            for i, params in enumerate(results["params"]):
+                scored(i, params, float(results["mean_test_score"][i]), len(results["params"]))
+        else:
+            raise ValueError(f"Unknown tuning engine '{engine}'")
+        if fit_log is not None:
+            for i, params in enumerate(results["params"]):
+                fit_log.append({
+                    "model": best_model_name,
+                    "iteration": i,
+                    "params": params,
+                    "fit_s": float(results["mean_fit_time"][i] * cv),
+                    "score_s": float(results["mean_score_time"][i] * cv),
+                    "cv_score": float(results["mean_test_score"][i]),
+                })
 
     return best_model
 
@@ -349,10 +606,32 @@ def train_and_evaluate(X_train, y_train, X_test, y_test, problem_type="classific
 # -----------------------------
 # EDA & JSON Report Generation
 # -----------------------------
-def generate_report_json(df, cleaning_summary, feature_eng_summary, model_comparison, best_model_details, target=None):
+def generate_report_json(df, cleaning_summary, feature_eng_summary, model_comparison, best_model_details,
+                         target=None, max_plot_columns=None, plot_cache=None, inline_plots=False,
+                         plot_url=None, eda_stats=None):
+    """
+    Build the report dict: dataset/cleaning summaries, EDA statistics and plots.
+
+    By default `plots` holds descriptors ({"kind", "column", "url"}) and the
+    images are served on demand by the /plots/ endpoint; `plot_url(kind, column)`
+    builds the URL. With inline_plots=True every plot is rendered now
+    (reporting.render_plots) and embedded as base64. At most
+    `max_plot_columns` columns are plotted.
+
+    `eda_stats` is an eda_stats.StatsAccumulator result; when omitted the one
+    stored with the dataset (df.attrs["eda_stats"]) is used, else it is
+    computed in a single pass.
+    """
     import warnings
+    from eda_stats import compute_eda_stats, OTHER_BUCKET
+    from reporting import plan_plots, render_plots, plot_key, dataset_cache_key, MAX_PLOT_COLUMNS
+    from correlation import correlation_summary
     warnings.filterwarnings("ignore")
-    
+
+    # Single-pass statistics; reuse the ones computed during ingestion if available
+    if eda_stats is None:
+        eda_stats = df.attrs.get("eda_stats") or compute_eda_stats(df).result()
+
     report = {}
     report['dataset_summary'] = {
         "shape": df.shape,
@@ -365,93 +644,45 @@ def generate_report_json(df, cleaning_summary, feature_eng_summary, model_compar
     # --- EDA ---
     eda = {}
     # Missing values
-    eda['missing_values'] = df.isnull().sum().to_dict()
-    
+    eda['missing_values'] = eda_stats['missing_values']
+
     # Numeric features
-    num_cols = df.select_dtypes(include=[np.number]).columns
-    numeric_summary = {}
-    plots = {}
+    num_cols = list(eda_stats['numeric_summary'])
+    eda['numeric_summary'] = eda_stats['numeric_summary']
+
+    # Categorical features (top-k values + "(other)" bucket)
+    cat_cols = list(eda_stats['categorical_summary'])
+    eda['categorical_summary'] = eda_stats['categorical_summary']
+    eda['categorical_cardinality'] = eda_stats['categorical_cardinality']
+    eda['stats_approximate'] = eda_stats['approximate']
+    value_counts = {
+        col: pd.Series({k: v for k, v in counts.items() if k != OTHER_BUCKET}, dtype="int64")
+        for col, counts in eda_stats['categorical_summary'].items()
+    }
 
-    for col in num_cols:
-        numeric_summary[col] = {
-            "mean": df[col].mean(),
-            "median": df[col].median(),
-            "std": df[col].std(),
-            "min": df[col].min(),
-            "max": df[col].max(),
-            "outliers": int(((df[col] < (df[col].quantile(0.25)-1.5*(df[col].quantile(0.75)-df[col].quantile(0.25)))) |
-                             (df[col] > (df[col].quantile(0.75)+1.5*(df[col].quantile(0.75)-df[col].quantile(0.25))))).sum())
+    # Correlations: one float32 blockwise pass (sampled rows) gives the strongest pairs, the target
+    # correlations and categorical associations instead of the full matrix
+    correlations = correlation_summary(df, num_cols, cat_cols, target=target if target in df.columns else None)
+    eda['target_correlation'] = correlations.pop('target_correlation')
+    eda['target_association'] = correlations.pop('target_association')
+    eda['correlations'] = correlations
+
+    # Plots (histogram/boxplot per numeric, countplot/pie per categorical, heatmap)
+    descriptors, skipped = plan_plots(
+        num_cols, cat_cols, eda_stats['categorical_cardinality'],
+        max_columns=MAX_PLOT_COLUMNS if max_plot_columns is None else max_plot_columns, target=target,
+    )
+    if inline_plots:
+        # The heatmap is drawn from the correlation summary's matrix, not recomputed
+        plots = render_plots(df, descriptors, dataset_key=dataset_cache_key(df), cache=plot_cache,
+                             value_counts=value_counts, correlations=correlations)
+    else:
+        plots = {
+            plot_key(kind, col): {"kind": kind, "column": col,
+                                  "url": plot_url(kind, col) if plot_url else None}
+            for kind, col in descriptors
         }
-
-        # Histogram
-        fig, ax = plt.subplots(figsize=(5,4))
-        sns.histplot(df[col], kde=True, bins=30, ax=ax)
-        ax.set_title(f"Histogram - {col}")
-        buf = io.BytesIO()
-        plt.savefig(buf, format="png")
-        buf.seek(0)
-        plots[f"hist_{col}"] = base64.b64encode(buf.read()).decode('utf-8')
-        plt.close(fig)
-
-        # Boxplot
-        fig, ax = plt.subplots(figsize=(5,4))
-        sns.boxplot(x=df[col], ax=ax)
-        ax.set_title(f"Boxplot - {col}")
-        buf = io.BytesIO()
-        plt.savefig(buf, format="png")
-        buf.seek(0)
-        plots[f"box_{col}"] = base64.b64encode(buf.read()).decode('utf-8')
-        plt.close(fig)
-
-    eda['numeric_summary'] = numeric_summary
-
-    # Categorical features
-    cat_cols = df.select_dtypes(include=['object', 'category']).columns
-    categorical_summary = {}
-    for col in cat_cols:
-        counts = df[col].value_counts()
-        categorical_summary[col] = counts.to_dict()
-
-        # Countplot
-        fig, ax = plt.subplots(figsize=(5,4))
-        sns.countplot(x=df[col], order=counts.index[:10], ax=ax)
-        ax.set_title(f"Countplot - {col}")
-        buf = io.BytesIO()
-        plt.savefig(buf, format="png")
-        buf.seek(0)
-        plots[f"count_{col}"] = base64.b64encode(buf.read()).decode('utf-8')
-        plt.close(fig)
-
-        # Pie chart if categories <=6
-        if df[col].nunique() <= 6:
-            fig, ax = plt.subplots(figsize=(4,4))
-            counts.plot.pie(autopct="%1.1f%%", startangle=90, ax=ax)
-            ax.set_ylabel("")
-            ax.set_title(f"Pie Chart - {col}")
-            buf = io.BytesIO()
-            plt.savefig(buf, format="png")
-            buf.seek(0)
-            plots[f"pie_{col}"] = base64.b64encode(buf.read()).decode('utf-8')
-            plt.close(fig)
-
-    eda['categorical_summary'] = categorical_summary
-
-    # Correlation with target
-    target_corr = None
-    if target and target in df.columns and df[target].dtype in [np.float64, np.int64]:
-        target_corr = df.corr(numeric_only=True)[target].sort_values(ascending=False).to_dict()
-    eda['target_correlation'] = target_corr
-
-    # Correlation heatmap
-    if len(num_cols) > 1:
-        fig, ax = plt.subplots(figsize=(6,5))
-        sns.heatmap(df[num_cols].corr(), annot=True, fmt=".2f", cmap="coolwarm", ax=ax)
-        ax.set_title("Correlation Heatmap")
-        buf = io.BytesIO()
-        plt.savefig(buf, format="png")
-        buf.seek(0)
-        plots["correlation_heatmap"] = base64.b64encode(buf.read()).decode('utf-8')
-        plt.close(fig)
+    eda['plots_skipped_columns'] = skipped
 
     report['eda'] = eda
     report['plots'] = plots
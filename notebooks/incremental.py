@@ -0,0 +1,172 @@
+# incremental.py
+import os
+import math
+import joblib
+import numpy as np
+from sklearn.utils.class_weight import compute_sample_weight
+
+from functions import automated_train_test_split, score_model
+import model_formats
+
+# -----------------------------
+# Defaults
+# -----------------------------
+# Previously seen training rows replayed alongside the new ones, as a multiple of the new rows
+REPLAY_RATIO = float(os.environ.get("AUTOML_INCREMENTAL_REPLAY_RATIO", 1.0))
+# Largest preprocessing drift (see PreprocessingPipeline.partial_fit) tolerated under an old model
+MAX_DRIFT = float(os.environ.get("AUTOML_INCREMENTAL_MAX_DRIFT", 0.25))
+# Held-out rows of the previous dataset added to the evaluation set
+MIN_EVAL_ROWS = 2000
+
+
+class IncrementalNotPossible(Exception):
+    """The previous model can't be updated in place; retrain from scratch instead."""
+
+
+def warm_start_model(model, X, y, n_prev_rows, problem_type="classification"):
+    """
+    Continue training a fitted model on new rows X, y.
+
+    - XGBoost: continued boosting from the existing booster,
+    - estimators with partial_fit: one partial_fit pass,
+    - RandomForest: warm_start, growing new trees on X,
+    - other warm_start estimators (LogisticRegression): refit from the
+      current coefficients.
+
+    Added capacity (boosting rounds, trees) is proportional to
+    len(X) / n_prev_rows. Returns (model, method, added); raises
+    IncrementalNotPossible for estimators that can only be refitted.
+    """
+    params = model.get_params()
+    ratio = X.shape[0] / max(n_prev_rows, 1)
+    sample_weight = None
+    if problem_type == "classification":
+        classes = getattr(model, "classes_", None)
+        if classes is not None and not np.array_equal(np.unique(y), np.asarray(classes)):
+            raise IncrementalNotPossible("New rows don't cover the model's classes")
+        if "class_weight" not in params:
+            sample_weight = compute_sample_weight("balanced", y)
+
+    if hasattr(model, "get_booster"):
+        booster = model.get_booster()
+        added = max(1, math.ceil(booster.num_boosted_rounds() * ratio))
+        model.set_params(n_estimators=added, early_stopping_rounds=None)
+        model.fit(X, y, sample_weight=sample_weight, xgb_model=booster, verbose=False)
+        model.set_params(n_estimators=model.get_booster().num_boosted_rounds())
+        return model, "continued_boosting", added
+
+    if hasattr(model, "partial_fit"):
+        kwargs = {"classes": model.classes_} if problem_type == "classification" else {}
+        model.partial_fit(X, y, **kwargs)
+        return model, "partial_fit", 0
+
+    if "warm_start" in params:
+        added = 0
+        if hasattr(model, "estimators_"):
+            added = max(1, math.ceil(len(model.estimators_) * ratio))
+            model.set_params(n_estimators=len(model.estimators_) + added)
+        model.set_params(warm_start=True)
+        try:
+            model.fit(X, y)
+        finally:
+            model.set_params(warm_start=False)
+        return model, "warm_start", added
+
+    raise IncrementalNotPossible(f"{type(model).__name__} has no warm start")
+
+
+def incremental_retrain(df, target, run, random_state=42):
+    """
+    Update the model recorded in `run` (DatasetStore.record_run) with the
+    rows `df` has beyond the `run["rows"]` it was trained on.
+
+    New labelled rows are split like a full run. The saved preprocessor is
+    updated with partial_fit on the new training rows, and the model is
+    warm-started on them plus a replay sample (REPLAY_RATIO) of the old
+    training rows; families without a warm start are refitted on all
+    training rows with their previous hyperparameters. Both the previous
+    and the updated model are scored on the new test rows plus a sample of
+    the old test rows.
+
+    Returns a dict with model, preprocessor, metrics, previous_metrics,
+    score and summary; raises IncrementalNotPossible when the run can't be
+    reused.
+    """
+    n_prev = int(run["rows"])
+    if len(df) <= n_prev:
+        raise IncrementalNotPossible("No appended rows")
+    for key in ("model_path", "preprocessor_path"):
+        if not os.path.exists(run[key]):
+            raise IncrementalNotPossible(f"{run[key]} no longer exists")
+    if os.stat(run["model_path"]).st_mtime_ns != run["model_version"]:
+        raise IncrementalNotPossible(f"{run['model_path']} was overwritten by another run")
+
+    # The preprocessor selects its own feature columns, so row slices of df are passed as is
+    model = model_formats.load(os.path.splitext(run["model_path"])[0], mmap=False)
+    preprocessor = joblib.load(run["preprocessor_path"])
+    target_encoder = preprocessor.target_encoder_
+    problem_type = run["problem_type"]
+
+    labelled = df[target].notna().to_numpy()
+    old_pos = np.flatnonzero(labelled[:n_prev])
+    new_pos = n_prev + np.flatnonzero(labelled[n_prev:])
+    if len(new_pos) < 2:
+        raise IncrementalNotPossible("Too few new labelled rows")
+
+    # Same split a full run made, recomputed on row positions only
+    old_train, old_test, _, _ = automated_train_test_split(old_pos, old_pos, random_state=random_state)
+    new_train, new_test, _, _ = automated_train_test_split(new_pos, new_pos, random_state=random_state)
+    rng = np.random.default_rng(random_state)
+    replay = rng.choice(old_train, size=min(len(old_train), math.ceil(REPLAY_RATIO * len(new_train))),
+                        replace=False)
+    old_eval = rng.choice(old_test, size=min(len(old_test), max(MIN_EVAL_ROWS, len(new_test))),
+                          replace=False)
+    eval_pos = np.sort(np.concatenate([new_test, old_eval]))
+
+    try:
+        y_eval = target_encoder.transform(df[target].iloc[eval_pos])
+        fit_pos = np.sort(np.concatenate([new_train, replay]))
+        y_fit = target_encoder.transform(df[target].iloc[fit_pos])
+    except ValueError as e:
+        raise IncrementalNotPossible(str(e))
+
+    previous_metrics, previous_score = score_model(model, preprocessor.transform(df.iloc[eval_pos]),
+                                                   y_eval, problem_type)
+
+    preprocessor.partial_fit(df.iloc[new_train])
+    if preprocessor.drift_ > MAX_DRIFT:
+        raise IncrementalNotPossible(
+            f"Preprocessing statistics drifted by {preprocessor.drift_:.2f} (limit {MAX_DRIFT})")
+
+    try:
+        model, method, added = warm_start_model(model, preprocessor.transform(df.iloc[fit_pos]), y_fit,
+                                                n_prev_rows=len(old_train), problem_type=problem_type)
+        trained_rows = len(fit_pos)
+    except IncrementalNotPossible:
+        # Keep the chosen family and hyperparameters, skip the search
+        train_pos = np.sort(np.concatenate([old_train, new_train]))
+        model.fit(preprocessor.transform(df.iloc[train_pos]), target_encoder.transform(df[target].iloc[train_pos]))
+        method, added, trained_rows = "refit", 0, len(train_pos)
+
+    metrics, score = score_model(model, preprocessor.transform(df.iloc[eval_pos]), y_eval, problem_type)
+    return {
+        "model": model,
+        "preprocessor": preprocessor,
+        "metrics": metrics,
+        "score": score,
+        "previous_metrics": previous_metrics,
+        "previous_score": previous_score,
+        "summary": {
+            "previous_rows": n_prev,
+            "new_rows": int(len(df) - n_prev),
+            "new_train_rows": int(len(new_train)),
+            "replay_rows": int(len(replay)),
+            "trained_rows": int(trained_rows),
+            "eval_rows": int(len(eval_pos)),
+            "method": method,
+            "added_estimators": int(added),
+            "preprocessing_drift": preprocessor.drift_,
+            "previous_score": previous_score,
+            "score": score,
+        },
+    }
@@ -0,0 +1,188 @@
+# ingestion.py
+import os
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+# -----------------------------
+# Defaults
+# -----------------------------
+SAMPLE_ROWS = 50_000           # rows read to infer column kinds
+CHUNK_ROWS = 250_000           # rows per validation/parse chunk
+CATEGORY_MAX_RATIO = 0.5       # unique/non-null ratio below which strings become category
+CATEGORY_MAX_UNIQUE = 10_000   # never build categoricals wider than this
+# The pyarrow parser materialises the whole file at full width before downcasting; only small
+# files take that path by default, the rest are parsed chunk by chunk
+PYARROW_MAX_BYTES = int(os.environ.get("AUTOML_PYARROW_MAX_BYTES", 32 * 1024 ** 2))
+
+# Chunk-stable dtypes for streaming reads (nullable, so a NaN in a later chunk can't change them)
+STREAM_DTYPES = {"int": "Int64", "float": "float64", "bool": "boolean", "category": object, "object": object}
+
+
+def _has_pyarrow():
+    try:
+        import pyarrow  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+# -----------------------------
+# Dtype inference
+# -----------------------------
+def infer_column_kinds(sample, category_max_ratio=CATEGORY_MAX_RATIO,
+                       category_max_unique=CATEGORY_MAX_UNIQUE):
+    """
+    Classify each column of a sample frame as "int", "float", "bool",
+    "category" or "object" (free text / high-cardinality strings).
+    """
+    kinds = {}
+    for col in sample.columns:
+        s = sample[col]
+        if pd.api.types.is_bool_dtype(s):
+            kinds[col] = "bool"
+        elif pd.api.types.is_integer_dtype(s):
+            kinds[col] = "int"
+        elif pd.api.types.is_float_dtype(s):
+            kinds[col] = "float"
+        else:
+            non_null = s.count()
+            n_unique = s.nunique(dropna=True)
+            if non_null and n_unique <= category_max_unique and n_unique / non_null <= category_max_ratio:
+                kinds[col] = "category"
+            else:
+                kinds[col] = "object"
+    return kinds
+
+
+def _float32_lossless(s):
+    """Whether every value of a float64 series survives a float32 round trip unchanged."""
+    values = s.to_numpy(dtype=np.float64, na_value=np.nan)
+    with np.errstate(over="ignore"):
+        return np.array_equal(values.astype(np.float32).astype(np.float64), values, equal_nan=True)
+
+
+def downcast_frame(df, kinds=None, downcast_floats=True):
+    """
+    Downcast numeric columns to the smallest dtype that holds their values.
+    Float columns become float32 only when `downcast_floats` is set and the
+    conversion is lossless for that column (IDs and money amounts beyond
+    ~7 significant digits keep float64).
+    """
+    kinds = kinds or infer_column_kinds(df)
+    out = {}
+    for col in df.columns:
+        s = df[col]
+        kind = kinds.get(col)
+        if pd.api.types.is_integer_dtype(s):
+            s = pd.to_numeric(s, downcast="integer")
+        elif pd.api.types.is_float_dtype(s):
+            # Whole-number float columns are usually ints with NaNs; keep them float
+            if downcast_floats and s.dtype != np.float32 and _float32_lossless(s):
+                s = s.astype(np.float32)
+        elif kind == "category" and not isinstance(s.dtype, pd.CategoricalDtype):
+            s = s.astype("category")
+        out[col] = s
+    return pd.DataFrame(out, index=df.index)
+
+
+# -----------------------------
+# Chunked reader
+# -----------------------------
+def _combine_chunks(chunks, kinds, category_max_unique):
+    """Concatenate chunks, merging per-chunk categoricals into one dictionary."""
+    combined = {}
+    for col in chunks[0].columns:
+        parts = [c[col] for c in chunks]
+        if kinds.get(col) == "category":
+            parts = [p if isinstance(p.dtype, pd.CategoricalDtype) else p.astype("category") for p in parts]
+            merged = union_categoricals(parts, ignore_order=True)
+            if len(merged.categories) > category_max_unique:
+                combined[col] = pd.Series(np.asarray(merged, dtype=object), name=col)
+            else:
+                combined[col] = pd.Series(merged, name=col)
+        else:
+            # numpy promotion picks the smallest dtype covering every chunk
+            combined[col] = pd.concat(parts, ignore_index=True)
+    return pd.DataFrame(combined)
+
+
+def read_csv_optimized(file_path, sample_rows=SAMPLE_ROWS, chunksize=CHUNK_ROWS,
+                       downcast_floats=True, use_pyarrow=None,
+                       category_max_ratio=CATEGORY_MAX_RATIO, category_max_unique=CATEGORY_MAX_UNIQUE,
+                       usecols=None, stats=None):
+    """
+    Read a CSV with compact dtypes.
+
+    A sample of `sample_rows` rows decides each column's kind. The file is
+    then parsed in `chunksize`-row chunks, each chunk downcast immediately, so
+    the default int64/float64/object representation of the full file is never
+    held in memory. With `use_pyarrow=True` (default: when installed and the
+    file is at most PYARROW_MAX_BYTES) the multithreaded pyarrow parser reads
+    the whole file in one go instead, which is faster but not memory-bounded.
+
+    `stats` may be an eda_stats.StatsAccumulator; it is updated with every
+    parsed chunk so EDA statistics come for free with ingestion.
+
+    Returns (df, report) where report describes the memory footprint before
+    (estimated from the sample) and after optimisation.
+    """
+    sample = pd.read_csv(file_path, nrows=sample_rows, usecols=usecols)
+    if sample.empty:
+        raise ValueError("Dataset is empty")
+
+    kinds = infer_column_kinds(sample, category_max_ratio, category_max_unique)
+    sample_bytes_per_row = sample.memory_usage(deep=True, index=False).sum() / len(sample)
+    category_cols = [c for c, k in kinds.items() if k == "category"]
+
+    if use_pyarrow is None:
+        use_pyarrow = _has_pyarrow() and os.path.getsize(file_path) <= PYARROW_MAX_BYTES
+
+    if use_pyarrow:
+        df = pd.read_csv(file_path, engine="pyarrow", usecols=usecols,
+                         dtype={c: "category" for c in category_cols})
+        df = downcast_frame(df, kinds, downcast_floats=downcast_floats)
+        if stats is not None:
+            stats.update(df)
+        n_chunks = 1
+    else:
+        chunks = []
+        for chunk in pd.read_csv(file_path, chunksize=chunksize, usecols=usecols,
+                                 dtype={c: "category" for c in category_cols}):
+            chunk = downcast_frame(chunk, kinds, downcast_floats=downcast_floats)
+            if stats is not None:
+                stats.update(chunk)
+            chunks.append(chunk)
+        n_chunks = len(chunks)
+        df = _combine_chunks(chunks, kinds, category_max_unique) if n_chunks > 1 else chunks[0]
+        del chunks
+
+    if df.empty:
+        raise ValueError("Dataset is empty")
+
+    optimized_bytes = int(df.memory_usage(deep=True, index=False).sum())
+    estimated_raw_bytes = int(sample_bytes_per_row * len(df))
+    report = {
+        "rows": len(df),
+        "columns": df.shape[1],
+        "chunks": n_chunks,
+        "parser": "pyarrow" if use_pyarrow else "c",
+        "memory_before_bytes": estimated_raw_bytes,
+        "memory_after_bytes": optimized_bytes,
+        "reduction_ratio": round(estimated_raw_bytes / optimized_bytes, 2) if optimized_bytes else None,
+        "dtypes": {col: str(dtype) for col, dtype in df.dtypes.items()},
+    }
+    return df, report
+
+
+def iter_csv_chunks(file_path, chunksize=CHUNK_ROWS, sample_rows=SAMPLE_ROWS, usecols=None, kinds=None):
+    """
+    Parse a CSV in `chunksize`-row chunks that all share one set of dtypes
+    (STREAM_DTYPES for the column kinds of a `sample_rows` sample, or the
+    given `kinds`). Nothing is concatenated, so memory stays bounded by one
+    chunk whatever the file size.
+    """
+    if kinds is None:
+        kinds = infer_column_kinds(pd.read_csv(file_path, nrows=sample_rows, usecols=usecols))
+    dtype = {col: STREAM_DTYPES[kind] for col, kind in kinds.items()}
+    yield from pd.read_csv(file_path, chunksize=chunksize, usecols=usecols, dtype=dtype)
@@ -0,0 +1,279 @@
+# jobs.py
+import os
+import time
+import uuid
+import threading
+import traceback
+import multiprocessing as mp
+from concurrent.futures import ProcessPoolExecutor
+
+from pipeline import run_automl_pipeline
+import metrics
+import warmup
+from events import EventLog
+
+# -----------------------------
+# Configuration
+# -----------------------------
+MAX_CONCURRENT_JOBS = int(os.environ.get("AUTOML_MAX_CONCURRENT_JOBS", 2))
+MAX_QUEUED_JOBS = int(os.environ.get("AUTOML_MAX_QUEUED_JOBS", 20))
+MAX_FINISHED_JOBS = int(os.environ.get("AUTOML_MAX_FINISHED_JOBS", 200))
+
+QUEUED, RUNNING, SUCCEEDED, FAILED, CANCELLED = "queued", "running", "succeeded", "failed", "cancelled"
+FINISHED_STATES = (SUCCEEDED, FAILED, CANCELLED)
+
+
+class JobCancelled(Exception):
+    """Raised inside a worker when the job was cancelled between stages."""
+
+
+class QueueFullError(Exception):
+    """Raised when the number of queued + running jobs hits MAX_QUEUED_JOBS."""
+
+
+# -----------------------------
+# Worker side
+# -----------------------------
+def _execute_job(job_id, progress_state, cancel_flags, events, target, kwargs):
+    """
+    Runs in a pool process; reports stages through the shared manager dicts
+    and progress events through the manager queue `events`.
+    """
+    started_at = time.time()
+    progress_state[job_id] = {"stage": None, "started_at": started_at}
+
+    def progress(stage):
+        if cancel_flags.get(job_id):
+            raise JobCancelled(f"Job {job_id} cancelled before stage '{stage}'")
+        progress_state[job_id] = {"stage": stage, "started_at": started_at}
+
+    def on_event(event):
+        events.put((job_id, event))
+
+    return target(progress=progress, on_event=on_event, **kwargs)
+
+
+# -----------------------------
+# Job Manager
+# -----------------------------
+class JobManager:
+    """
+    Bounded background queue for long-running AutoML jobs.
+
+    Jobs run in a process pool of `max_workers` processes so the CPU-bound
+    pipeline never blocks the API event loop. Stage updates and cancellation
+    requests cross the process boundary through multiprocessing manager dicts;
+    live progress events come back through a manager queue and are collected
+    by a thread into one events.EventLog per job (events()).
+    """
+
+    def __init__(self, max_workers=MAX_CONCURRENT_JOBS, max_queued=MAX_QUEUED_JOBS,
+                 max_finished=MAX_FINISHED_JOBS):
+        self.max_workers = max_workers
+        self.max_queued = max_queued
+        self.max_finished = max_finished
+        self._jobs = {}
+        self._lock = threading.Lock()
+        self._executor = None
+        self._manager = None
+        self._progress = None
+        self._cancel_flags = None
+        self._events = None
+        self._event_logs = {}
+        self._pump = None
+        self._drain_markers = {}
+
+    def _ensure_started(self):
+        if self._executor is None:
+            ctx = mp.get_context("spawn")
+            self._manager = ctx.Manager()
+            self._progress = self._manager.dict()
+            self._cancel_flags = self._manager.dict()
+            self._events = self._manager.Queue()
+            self._pump = threading.Thread(target=self._pump_events, args=(self._events,), daemon=True)
+            self._pump.start()
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=ctx)
+
+    def _pump_events(self, events):
+        """Move worker events from the manager queue into the jobs' event logs until shutdown."""
+        while True:
+            try:
+                item = events.get()
+            except (OSError, EOFError):   # manager shut down
+                return
+            if item is None:
+                return
+            job_id, event = item
+            if job_id is None:
+                # _drain_events marker: everything queued before it has been delivered
+                with self._lock:
+                    delivered = self._drain_markers.pop(event, None)
+                if delivered is not None:
+                    delivered.set()
+                continue
+            with self._lock:
+                log = self._event_logs.get(job_id)
+            if log is not None and not log.closed:
+                log.append(event)
+
+    def prewarm(self, modules=warmup.TRAINING_MODULES):
+        """
+        Start the pool processes now and have each import `modules`, so the
+        first jobs don't pay for loading sklearn / XGBoost. Returns the futures.
+        """
+        with self._lock:
+            self._ensure_started()
+            # Workers spawn on demand; max_workers concurrent tasks start all of them
+            return [self._executor.submit(warmup.prewarm, modules) for _ in range(self.max_workers)]
+
+    def submit(self, target=run_automl_pipeline, **kwargs):
+        """Queue a job and return its ID immediately."""
+        with self._lock:
+            self._ensure_started()
+            active = sum(1 for job in self._jobs.values() if job["status"] not in FINISHED_STATES)
+            if active >= self.max_queued:
+                raise QueueFullError(f"Too many active jobs ({active}); try again later.")
+
+            job_id = uuid.uuid4().hex
+            self._cancel_flags[job_id] = False
+            job = {
+                "id": job_id,
+                "status": QUEUED,
+                "params": kwargs,
+                "created_at": time.time(),
+                "finished_at": None,
+                "result": None,
+                "error": None,
+            }
+            future = self._executor.submit(
+                _execute_job, job_id, self._progress, self._cancel_flags, self._events, target, kwargs
+            )
+            job["future"] = future
+            self._jobs[job_id] = job
+            self._event_logs[job_id] = EventLog(job_id)
+            self._event_logs[job_id].append({"type": "queued", "job_id": job_id})
+            self._prune()
+
+        future.add_done_callback(lambda f, job_id=job_id: self._on_done(job_id, f))
+        return job_id
+
+    def _on_done(self, job_id, future):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return
+            job["finished_at"] = time.time()
+            if future.cancelled():
+                job["status"] = CANCELLED
+                log = self._event_logs.get(job_id)
+                if log is not None:
+                    log.append({"type": "finished", "status": CANCELLED}, close=True)
+                metrics.observe_job(CANCELLED)
+                return
+            exc = future.exception()
+            if exc is None:
+                job["status"] = SUCCEEDED
+                job["result"] = future.result()
+            elif isinstance(exc, JobCancelled):
+                job["status"] = CANCELLED
+            else:
+                job["status"] = FAILED
+                job["error"] = "".join(traceback.format_exception_only(type(exc), exc)).strip()
+            status, result, finished_at = job["status"], job["result"], job["finished_at"]
+            log = self._event_logs.get(job_id)
+        if log is not None:
+            # Events the worker put just before returning may still be in the queue
+            self._drain_events()
+            log.append({"type": "finished", "status": status, "error": job["error"],
+                        "best_model": (result or {}).get("best_model") if isinstance(result, dict) else None},
+                       close=True)
+
+        try:
+            started_at = (self._progress.get(job_id) or {}).get("started_at")
+        except (OSError, EOFError):   # manager already shut down
+            started_at = None
+        profile = (result or {}).get("report", {}).get("profile") if isinstance(result, dict) else None
+        metrics.observe_job(status, finished_at - started_at if started_at else None, profile)
+
+    def _drain_events(self, timeout=1.0):
+        """
+        Wait (briefly) for the pump to deliver what a finished job's worker put
+        on the queue: a marker queued behind those events is acknowledged by
+        the pump once everything ahead of it has been appended.
+        """
+        token = uuid.uuid4().hex
+        delivered = threading.Event()
+        with self._lock:
+            self._drain_markers[token] = delivered
+        try:
+            self._events.put((None, token))
+        except (OSError, EOFError):   # manager already shut down
+            delivered.set()
+        if not delivered.wait(timeout):
+            with self._lock:
+                self._drain_markers.pop(token, None)
+
+    def _prune(self):
+        finished = [j for j in self._jobs.values() if j["status"] in FINISHED_STATES]
+        if len(finished) <= self.max_finished:
+            return
+        finished.sort(key=lambda j: j["finished_at"] or 0)
+        for job in finished[:len(finished) - self.max_finished]:
+            self._jobs.pop(job["id"], None)
+            self._progress.pop(job["id"], None)
+            self._cancel_flags.pop(job["id"], None)
+            self._event_logs.pop(job["id"], None)
+
+    def get(self, job_id, include_result=True):
+        """Return a JSON-safe snapshot of a job, or None if unknown."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            progress = dict(self._progress.get(job_id) or {})
+            status = job["status"]
+            if status == QUEUED and progress:
+                status = job["status"] = RUNNING
+
+            snapshot = {
+                "job_id": job_id,
+                "status": status,
+                "stage": progress.get("stage"),
+                "created_at": job["created_at"],
+                "started_at": progress.get("started_at"),
+                "finished_at": job["finished_at"],
+                "cancel_requested": bool(self._cancel_flags.get(job_id)),
+                "error": job["error"],
+            }
+            if include_result:
+                snapshot["result"] = job["result"]
+            return snapshot
+
+    def events(self, job_id):
+        """The job's events.EventLog, or None if unknown."""
+        with self._lock:
+            return self._event_logs.get(job_id)
+
+    def cancel(self, job_id):
+        """
+        Cancel a job. Queued jobs are dropped immediately; running jobs stop
+        at the next stage boundary. Returns False if the job is unknown.
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return False
+            if job["status"] in FINISHED_STATES:
+                return True
+            self._cancel_flags[job_id] = True
+            future = job["future"]
+        # Future.cancel() fires _on_done synchronously, so call it unlocked.
+        future.cancel()
+        return True
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._events.put(None)
+            self._manager.shutdown()
+            self._executor = None
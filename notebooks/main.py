@@ -1,175 +1,326 @@
 # main.py
-from fastapi import FastAPI, UploadFile, Form
-from fastapi.responses import JSONResponse, FileResponse
+from fastapi import FastAPI, UploadFile, Form, Request
+from fastapi.responses import JSONResponse, FileResponse, Response, StreamingResponse
+from starlette.concurrency import run_in_threadpool, iterate_in_threadpool
 import os
-import pickle
-import numpy as np
-import pandas as pd
 import json
+import uuid
+import hashlib
+import threading
+import pandas as pd
 
 # Import utility functions
-from functions import (
-    load_and_validate_csv, clean_data, automated_train_test_split,
-    feature_engineering, detect_problem_type, get_candidate_models, evaluate_model,
-    train_candidates, select_best_model, tune_best_model, save_model,
-    generate_report_json
-)
+from dataset_store import DatasetStore
+from pipeline import UPLOAD_DIR, MODEL_DIR, REPORT_DIR, cached_run_result, report_filename
+from registry import ModelRegistry, iter_batches
+import model_formats
+import metrics
+from reporting import get_or_render_plot, PLOT_FORMATS
+from upload_stream import stream_upload_to_disk, sniff_csv, UploadTooLarge
+from jobs import JobManager, QueueFullError
+import warmup
 
 app = FastAPI()
 
-UPLOAD_DIR = "uploads"
-MODEL_DIR = "models"
-REPORT_DIR = "reports"
-
 os.makedirs(UPLOAD_DIR, exist_ok=True)
 os.makedirs(MODEL_DIR, exist_ok=True)
 os.makedirs(REPORT_DIR, exist_ok=True)
 
-
-# --- Helper: Convert numpy types to JSON-safe types ---
-def convert_numpy(obj):
-    if isinstance(obj, dict):
-        return {k: convert_numpy(v) for k, v in obj.items()}
-    elif isinstance(obj, list):
-        return [convert_numpy(i) for i in obj]
-    elif isinstance(obj, (np.integer, np.int64)):
-        return int(obj)
-    elif isinstance(obj, (np.floating, np.float64)):
-        return float(obj)
-    elif isinstance(obj, np.ndarray):
-        return obj.tolist()
-    else:
-        return obj
+job_manager = JobManager()
+dataset_store = DatasetStore()
+model_registry = ModelRegistry(MODEL_DIR)
 
 
 # Step 1: Upload dataset
 @app.post("/upload-dataset/")
 async def upload_dataset(file: UploadFile):
-    file_path = os.path.join(UPLOAD_DIR, file.filename)
-    with open(file_path, "wb") as f:
-        f.write(await file.read())
-
-    df = load_and_validate_csv(file_path)
-    columns = df.columns.tolist()
-
-    return {"message": "File uploaded successfully", "file_path": file_path, "columns": columns}
-
-
-# Step 2: Run AutoML
-@app.post("/run-automl/")
-async def run_automl(file_path: str = Form(...), user_target: str = Form(...)):
-    # Load dataset
-    df = load_and_validate_csv(file_path)
-
-    if user_target not in df.columns:
-        return JSONResponse({"error": f"Target '{user_target}' not found in dataset."}, status_code=400)
-
-    X = df.drop(columns=[user_target])
-    y = df[user_target]
-
-    # Split dataset
-    X_train, X_test, y_train, y_test = automated_train_test_split(X, y)
-
-    # Clean data
-    X_train, X_test, imputers, cleaning_summary = clean_data(X_train, X_test)
-
-    # Detect problem type
-    problem_type = detect_problem_type(y)
-
-    # Feature engineering
-    X_train_enc, X_test_enc, y_train_enc, y_test_enc = feature_engineering(
-        X_train, X_test, y_train, y_test
-    )
-
-    # find cadidate models
-    candidates = get_candidate_models(problem_type)
-
-    # Train and evaluate candidates
-    metrics_list, scores_list, models_list, names_list = train_candidates(
-        candidates, X_train, X_test, y_train, y_test, problem_type
-    )
-
-    # Select best model
-    best_model, best_model_name, best_idx = select_best_model(scores_list, models_list, names_list)
-
-    # Tune best model
-    best_tuned_model = tune_best_model(best_model_name, best_model, X_train, y_train, problem_type)
-
-    # Evaluate tuned model
-    tuned_metrics, tuned_score, tuned_model = evaluate_model(best_tuned_model, X_train, X_test, y_train, y_test, problem_type)
+    file_path = os.path.join(UPLOAD_DIR, f"{uuid.uuid4().hex}.csv.part")
+    try:
+        size, sha256 = await stream_upload_to_disk(file, file_path)
+    except UploadTooLarge as e:
+        return JSONResponse({"error": str(e)}, status_code=413)
+
+    try:
+        header_info = await run_in_threadpool(sniff_csv, file_path)
+        meta = await run_in_threadpool(
+            dataset_store.add_file, file_path, content_hash=sha256, original_name=file.filename,
+            convert=False, header_info=header_info
+        )
+    except ValueError as e:
+        if os.path.exists(file_path):
+            os.remove(file_path)
+        return JSONResponse({"error": str(e)}, status_code=400)
 
-    tuned_metrics["Model"] = best_model_name + " (Tuned)"
-    metrics_list.append(tuned_metrics)
-
-    metrics_df = pd.DataFrame(metrics_list).set_index("Model")
-    best_model_name = best_model_name + "(Tuned)"
-
-    # after best_model is selected
-    save_model(best_tuned_model, f'{MODEL_DIR}/{best_model_name.replace(" ", "_")}', compress_level=3)
-
-"""
-    # Candidate models
-    candidates = get_candidate_models(problem_type)
-
-    # Train and evaluate
-    metrics_list, scores_list, models_list, names_list = train_candidates(
-        candidates, X_train_enc, X_test_enc, y_train_enc, y_test_enc, problem_type
-    )
-
-    # Select best model
-    best_model, best_model_name, best_idx = select_best_model(scores_list, models_list, names_list)
-
-    # Hyperparameter tuning
-    tuned_model = tune_best_model(best_model_name, best_model, X_train_enc, y_train_enc, problem_type)
-
-    # Save model
-    model_path = os.path.join(MODEL_DIR, f"{best_model_name}.pkl")
-    with open(model_path, "wb") as f:
-        pickle.dump(tuned_model, f)
-"""
-
-
-    # Feature engineering summary
-    feature_eng_summary = {
-        "categorical_features": X.select_dtypes(include=['object', 'category']).columns.tolist(),
-        "numerical_features": X.select_dtypes(exclude=['object', 'category']).columns.tolist()
-    }
-
-    # Model comparison summary
-    model_comparison = list(zip(names_list, scores_list))
-
-    # Best model summary
-    best_model_details = {
-        "name": best_model_name,
-        "score": scores_list[best_idx]
+    return {
+        "message": "File uploaded successfully",
+        "dataset_id": meta["dataset_id"],
+        "file_path": dataset_store.source_path(meta["dataset_id"]),
+        "columns": meta["columns"],
+        "rows": meta["rows"] if meta["rows"] is not None else meta["row_estimate"],
+        "rows_exact": meta["rows"] is not None or header_info["row_count_exact"],
+        "size_bytes": size,
+        "deduplicated": meta["deduplicated"],
     }
 
-    # Generate JSON report
-    report_json = generate_report_json(
-        df, cleaning_summary, feature_eng_summary, model_comparison, best_model_details, target=user_target
-    )
-
-    # Convert numpy objects to JSON-safe
-    report_json_safe = convert_numpy(report_json)
-
-    # Save JSON report to file
-    report_path = os.path.join(REPORT_DIR, "automl_report.json")
-    with open(report_path, "w") as f:
-        json.dump(report_json_safe, f, indent=4)
 
-    return {
-        "message": "AutoML pipeline completed successfully",
-        "best_model": best_model_name,
-        "model_path": model_path,
-        "report_path": report_path,
-        "report": report_json_safe
-    }
+# Dataset metadata (schema + basic statistics)
+@app.get("/datasets/{dataset_id}")
+async def get_dataset(dataset_id: str):
+    try:
+        return dataset_store.get_meta(dataset_id)
+    except (KeyError, ValueError):
+        return JSONResponse({"error": "Dataset not found"}, status_code=404)
+
+
+# Single EDA plot, rendered on demand and cached per dataset; for kind=heatmap, `column` is the
+# target the heatmap leaves out (as in the report's correlation summary)
+@app.get("/plots/{dataset_id}")
+async def get_plot(dataset_id: str, request: Request, kind: str, column: str = None, format: str = "png"):
+    if format not in PLOT_FORMATS:
+        return JSONResponse({"error": f"Unsupported format '{format}'"}, status_code=400)
+    if not dataset_store.exists(dataset_id):
+        return JSONResponse({"error": "Dataset not found"}, status_code=404)
+    if (kind != "heatmap" or column is not None) and column not in dataset_store.get_meta(dataset_id)["columns"]:
+        return JSONResponse({"error": f"Column '{column}' not found"}, status_code=404)
+
+    # Plots are a pure function of (dataset content, kind, column, format)
+    etag = '"' + hashlib.sha1(f"{dataset_id}|{kind}|{column}|{format}".encode("utf-8")).hexdigest() + '"'
+    headers = {"ETag": etag, "Cache-Control": "public, max-age=86400"}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+
+    def render():
+        meta = dataset_store.get_meta(dataset_id)
+        columns = [column]
+        if kind == "heatmap":
+            # Only the numeric columns feed the heatmap; decode just those when the schema is known
+            schema = meta.get("schema")
+            columns = [c for c, dtype in schema.items() if _is_numeric_dtype(dtype) and c != column] if schema else None
+        df = dataset_store.load(dataset_id, columns=columns)
+        # Same rows under another dataset_id (reordered / re-serialised upload) share the cached plots
+        dataset_key = df.attrs.get("fingerprint") or dataset_id
+        return get_or_render_plot(df, kind, column, dataset_key=dataset_key, fmt=format)
+
+    try:
+        data = await run_in_threadpool(render)
+    except (KeyError, ValueError) as e:
+        return JSONResponse({"error": str(e)}, status_code=400)
+    return Response(content=data, media_type=PLOT_FORMATS[format], headers=headers)
+
+
+def _is_numeric_dtype(name):
+    try:
+        return pd.api.types.is_numeric_dtype(pd.api.types.pandas_dtype(name))
+    except TypeError:
+        return False
+
+
+# Step 2: Run AutoML (queued as a background job)
+@app.post("/run-automl/")
+async def run_automl(file_path: str = Form(None), user_target: str = Form(...),
+                     dataset_id: str = Form(None), incremental: bool = Form(True),
+                     flamegraph: bool = Form(False), force_refresh: bool = Form(False)):
+    if dataset_id is None and file_path is not None:
+        dataset_id = dataset_store.resolve(file_path)
+    if dataset_id is not None:
+        if not dataset_store.exists(dataset_id):
+            return JSONResponse({"error": f"Dataset '{dataset_id}' not found."}, status_code=404)
+        if user_target not in dataset_store.get_meta(dataset_id)["columns"]:
+            return JSONResponse({"error": f"Target '{user_target}' not found in dataset."}, status_code=400)
+    elif file_path is None or not os.path.exists(file_path):
+        return JSONResponse({"error": f"Dataset '{file_path}' not found."}, status_code=404)
+
+    # Repeat of a cached run: answer now, in the shape of a finished job
+    if dataset_id is not None and not (force_refresh or flamegraph):
+        result = await run_in_threadpool(cached_run_result, dataset_id, user_target, MODEL_DIR, REPORT_DIR,
+                                         incremental, dataset_store)
+        if result is not None:
+            return {"message": "AutoML result served from cache", "job_id": None, "status": "succeeded",
+                    "result": result}
+
+    try:
+        job_id = job_manager.submit(file_path=file_path, dataset_id=dataset_id, user_target=user_target,
+                                    model_dir=MODEL_DIR, report_dir=REPORT_DIR, incremental=incremental,
+                                    flamegraph=flamegraph, force_refresh=force_refresh)
+    except QueueFullError as e:
+        return JSONResponse({"error": str(e)}, status_code=429)
+
+    return JSONResponse({"message": "AutoML job queued", "job_id": job_id, "status": "queued"},
+                        status_code=202)
+
+
+# Job status / result
+@app.get("/jobs/{job_id}")
+async def get_job(job_id: str, include_result: bool = True):
+    job = job_manager.get(job_id, include_result=include_result)
+    if job is None:
+        return JSONResponse({"error": "Job not found"}, status_code=404)
+    return job
+
+
+# Live progress as Server-Sent Events: a snapshot (stage, partial leaderboard, tuning progress, ETA),
+# then stage / candidate / tuning / search events until a final "finished" event
+@app.get("/jobs/{job_id}/events")
+async def job_events(job_id: str, request: Request, since: int = None):
+    log = job_manager.events(job_id)
+    if log is None:
+        return JSONResponse({"error": "Job not found"}, status_code=404)
+    # EventSource reconnects send the last id they saw; resume after it instead of replaying
+    last_event_id = request.headers.get("last-event-id")
+    if since is None and last_event_id and last_event_id.isdigit():
+        since = int(last_event_id)
+    return StreamingResponse(log.stream(since), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+
+# Sampled flamegraph of a job run with flamegraph=true
+@app.get("/jobs/{job_id}/flamegraph")
+async def get_flamegraph(job_id: str, format: str = "svg"):
+    job = job_manager.get(job_id)
+    if job is None:
+        return JSONResponse({"error": "Job not found"}, status_code=404)
+    flamegraph = ((job.get("result") or {}).get("report") or {}).get("profile", {}).get("flamegraph")
+    if format not in ("svg", "folded"):
+        return JSONResponse({"error": "format must be 'svg' or 'folded'"}, status_code=400)
+    if not flamegraph or not os.path.exists(flamegraph[format]):
+        return JSONResponse({"error": "No flamegraph for this job"}, status_code=404)
+    media_type = "image/svg+xml" if format == "svg" else "text/plain"
+    return FileResponse(flamegraph[format], media_type=media_type)
+
+
+# Prometheus scrape endpoint: job, stage and fit histograms aggregated over finished jobs
+@app.get("/metrics")
+async def get_metrics():
+    return Response(content=metrics.render(), media_type="text/plain; version=0.0.4")
+
+
+# Cancel a queued or running job
+@app.delete("/jobs/{job_id}")
+async def cancel_job(job_id: str):
+    if not job_manager.cancel(job_id):
+        return JSONResponse({"error": "Job not found"}, status_code=404)
+    return job_manager.get(job_id, include_result=False)
+
+
+@app.on_event("startup")
+def prewarm():
+    # Optional (AUTOML_PREWARM): load the ML / plotting stack off the request path
+    if warmup.prewarms("workers"):
+        job_manager.prewarm()
+    if warmup.prewarms("api"):
+        threading.Thread(target=warmup.prewarm, args=(warmup.SERVING_MODULES,), daemon=True).start()
+
+
+@app.on_event("shutdown")
+def shutdown_jobs():
+    job_manager.shutdown()
+
+
+# Real-time prediction with one run's model (run_id returned by /run-automl/): JSON records
+@app.post("/predict/{run_id}")
+async def predict_records(run_id: str, request: Request):
+    # Parse the body directly: request-model validation of large record lists dominates latency
+    try:
+        payload = await request.json()
+    except ValueError:
+        return JSONResponse({"error": "Body must be valid JSON"}, status_code=400)
+    records = payload.get("records") if isinstance(payload, dict) else None
+    if not isinstance(records, list) or not records:
+        return JSONResponse({"error": "Body must be {'records': [ {...}, ... ]}"}, status_code=400)
+
+    def score():
+        entry = model_registry.get(run_id)
+        return entry, entry.predict_frame(pd.DataFrame.from_records(records))
+
+    try:
+        entry, result = await run_in_threadpool(score)
+    except KeyError as e:
+        return JSONResponse({"error": str(e).strip("'\"")}, status_code=404)
+    except ValueError as e:
+        return JSONResponse({"error": str(e)}, status_code=400)
+    body = '{"run_id": %s, "model": %s, "predictions": %s}' % (
+        json.dumps(run_id), json.dumps(entry.model_name), result.to_json(orient="records"))
+    return Response(content=body, media_type="application/json")
+
+
+# Batch prediction: CSV / Parquet upload, scored in chunks and streamed back as CSV
+@app.post("/predict/{run_id}/batch")
+async def predict_batch(run_id: str, file: UploadFile):
+    fmt = "parquet" if (file.filename or "").lower().endswith(".parquet") else "csv"
+    try:
+        entry = await run_in_threadpool(model_registry.get, run_id)
+    except KeyError as e:
+        return JSONResponse({"error": str(e).strip("'\"")}, status_code=404)
+
+    path = os.path.join(UPLOAD_DIR, f"{uuid.uuid4().hex}.predict.{fmt}")
+    try:
+        await stream_upload_to_disk(file, path)
+    except UploadTooLarge as e:
+        return JSONResponse({"error": str(e)}, status_code=413)
+
+    def rows():
+        try:
+            header = True
+            for batch in iter_batches(path, fmt):
+                yield entry.predict_frame(batch).to_csv(index=False, header=header)
+                header = False
+        finally:
+            os.remove(path)
+
+    return StreamingResponse(iterate_in_threadpool(rows()), media_type="text/csv",
+                             headers={"Content-Disposition": f'attachment; filename="{run_id}_predictions.csv"'})
+
+
+# PDF of a run's report (by run_id, or the report_path returned by /run-automl/), rendered on
+# the first request and then served from disk; FileResponse answers Range requests
+@app.get("/download-report-pdf/")
+async def download_report_pdf(report_path: str = None, run_id: str = None):
+    from report_pdf import get_or_render_report_pdf
+    if run_id is not None:
+        if not run_id.isalnum():
+            return JSONResponse({"error": "Invalid run_id"}, status_code=400)
+        report_path = os.path.join(REPORT_DIR, report_filename(run_id))
+    if report_path is None:
+        return JSONResponse({"error": "Pass run_id or report_path"}, status_code=400)
+    report_path = os.path.realpath(report_path)
+    if os.path.dirname(report_path) != os.path.realpath(REPORT_DIR) or not report_path.endswith(".json") \
+            or not os.path.exists(report_path):
+        return JSONResponse({"error": "Report not found"}, status_code=404)
+
+    pdf_path = await run_in_threadpool(get_or_render_report_pdf, report_path, dataset_store)
+    return FileResponse(pdf_path, media_type="application/pdf", filename=os.path.basename(pdf_path),
+                        headers={"Cache-Control": "private, max-age=86400"})
 
 
 # Step 3: Download model
 @app.get("/download-model/")
-async def download_model(model_name: str):
-    model_path = os.path.join(MODEL_DIR, f"{model_name}.pkl")
+async def download_model(run_id: str = None, format: str = "native", model_name: str = None):
+    """
+    A run's saved model file as is, or with format=onnx an ONNX export made on first request.
+    `model_name` (deprecated, use run_id) selects the latest run of that model.
+    """
+    try:
+        if run_id is None and model_name is not None:
+            run_id = await run_in_threadpool(model_registry.latest_run, model_name)
+        elif run_id is None:
+            return JSONResponse({"error": "Pass run_id"}, status_code=400)
+        run = model_registry.record(run_id)
+    except KeyError:
+        return JSONResponse({"error": "Model not found"}, status_code=404)
+    model_path, model_name = run["model_path"], run["model_name"]
     if not os.path.exists(model_path):
         return JSONResponse({"error": "Model not found"}, status_code=404)
-    return FileResponse(model_path, filename=f"{model_name}.pkl", media_type="application/octet-stream")
+    if format == "onnx":
+        onnx_path = os.path.splitext(model_path)[0] + model_formats.ONNX_EXTENSION
+        if not os.path.exists(onnx_path) or os.stat(onnx_path).st_mtime_ns < os.stat(model_path).st_mtime_ns:
+            try:
+                entry = await run_in_threadpool(model_registry.get, run_id)
+                await run_in_threadpool(model_formats.export_onnx, entry.model, onnx_path)
+            except model_formats.ONNXExportError as e:
+                return JSONResponse({"error": str(e)}, status_code=501)
+        model_path = onnx_path
+    elif format != "native":
+        return JSONResponse({"error": "format must be 'native' or 'onnx'"}, status_code=400)
+    ext = os.path.splitext(model_path)[1]
+    return FileResponse(model_path, filename=f"{model_name}{ext}",
+                        media_type=model_formats.MEDIA_TYPES.get(ext, "application/octet-stream"))
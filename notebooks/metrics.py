@@ -0,0 +1,114 @@
+# metrics.py
+import bisect
+import threading
+
+# -----------------------------
+# Defaults
+# -----------------------------
+SECONDS_BUCKETS = (0.01, 0.05, 0.1, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600, 1800, 3600)
+BYTES_BUCKETS = tuple(2 ** p * 1024 ** 2 for p in range(4, 16))   # 16 MiB .. 32 GiB
+
+
+def _labels(names, values):
+    if not names:
+        return ""
+    pairs = ",".join(f'{n}="{str(v).replace(chr(92), chr(92) * 2).replace(chr(34), chr(92) + chr(34))}"'
+                     for n, v in zip(names, values))
+    return "{" + pairs + "}"
+
+
+class Counter:
+    def __init__(self, name, help_text, labelnames=()):
+        self.name, self.help, self.labelnames = name, help_text, tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels, amount=1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for labels, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_labels(self.labelnames, labels)} {value}")
+        return lines
+
+
+class Histogram:
+    """Cumulative-bucket histogram in the Prometheus text exposition format."""
+
+    def __init__(self, name, help_text, labelnames=(), buckets=SECONDS_BUCKETS):
+        self.name, self.help, self.labelnames = name, help_text, tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._series = {}   # labels -> [bucket counts..., +Inf count], sum
+        self._lock = threading.Lock()
+
+    def observe(self, value, *labels):
+        if value is None:
+            return
+        with self._lock:
+            counts, total = self._series.get(labels, ([0] * (len(self.buckets) + 1), 0.0))
+            counts[bisect.bisect_left(self.buckets, value)] += 1
+            self._series[labels] = (counts, total + value)
+
+    def mean(self, *labels):
+        """Average observed value for `labels`, or None before the first observation."""
+        with self._lock:
+            counts, total = self._series.get(labels, (None, 0.0))
+        return total / sum(counts) if counts and sum(counts) else None
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for labels, (counts, total) in sorted(self._series.items()):
+                cumulative = 0
+                for bound, count in zip(self.buckets + (float("inf"),), counts):
+                    cumulative += count
+                    le = "+Inf" if bound == float("inf") else repr(float(bound))
+                    lines.append(f"{self.name}_bucket{_labels(self.labelnames + ('le',), labels + (le,))} "
+                                 f"{cumulative}")
+                lines.append(f"{self.name}_sum{_labels(self.labelnames, labels)} {total}")
+                lines.append(f"{self.name}_count{_labels(self.labelnames, labels)} {cumulative}")
+        return lines
+
+
+JOBS = Counter("automl_jobs_total", "Finished AutoML jobs by final status.", ["status"])
+JOB_SECONDS = Histogram("automl_job_seconds", "Wall time of finished AutoML jobs.", ["status"])
+STAGE_SECONDS = Histogram("automl_stage_seconds", "Wall time per pipeline stage.", ["stage"])
+STAGE_CPU_SECONDS = Histogram("automl_stage_cpu_seconds", "CPU time per pipeline stage.", ["stage"])
+STAGE_PEAK_RSS = Histogram("automl_stage_peak_rss_bytes", "Peak RSS of the job process per stage.",
+                           ["stage"], buckets=BYTES_BUCKETS)
+FIT_SECONDS = Histogram("automl_fit_seconds", "Wall time per candidate / search fit.", ["model"])
+FIT_PEAK_RSS = Histogram("automl_fit_peak_rss_bytes", "Peak RSS of the process fitting a candidate.",
+                         ["model"], buckets=BYTES_BUCKETS)
+TUNING_SECONDS = Histogram("automl_tuning_iteration_seconds",
+                           "Fit time of one tuning configuration, summed over CV folds.", ["model"])
+
+ALL = [JOBS, JOB_SECONDS, STAGE_SECONDS, STAGE_CPU_SECONDS, STAGE_PEAK_RSS, FIT_SECONDS, FIT_PEAK_RSS,
+       TUNING_SECONDS]
+
+
+def observe_job(status, seconds=None, profile=None):
+    """Record one finished job and, when it succeeded, the report["profile"] it produced."""
+    JOBS.inc(status)
+    JOB_SECONDS.observe(seconds, status)
+    if not profile:
+        return
+    mb = 1024 ** 2
+    for s in profile.get("stages", []):
+        STAGE_SECONDS.observe(s.get("wall_s"), s["stage"])
+        STAGE_CPU_SECONDS.observe(s.get("cpu_s"), s["stage"])
+        if s.get("peak_rss_mb") is not None:
+            STAGE_PEAK_RSS.observe(s["peak_rss_mb"] * mb, s["stage"])
+    for f in profile.get("fits", []):
+        FIT_SECONDS.observe(f.get("wall_s"), f["model"])
+        if f.get("peak_rss_mb") is not None:
+            FIT_PEAK_RSS.observe(f["peak_rss_mb"] * mb, f["model"])
+    for t in profile.get("tuning", []):
+        TUNING_SECONDS.observe(t.get("fit_s"), t["model"])
+
+
+def render():
+    """All metrics in the Prometheus text format (version 0.0.4)."""
+    return "\n".join(line for metric in ALL for line in metric.render()) + "\n"
@@ -0,0 +1,162 @@
+# model_formats.py
+import os
+import json
+import importlib
+import joblib
+import numpy as np
+
+# -----------------------------
+# Defaults
+# -----------------------------
+# "auto" saves XGBoost in its native UBJ format and everything else as uncompressed joblib
+MODEL_FORMAT = os.environ.get("AUTOML_MODEL_FORMAT", "auto")
+# Also write an ONNX copy next to every saved model (needs skl2onnx / onnxmltools)
+EXPORT_ONNX = os.environ.get("AUTOML_EXPORT_ONNX", "0").lower() not in ("0", "false", "no")
+
+EXTENSIONS = {
+    "joblib": ".pkl",          # compressed joblib pickle (the original format)
+    "joblib-mmap": ".joblib",  # uncompressed joblib, numpy arrays memory-mapped on load
+    "xgboost-ubj": ".ubj",
+    "xgboost-json": ".json",
+}
+ONNX_EXTENSION = ".onnx"
+MANIFEST_SUFFIX = ".model.json"
+MEDIA_TYPES = {".json": "application/json", ".onnx": "application/octet-stream"}
+
+
+class ONNXExportError(Exception):
+    """The model can't be exported to ONNX (converter missing or unsupported estimator)."""
+
+
+def is_xgboost(model):
+    return hasattr(model, "get_booster")
+
+
+def resolve_format(model, fmt=None):
+    fmt = fmt or MODEL_FORMAT
+    if fmt == "auto":
+        return "xgboost-ubj" if is_xgboost(model) else "joblib-mmap"
+    if fmt not in EXTENSIONS:
+        raise ValueError(f"Unknown model format '{fmt}', expected one of {sorted(EXTENSIONS)} or 'auto'")
+    if fmt.startswith("xgboost") and not is_xgboost(model):
+        return "joblib-mmap"
+    return fmt
+
+
+def manifest_path(base):
+    return base + MANIFEST_SUFFIX
+
+
+def save(model, base, fmt=None, compress_level=3, export_onnx_copy=None):
+    """
+    Save `model` at `base` + the extension of its format and return that path.
+
+    A `<base>.model.json` manifest recording the format and estimator class
+    is written last, so readers never see a half-written artifact. Files of
+    other formats left at `base` by earlier runs are removed.
+    """
+    fmt = resolve_format(model, fmt)
+    path = base + EXTENSIONS[fmt]
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    if fmt.startswith("xgboost"):
+        model.save_model(path)
+    elif fmt == "joblib-mmap":
+        joblib.dump(model, path)
+    else:
+        joblib.dump(model, path, compress=compress_level)
+
+    for ext in set(EXTENSIONS.values()) | {ONNX_EXTENSION}:
+        if base + ext != path and os.path.exists(base + ext):
+            os.remove(base + ext)
+    manifest = {
+        "format": fmt,
+        "file": os.path.basename(path),
+        "class": f"{type(model).__module__}.{type(model).__name__}",
+    }
+    tmp = manifest_path(base) + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(manifest, f)
+    os.replace(tmp, manifest_path(base))
+
+    if EXPORT_ONNX if export_onnx_copy is None else export_onnx_copy:
+        try:
+            export_onnx(model, base + ONNX_EXTENSION)
+        except ONNXExportError as e:
+            print(f"ONNX export skipped: {e}")
+    print(f"Model saved at {path} ({fmt})")
+    return path
+
+
+def find(base):
+    """(artifact path, format) of the model saved at `base`, or (None, None)."""
+    try:
+        with open(manifest_path(base)) as f:
+            manifest = json.load(f)
+        path = os.path.join(os.path.dirname(base), manifest["file"])
+        if os.path.exists(path):
+            return path, manifest["format"]
+    except (OSError, ValueError, KeyError):
+        pass
+    # Models saved before the manifest existed
+    if os.path.exists(base + EXTENSIONS["joblib"]):
+        return base + EXTENSIONS["joblib"], "joblib"
+    return None, None
+
+
+def _import_class(qualname):
+    module, _, name = qualname.rpartition(".")
+    return getattr(importlib.import_module(module), name)
+
+
+def load(base, mmap=True):
+    """
+    Load the model saved at `base` by save().
+
+    joblib-mmap models are opened with mmap_mode="r" when `mmap` is true:
+    their numpy arrays stay read-only views of the file that serving
+    processes share through the page cache. Pass mmap=False for a model
+    that will be trained further.
+    """
+    path, fmt = find(base)
+    if path is None:
+        raise FileNotFoundError(f"No model saved at {base}")
+    if fmt.startswith("xgboost"):
+        with open(manifest_path(base)) as f:
+            model = _import_class(json.load(f)["class"])()
+        model.load_model(path)
+        return model
+    if fmt == "joblib-mmap" and mmap:
+        return joblib.load(path, mmap_mode="r")
+    return joblib.load(path)
+
+
+def export_onnx(model, path):
+    """
+    Write `model` as ONNX to `path` (float32 input of n_features_in_
+    columns). XGBoost goes through onnxmltools, scikit-learn estimators
+    through skl2onnx. Raises ONNXExportError when that isn't possible.
+    """
+    n_features = getattr(model, "n_features_in_", None)
+    if n_features is None:
+        raise ONNXExportError(f"{type(model).__name__} is not fitted")
+    try:
+        if is_xgboost(model):
+            import onnxmltools
+            from onnxmltools.convert.common.data_types import FloatTensorType
+            # The converter only accepts positional feature names (f0, f1, ...)
+            booster = model.get_booster().copy()
+            booster.feature_names, booster.feature_types = None, None
+            onx = onnxmltools.convert_xgboost(booster, initial_types=[("input", FloatTensorType([None, n_features]))])
+        else:
+            import skl2onnx
+            onx = skl2onnx.to_onnx(model, np.zeros((1, n_features), dtype=np.float32),
+                                   options={"zipmap": False} if hasattr(model, "predict_proba") else None)
+    except ImportError as e:
+        raise ONNXExportError(f"ONNX converter not installed ({e.name})")
+    except Exception as e:
+        raise ONNXExportError(f"{type(model).__name__}: {type(e).__name__}: {e}")
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(onx.SerializeToString())
+    os.replace(tmp, path)
+    return path
@@ -0,0 +1,316 @@
+# out_of_core.py
+import os
+import tempfile
+import numpy as np
+import pandas as pd
+import xgboost as xgb
+from sklearn.linear_model import SGDClassifier, SGDRegressor
+from sklearn.metrics import roc_auc_score
+
+from preprocessing import PreprocessingPipeline, TargetEncoder
+from functions import detect_problem_type, get_candidate_models
+
+# -----------------------------
+# Defaults
+# -----------------------------
+CHUNK_ROWS = int(os.environ.get("AUTOML_OOC_CHUNK_ROWS", 250_000))
+EPOCHS = int(os.environ.get("AUTOML_OOC_EPOCHS", 3))   # passes of SGD partial_fit over the training rows
+TEST_SIZE = 0.2
+HASH_BUCKETS = 10_000
+SGD_ALPHAS = (1e-5, 1e-4, 1e-3)
+AUC_SAMPLE_ROWS = 1_000_000       # test rows kept for ROC AUC
+REPORT_SAMPLE_ROWS = 100_000      # rows handed to the report for correlations
+
+
+def hash_split(chunk, test_size=TEST_SIZE):
+    """
+    Test-set mask from a 64-bit hash of each row's values. A row lands on
+    the same side however the data is chunked, and duplicate rows never
+    straddle train and test.
+    """
+    num = chunk.select_dtypes(include=[np.number]).columns
+    h = pd.util.hash_pandas_object(chunk.astype({c: "float64" for c in num}), index=False).to_numpy()
+    return (h % HASH_BUCKETS) < int(round(test_size * HASH_BUCKETS))
+
+
+class RowSample:
+    """Uniform sample of at most `size` rows of a chunked frame (bottom-k random keys)."""
+
+    def __init__(self, size=REPORT_SAMPLE_ROWS, random_state=42):
+        self.size = size
+        self._rng = np.random.default_rng(random_state)
+        self.frame = None
+        self._keys = np.empty(0)
+
+    def update(self, chunk):
+        keys = self._rng.random(len(chunk))
+        if self.frame is not None:
+            chunk = pd.concat([self.frame, chunk], ignore_index=True)
+            keys = np.concatenate([self._keys, keys])
+        if len(keys) > self.size:
+            keep = np.sort(np.argpartition(keys, self.size - 1)[:self.size])
+            chunk, keys = chunk.iloc[keep], keys[keep]
+        self.frame, self._keys = chunk.reset_index(drop=True), keys
+
+
+class StreamingMetrics:
+    """
+    Test-set metrics accumulated chunk by chunk, with the keys of
+    functions.score_model. Classification keeps a confusion matrix (exact
+    accuracy and weighted F1) and the first `auc_rows` probabilities for
+    ROC AUC; regression keeps exact error and target moments.
+    """
+
+    def __init__(self, problem_type, n_classes=None, auc_rows=AUC_SAMPLE_ROWS):
+        self.problem_type = problem_type
+        self.auc_rows = auc_rows
+        if problem_type == "classification":
+            self.confusion = np.zeros((n_classes, n_classes), dtype=np.int64)
+            self._auc_true, self._auc_proba = [], []
+            self._auc_n = 0
+        else:
+            self.n = 0
+            self.abs_err = self.sq_err = self.sum_y = self.sum_y2 = 0.0
+
+    def update(self, y_true, y_pred, proba=None):
+        if self.problem_type == "classification":
+            k = self.confusion.shape[0]
+            self.confusion += np.bincount(y_true * k + y_pred, minlength=k * k).reshape(k, k)
+            if proba is not None and self._auc_n < self.auc_rows:
+                take = self.auc_rows - self._auc_n
+                self._auc_true.append(y_true[:take])
+                self._auc_proba.append(proba[:take])
+                self._auc_n += len(y_true[:take])
+        else:
+            err = y_pred - y_true
+            self.n += len(y_true)
+            self.abs_err += float(np.abs(err).sum())
+            self.sq_err += float((err ** 2).sum())
+            self.sum_y += float(y_true.sum())
+            self.sum_y2 += float((y_true ** 2).sum())
+
+    def result(self):
+        """Return (metrics, score) like functions.score_model."""
+        if self.problem_type == "classification":
+            C = self.confusion
+            tp, support, predicted = np.diag(C), C.sum(axis=1), C.sum(axis=0)
+            with np.errstate(invalid="ignore", divide="ignore"):
+                precision = np.where(predicted > 0, tp / predicted, 0.0)
+                recall = np.where(support > 0, tp / support, 0.0)
+                f1 = np.where(precision + recall > 0, 2 * precision * recall / (precision + recall), 0.0)
+            total = C.sum()
+            f1_weighted = float((f1 * support).sum() / total) if total else np.nan
+            roc_auc = np.nan
+            if self._auc_true:
+                y, p = np.concatenate(self._auc_true), np.concatenate(self._auc_proba)
+                if len(np.unique(y)) == 2 and p.shape[1] == 2:
+                    roc_auc = roc_auc_score(y, p[:, 1])
+                elif len(np.unique(y)) == p.shape[1] > 2:
+                    roc_auc = roc_auc_score(y, p, multi_class="ovr")
+            metrics = {"Accuracy": float(np.trace(C) / total) if total else np.nan,
+                       "F1": f1_weighted, "ROC_AUC": roc_auc}
+            return metrics, f1_weighted
+        n = max(self.n, 1)
+        ss_tot = self.sum_y2 - self.sum_y ** 2 / n
+        r2 = 1 - self.sq_err / ss_tot if ss_tot > 0 else np.nan
+        metrics = {"MAE": self.abs_err / n, "RMSE": float(np.sqrt(self.sq_err / n)), "R2": r2}
+        return metrics, r2
+
+
+class _ChunkIter(xgb.DataIter):
+    """Feeds XGBoost's external-memory DMatrix from a generator of (X, y, weight) batches."""
+
+    def __init__(self, make_batches, cache_prefix):
+        self._make_batches = make_batches
+        self._batches = None
+        super().__init__(cache_prefix=cache_prefix)
+
+    def next(self, input_data):
+        if self._batches is None:
+            self._batches = self._make_batches()
+        batch = next(self._batches, None)
+        if batch is None:
+            return False
+        X, y, w = batch
+        input_data(data=X, label=y, weight=w)
+        return True
+
+    def reset(self):
+        self._batches = None
+
+
+def _xgb_external_memory(make_batches, problem_type, n_classes, cache_dir):
+    """Train the XGBoost candidate from disk-cached pages and wrap it in its sklearn class."""
+    template = get_candidate_models(problem_type)["XGBoost"]
+    params = {k: v for k, v in template.get_xgb_params().items()
+              if v is not None and k != "use_label_encoder"}
+    params["tree_method"] = "hist"
+    if problem_type == "classification" and n_classes > 2:
+        params.update(objective="multi:softprob", num_class=n_classes, eval_metric="mlogloss")
+    it = _ChunkIter(make_batches, os.path.join(cache_dir, "xgb"))
+    dmatrix_cls = getattr(xgb, "ExtMemQuantileDMatrix", None)
+    dtrain = dmatrix_cls(it) if dmatrix_cls is not None else xgb.DMatrix(it)
+    booster = xgb.train(params, dtrain, num_boost_round=template.n_estimators)
+    model = type(template)(**template.get_params())
+    model.load_model(bytearray(booster.save_raw("ubj")))
+    return model
+
+
+def run_out_of_core(store, dataset_id, target, progress=None, chunksize=CHUNK_ROWS, epochs=EPOCHS,
+                    random_state=42):
+    """
+    Train on a stored dataset without ever holding it in memory.
+
+    Every pass streams `chunksize`-row chunks (DatasetStore.iter_chunks);
+    rows are assigned to train/test by hash_split.
+
+    1. one pass fits the PreprocessingPipeline (fit on the first chunk,
+       partial_fit on the rest), the target classes and a report sample;
+    2. SGD models (one per SGD_ALPHAS) learn with partial_fit over
+       `epochs` passes, and XGBoost trains from an external-memory DMatrix;
+    3. one pass scores every candidate on the test rows (StreamingMetrics).
+
+    Returns a dict with model, model_name, preprocessor, problem_type,
+    metrics_list, model_comparison, best_score, cleaning_summary, sample
+    (report frame) and n_rows.
+    """
+    def stage(name):
+        if progress is not None:
+            progress(name)
+
+    def labelled_chunks():
+        for chunk in store.iter_chunks(dataset_id, chunksize=chunksize):
+            chunk = chunk[chunk[target].notna()]
+            if len(chunk):
+                yield chunk, hash_split(chunk)
+
+    # Pass 1: preprocessing statistics, target classes, report sample
+    stage("split")
+    stage("clean")
+    preprocessor, problem_type, label_counts = None, None, None
+    sample = RowSample(random_state=random_state)
+    n_rows = n_missing = n_train = n_test = capped = 0
+    for chunk in store.iter_chunks(dataset_id, chunksize=chunksize):
+        if target not in chunk.columns:
+            raise ValueError(f"Target '{target}' not found in dataset.")
+        n_rows += len(chunk)
+        sample.update(chunk)
+        labelled = chunk[target].notna()
+        n_missing += int((~labelled).sum())
+        chunk = chunk[labelled]
+        if chunk.empty:
+            continue
+        test = hash_split(chunk)
+        n_test += int(test.sum())
+        train = chunk[~test]
+        if problem_type is None:
+            problem_type = detect_problem_type(chunk[target])
+        if problem_type == "classification":
+            counts = train[target].value_counts().reindex(chunk[target].unique(), fill_value=0)
+            label_counts = counts if label_counts is None else label_counts.add(counts, fill_value=0)
+        if train.empty:
+            continue
+        n_train += len(train)
+        preprocessor = PreprocessingPipeline().fit(train.drop(columns=[target])) if preprocessor is None \
+            else preprocessor.partial_fit(train)
+        capped += preprocessor.count_capped(train)
+    if preprocessor is None:
+        raise ValueError("No labelled training rows")
+
+    if problem_type == "classification":
+        target_encoder = TargetEncoder(encode_numeric=True).fit(pd.Series(label_counts.index))
+        classes = np.arange(len(target_encoder.classes_))
+        counts = label_counts.reindex(target_encoder.classes_, fill_value=0).to_numpy()
+        # "balanced" class weights from the streamed counts (partial_fit can't compute them)
+        class_weight = {c: n_train / (len(classes) * n) for c, n in zip(classes, counts) if n > 0}
+    else:
+        target_encoder = TargetEncoder().fit(sample.frame[target])
+        classes, class_weight = None, None
+    preprocessor.target_encoder_ = target_encoder
+
+    def encode(chunk):
+        X = preprocessor.transform(chunk).to_numpy()
+        y = target_encoder.transform(chunk[target])
+        return X, (y if problem_type == "classification" else y.astype(np.float64))
+
+    def train_batches():
+        for chunk, test in labelled_chunks():
+            if (~test).any():
+                X, y = encode(chunk[~test])
+                w = np.array([class_weight.get(c, 0.0) for c in range(len(classes))])[y] \
+                    if class_weight else None
+                yield X, y, w
+
+    # Pass 2..: candidates
+    stage("train_candidates")
+    if problem_type == "classification":
+        candidates = {f"SGDClassifier (alpha={a:g})": SGDClassifier(loss="log_loss", alpha=a,
+                                                                    class_weight=class_weight,
+                                                                    random_state=random_state)
+                      for a in SGD_ALPHAS}
+    else:
+        candidates = {f"SGDRegressor (alpha={a:g})": SGDRegressor(alpha=a, random_state=random_state)
+                      for a in SGD_ALPHAS}
+    rng = np.random.default_rng(random_state)
+    for _ in range(epochs):
+        for X, y, _w in train_batches():
+            order = rng.permutation(len(X))
+            for model in candidates.values():
+                if classes is not None:
+                    model.partial_fit(X[order], y[order], classes=classes)
+                else:
+                    model.partial_fit(X[order], y[order])
+
+    failed = {}
+    with tempfile.TemporaryDirectory(prefix="automl-xgb-") as cache_dir:
+        try:
+            candidates["XGBoost"] = _xgb_external_memory(train_batches, problem_type,
+                                                         len(classes) if classes is not None else None,
+                                                         cache_dir)
+        except Exception as e:
+            failed["XGBoost"] = f"{type(e).__name__}: {e}"
+
+    # Final pass: test metrics for every candidate
+    scorers = {name: StreamingMetrics(problem_type, len(classes) if classes is not None else None)
+               for name in candidates}
+    for chunk, test in labelled_chunks():
+        if not test.any():
+            continue
+        X, y = encode(chunk[test])
+        for name, model in candidates.items():
+            if problem_type == "classification":
+                proba = model.predict_proba(X)
+                scorers[name].update(y, proba.argmax(axis=1), proba)
+            else:
+                scorers[name].update(y, model.predict(X))
+
+    metrics_list, model_comparison = [], []
+    for name, scorer in scorers.items():
+        metrics, score = scorer.result()
+        metrics_list.append(dict(metrics, Model=name, Status="ok"))
+        model_comparison.append((name, score))
+    for name, error in failed.items():
+        metrics_list.append({"Model": name, "Status": "failed", "Error": error})
+
+    best_name, best_score = max(model_comparison, key=lambda c: -np.inf if np.isnan(c[1]) else c[1])
+    n_features = len(preprocessor.columns_)
+    return {
+        "model": candidates[best_name],
+        "model_name": best_name.split(" ")[0] + "(OutOfCore)",
+        "preprocessor": preprocessor,
+        "problem_type": problem_type,
+        "metrics_list": metrics_list,
+        "model_comparison": model_comparison,
+        "best_score": best_score,
+        "cleaning_summary": {
+            "duplicates_removed": 0,
+            "outliers_removed": 0,
+            "outliers_capped": capped,
+            "rows_missing_target": n_missing,
+            "test_rows": n_test,
+            "final_train_shape": (n_train, n_features),
+            "final_shape": (n_train, n_features),
+        },
+        "sample": sample.frame,
+        "n_rows": n_rows,
+    }
@@ -0,0 +1,579 @@
+# pipeline.py
+import os
+import json
+import shutil
+import time
+import uuid
+from contextlib import ExitStack
+from urllib.parse import urlencode
+import numpy as np
+import pandas as pd
+
+from dataset_store import DatasetStore
+import model_formats
+from profiling import RunProfiler
+from run_cache import RunCache, run_key
+from tuning import TUNING_ENGINE
+
+# The training stack (sklearn, XGBoost, scipy) is imported by the stages that use it, so
+# the API process and freshly spawned job workers start without it (see warmup.py).
+
+UPLOAD_DIR = "uploads"
+MODEL_DIR = "models"
+REPORT_DIR = "reports"
+# Run record (paths of a run's model and preprocessor) saved in each run's model directory
+RUN_RECORD_FILE = "run.json"
+
+# Candidate screening: concurrent fits and per-model wall-clock budget (seconds)
+CANDIDATE_N_JOBS = int(os.environ.get("AUTOML_CANDIDATE_N_JOBS", -1))
+CANDIDATE_TIMEOUT = float(os.environ["AUTOML_CANDIDATE_TIMEOUT"]) if os.environ.get("AUTOML_CANDIDATE_TIMEOUT") else None
+
+# Model search: "two_phase" (train every candidate, then tune the winner) or
+# "halving" (Hyperband over family + hyperparameters within a shared budget)
+SEARCH_MODE = os.environ.get("AUTOML_SEARCH_MODE", "two_phase")
+SEARCH_TIME_BUDGET = float(os.environ["AUTOML_SEARCH_TIME_BUDGET"]) if os.environ.get("AUTOML_SEARCH_TIME_BUDGET") else None
+SEARCH_MAX_FITS = int(os.environ["AUTOML_SEARCH_MAX_FITS"]) if os.environ.get("AUTOML_SEARCH_MAX_FITS") else None
+
+# Warm-start from the previous model when a dataset extends one trained before
+INCREMENTAL = os.environ.get("AUTOML_INCREMENTAL", "1").lower() not in ("0", "false", "no")
+
+# Out-of-core training: "auto" switches it on for source files of at least OUT_OF_CORE_MIN_BYTES
+OUT_OF_CORE = os.environ.get("AUTOML_OUT_OF_CORE", "auto")
+OUT_OF_CORE_MIN_BYTES = int(os.environ.get("AUTOML_OUT_OF_CORE_MIN_BYTES", 4 * 1024 ** 3))
+
+# Categorical features: "label" (integer codes, one dense matrix) or "auto" (sparse one-hot for
+# low-cardinality columns, out-of-fold target / frequency encoding above
+# AUTOML_ONEHOT_MAX_CATEGORIES levels, native categoricals for XGBoost)
+CATEGORICAL_ENCODING = os.environ.get("AUTOML_CATEGORICAL_ENCODING", "auto")
+
+# Serve repeat runs (same dataset, target and config) from run_cache.RunCache
+RUN_CACHE = os.environ.get("AUTOML_RUN_CACHE", "1").lower() not in ("0", "false", "no")
+
+# Stage names reported through the progress callback, in pipeline order.
+STAGES = ["load", "split", "clean", "feature_engineering", "train_candidates",
+          "tune", "save_model", "report"]
+
+
+# --- Helper: Convert numpy types to JSON-safe types ---
+def convert_numpy(obj):
+    if isinstance(obj, dict):
+        return {k: convert_numpy(v) for k, v in obj.items()}
+    elif isinstance(obj, (list, tuple)):
+        return [convert_numpy(i) for i in obj]
+    elif isinstance(obj, (np.integer, np.int64)):
+        return int(obj)
+    elif isinstance(obj, (np.floating, np.float64)):
+        return float(obj)
+    elif isinstance(obj, np.ndarray):
+        return obj.tolist()
+    else:
+        return obj
+
+
+def report_filename(run_id, ext=".json"):
+    """File name of a run's report under REPORT_DIR (ext=".pdf" for the rendered PDF)."""
+    return f"automl_report_{run_id}{ext}"
+
+
+def run_model_dir(model_dir, run_id):
+    """Directory holding one run's model, preprocessor and run record."""
+    return os.path.join(model_dir, run_id)
+
+
+def write_run_record(model_dir, run):
+    """
+    Write `run` (the DatasetStore.record_run entry) as <model_dir>/<run_id>/run.json;
+    the registry and /download-model/ resolve a run's artifact paths from it.
+    """
+    path = os.path.join(run_model_dir(model_dir, run["run_id"]), RUN_RECORD_FILE)
+    tmp = f"{path}.{uuid.uuid4().hex}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(convert_numpy(run), f)
+    os.replace(tmp, path)
+    return path
+
+
+def plot_url(dataset_id, kind, column=None):
+    """Relative URL of the on-demand /plots/ endpoint for one plot."""
+    params = {"kind": kind}
+    if column is not None:
+        params["column"] = column
+    return f"/plots/{dataset_id}?{urlencode(params)}"
+
+
+def run_automl_pipeline(file_path=None, user_target=None, progress=None, dataset_id=None,
+                        model_dir=MODEL_DIR, report_dir=REPORT_DIR,
+                        candidate_n_jobs=CANDIDATE_N_JOBS, candidate_timeout=CANDIDATE_TIMEOUT,
+                        search_mode=SEARCH_MODE, search_time_budget=SEARCH_TIME_BUDGET,
+                        search_max_fits=SEARCH_MAX_FITS, incremental=INCREMENTAL,
+                        out_of_core=OUT_OF_CORE, flamegraph=False, use_cache=RUN_CACHE,
+                        force_refresh=False, on_event=None):
+    """
+    Run the full AutoML workflow for one dataset and target column.
+
+    The dataset is read from the DatasetStore when `dataset_id` is given
+    (or `file_path` points into the store), otherwise parsed from `file_path`.
+
+    `progress` is an optional callable invoked with the stage name before
+    each stage starts; it may raise to abort the run between stages.
+
+    With `incremental`, a dataset that extends a previously trained one
+    (DatasetStore.find_parent) updates that run's model and preprocessor
+    with the appended rows instead of searching again; report["incremental"]
+    says how, or why it fell back to a full run.
+
+    `out_of_core` (True, False or "auto") streams the dataset in chunks
+    instead (out_of_core.run_out_of_core); the result has the same shape.
+
+    `search_mode="halving"` replaces candidate screening + tuning with a
+    Hyperband search bounded by `search_time_budget` seconds and/or
+    `search_max_fits` fits; its rung-by-rung log lands in report["search"].
+
+    Wall time, CPU time and peak RSS of every stage and candidate / tuning
+    fit land in report["profile"] (profiling.RunProfiler); `flamegraph=True`
+    also samples the run's stacks into <report_dir>/flamegraph_<id>.svg / .folded.
+
+    With `use_cache`, a run with the same dataset content, target,
+    configuration and library versions as a cached one returns that result
+    (result["cache"]["hit"]) and restores its model files instead of
+    training; `force_refresh` (or `flamegraph`) retrains and replaces the entry.
+
+    `on_event` is an optional callable that receives live progress events
+    (dicts with a "type"): "stage" when a stage starts or finishes,
+    "candidate" with each screened model's metrics as it finishes, "tuning"
+    per tuning configuration with the best score so far and "search" per
+    Hyperband fit (events.EventLog turns them into a stream with ETAs).
+
+    Returns the JSON-safe result dict served by /run-automl/.
+    """
+    profiler = RunProfiler(
+        os.path.join(report_dir, f"flamegraph_{uuid.uuid4().hex[:12]}") if flamegraph else None
+    )
+
+    current = {"stage": None, "started": None}
+
+    def emit(kind, **data):
+        if on_event is not None:
+            on_event(dict(data, type=kind, time=time.time()))
+
+    def finish_stage():
+        if current["stage"] is not None:
+            emit("stage", stage=current["stage"], status="finished",
+                 wall_s=time.perf_counter() - current["started"])
+
+    def stage(name):
+        if progress is not None:
+            progress(name)
+        profiler.stage(name)
+        finish_stage()
+        current.update(stage=name, started=time.perf_counter())
+        emit("stage", stage=name, status="started", index=STAGES.index(name) if name in STAGES else None,
+             total_stages=len(STAGES))
+
+    try:
+        # `resources` holds the dataset's eviction pin until the run ends
+        with ExitStack() as resources:
+            result = _run(file_path, user_target, stage, dataset_id, model_dir, report_dir, candidate_n_jobs,
+                          candidate_timeout, search_mode, search_time_budget, search_max_fits, incremental,
+                          out_of_core, profiler, use_cache, force_refresh or flamegraph, emit, resources)
+        finish_stage()
+        return result
+    finally:
+        # Stops the RSS / stack samplers when the run failed before _save_and_report finished the profile
+        profiler.finish()
+
+
+def _run(file_path, user_target, stage, dataset_id, model_dir, report_dir, candidate_n_jobs,
+         candidate_timeout, search_mode, search_time_budget, search_max_fits, incremental,
+         out_of_core, profiler, use_cache, force_refresh, emit, resources):
+    """
+    run_automl_pipeline's body; `stage` reports progress and opens the
+    profiler's next stage, `emit(type, **data)` sends a progress event.
+    Context managers entered on `resources` (an ExitStack) last for the run.
+    """
+    # Load dataset
+    stage("load")
+    store = DatasetStore()
+    dataset_id = dataset_id or (store.resolve(file_path) if file_path else None)
+    if dataset_id is None:
+        # Register ad-hoc files so plots can be served lazily by dataset_id
+        dataset_id = store.add_file(file_path, move=False, convert=False)["dataset_id"]
+    # Uploads handled by other processes must not evict the dataset while this run reads it
+    resources.enter_context(store.in_use(dataset_id))
+
+    out_of_core = _resolve_out_of_core(store, dataset_id, out_of_core)
+
+    cache = cache_key = None
+    if use_cache:
+        cache = RunCache()
+        cache_key = run_key(dataset_id, user_target, _cache_config(
+            candidate_timeout, search_mode, search_time_budget, search_max_fits, incremental, out_of_core))
+        if not force_refresh:
+            cached = _load_cached_run(cache, cache_key, store, dataset_id, user_target, model_dir, report_dir)
+            if cached is not None:
+                return cached
+    cache_slot = {"cache": cache, "key": cache_key}
+    if out_of_core:
+        from out_of_core import run_out_of_core
+        result = run_out_of_core(store, dataset_id, user_target, progress=stage)
+        sample = result["sample"]
+        meta = store.get_meta(dataset_id)
+        sample.attrs.update(ingestion=meta.get("ingestion"), eda_stats=meta.get("eda_stats"))
+        return _save_and_report(
+            sample, dataset_id, user_target, result["model"], result["model_name"], result["preprocessor"],
+            result["problem_type"], result["cleaning_summary"], result["metrics_list"],
+            result["model_comparison"], result["best_score"], {"out_of_core": True}, store, stage,
+            model_dir, report_dir, n_rows=result["n_rows"], profiler=profiler, cache=cache_slot
+        )
+
+    df = store.load(dataset_id)
+
+    if user_target not in df.columns:
+        raise ValueError(f"Target '{user_target}' not found in dataset.")
+
+    # Rows without a target can't be used for training
+    incremental_summary = None
+    parent = store.find_parent(dataset_id, user_target) if incremental else None
+    if parent is not None:
+        from incremental import incremental_retrain, IncrementalNotPossible
+        parent_meta, run = parent
+        stage("split")
+        try:
+            result = incremental_retrain(df, user_target, run)
+        except IncrementalNotPossible as e:
+            incremental_summary = {"parent_dataset_id": parent_meta["dataset_id"], "fallback": str(e)}
+        else:
+            result["summary"]["parent_dataset_id"] = parent_meta["dataset_id"]
+            stage("tune")
+            X = df.drop(columns=[user_target])
+            previous_metrics = dict(result["previous_metrics"], Model=run["model_name"] + " (previous)")
+            metrics = dict(result["metrics"], Model=run["model_name"] + " (updated)")
+            cleaning_summary = {
+                "rows_missing_target": int(df[user_target].isna().sum()),
+                "final_train_shape": (result["summary"]["trained_rows"], X.shape[1]),
+                "final_shape": (result["summary"]["trained_rows"], X.shape[1]),
+            }
+            return _save_and_report(
+                df, dataset_id, user_target, result["model"], run["model_name"], result["preprocessor"],
+                run["problem_type"], cleaning_summary, [previous_metrics, metrics],
+                [(run["model_name"] + " (previous)", result["previous_score"]),
+                 (run["model_name"] + " (updated)", result["score"])],
+                result["score"], {"incremental": result["summary"]}, store, stage, model_dir, report_dir,
+                profiler=profiler, cache=cache_slot
+            )
+
+    from preprocessing import PreprocessingPipeline, TargetEncoder
+    from functions import (
+        automated_train_test_split, detect_problem_type, get_candidate_models, evaluate_model,
+        select_best_model, tune_best_model, candidate_view
+    )
+    from fingerprint import row_fingerprints, duplicate_mask, count_shared
+
+    # Full-row fingerprints (features + target), computed at ingestion; hashed here only for
+    # datasets stored before they existed
+    fingerprints = store.fingerprints(dataset_id)
+    if fingerprints is None or len(fingerprints) != len(df):
+        fingerprints = row_fingerprints(df)
+    fingerprints = pd.Series(np.asarray(fingerprints), index=df.index)
+
+    labelled = df[user_target].notna()
+    X = df.loc[labelled].drop(columns=[user_target])
+    y = df.loc[labelled, user_target]
+
+    # Split dataset
+    stage("split")
+    X_train, X_test, y_train, y_test = automated_train_test_split(X, y)
+    # Exact copies of test rows in the training split inflate the test score; counted, not removed
+    test_rows_in_train = count_shared(fingerprints.loc[X_test.index], fingerprints.loc[X_train.index])
+
+    # Detect problem type; the encoded target feeds target encoding of high-cardinality features
+    problem_type = detect_problem_type(y)
+    target_encoder = TargetEncoder().fit(y)
+
+    # Clean data: impute, cap outliers, encode and scale with one fitted pipeline
+    stage("clean")
+    # Duplicate training rows are dropped before imputation and encoding, so imputers and
+    # target encodings are fitted on the kept rows
+    keep = ~duplicate_mask(fingerprints.loc[X_train.index])
+    duplicates_removed = int((~keep).sum())
+    X_train, y_train = X_train.loc[keep], y_train.loc[keep]
+    if CATEGORICAL_ENCODING == "auto":
+        preprocessor = PreprocessingPipeline(encoding="auto", target_type=problem_type)
+        X_train_enc = preprocessor.fit_transform(X_train, target_encoder.transform(y_train))
+    else:
+        preprocessor = PreprocessingPipeline().fit(X_train)
+        X_train_enc = preprocessor.transform(X_train)
+    X_test_enc = preprocessor.transform(X_test)
+    meta = store.get_meta(dataset_id)
+    cleaning_summary = {
+        "duplicates_removed": duplicates_removed,
+        "dataset_duplicate_rows": meta.get("duplicate_rows"),
+        "test_rows_in_train": test_rows_in_train,
+        "leakage_ratio": test_rows_in_train / len(X_test) if len(X_test) else 0.0,
+        "dataset_fingerprint": meta.get("fingerprint"),
+        "outliers_removed": 0,
+        "outliers_capped": preprocessor.count_capped(X_train),
+        "rows_missing_target": int((~labelled).sum()),
+        "final_train_shape": X_train_enc.shape,
+        "final_shape": X_train_enc.shape,
+    }
+
+    # Feature engineering (target encoding; features were encoded above)
+    stage("feature_engineering")
+    preprocessor.target_encoder_ = target_encoder
+    y_train_enc, y_test_enc = target_encoder.transform(y_train), target_encoder.transform(y_test)
+
+    search_report = screening_summary = None
+    if search_mode == "halving":
+        # One search over (family, hyperparameters); "tune" is the final full-data fit
+        from search import hyperband_search
+        stage("train_candidates")
+        searched = {"completed": 0, "best_score": None, "best_family": None}
+
+        def search_result(entry):
+            searched["completed"] += 1
+            if np.isfinite(entry["score"]) and (searched["best_score"] is None
+                                                or entry["score"] > searched["best_score"]):
+                searched.update(best_score=entry["score"], best_family=entry["model"])
+            emit("search", result=entry, time_budget=search_time_budget, max_fits=search_max_fits, **searched)
+
+        best_tuned_model, best_model_name, best_val_score, search_report = hyperband_search(
+            X_train_enc, y_train_enc, problem_type,
+            time_budget=search_time_budget, max_fits=search_max_fits, refit=False, fit_log=profiler.fits,
+            on_result=search_result
+        )
+        stage("tune")
+        tuned_metrics, tuned_score, _ = evaluate_model(
+            best_tuned_model, X_train_enc, X_test_enc, y_train_enc, y_test_enc, problem_type
+        )
+        metrics_list = []
+        names_list = list(search_report["family_best"])
+        scores_list = [v["score"] for v in search_report["family_best"].values()]
+        best_idx = names_list.index(best_model_name)
+    elif search_mode == "two_phase":
+        # find cadidate models
+        from screening import screen_candidates
+        stage("train_candidates")
+        candidates = get_candidate_models(problem_type)
+        train_views, test_views = X_train_enc, X_test_enc
+        if preprocessor.view_ != "dense" and preprocessor.onehot_idx_:
+            # XGBoost splits on the low-cardinality columns natively instead of on their one-hot block
+            candidates["XGBoost"].set_params(enable_categorical=True, tree_method="hist")
+            train_views = {"default": X_train_enc, "XGBoost": preprocessor.transform(
+                X_train, view="xgboost", oof_target=target_encoder.transform(y_train))}
+            test_views = {"default": X_test_enc, "XGBoost": preprocessor.transform(X_test, view="xgboost")}
+
+        # Screen candidates on stratified samples; the best families are refitted on all rows
+        screened = []
+
+        def candidate_result(entry):
+            refit = entry["Model"].endswith("(full data)")
+            if not refit:
+                screened.append(entry["Model"])
+            emit("candidate", result=entry, phase="refit" if refit else "screen", completed=len(screened),
+                 total=len(candidates))
+
+        metrics_list, scores_list, models_list, names_list, screening_summary = screen_candidates(
+            candidates, train_views, test_views, y_train_enc, y_test_enc, problem_type,
+            n_jobs=candidate_n_jobs, timeout=candidate_timeout, fit_log=profiler.fits,
+            on_result=candidate_result
+        )
+
+        # Select best model
+        best_model, best_model_name, best_idx = select_best_model(scores_list, models_list, names_list)
+        if isinstance(train_views, dict) and best_model_name in train_views:
+            preprocessor.view_ = "xgboost"
+        X_train_enc = candidate_view(train_views, best_model_name)
+        X_test_enc = candidate_view(test_views, best_model_name)
+
+        # Tune best model
+        stage("tune")
+        best_tuned_model = tune_best_model(best_model_name, best_model, X_train_enc, y_train_enc, problem_type,
+                                           fit_log=profiler.tuning, on_result=lambda r: emit("tuning", **r))
+
+        # Evaluate tuned model
+        tuned_metrics, tuned_score, tuned_model = evaluate_model(
+            best_tuned_model, X_train_enc, X_test_enc, y_train_enc, y_test_enc, problem_type
+        )
+    else:
+        raise ValueError(f"Unknown search mode '{search_mode}'")
+
+    tuned_metrics["Model"] = best_model_name + " (Tuned)"
+    metrics_list.append(tuned_metrics)
+    best_model_name = best_model_name + "(Tuned)"
+
+    # Model comparison summary
+    model_comparison = list(zip(names_list, scores_list))
+
+    extra_sections = {}
+    if search_report is not None:
+        extra_sections["search"] = search_report
+    if screening_summary is not None:
+        extra_sections["screening"] = screening_summary
+    if incremental_summary is not None:
+        extra_sections["incremental"] = incremental_summary
+    extra_sections["encoding"] = preprocessor.encoding_summary()
+    return _save_and_report(
+        df, dataset_id, user_target, best_tuned_model, best_model_name, preprocessor, problem_type,
+        cleaning_summary, metrics_list, model_comparison, scores_list[best_idx], extra_sections,
+        store, stage, model_dir, report_dir, profiler=profiler, cache=cache_slot
+    )
+
+
+def _save_and_report(df, dataset_id, user_target, model, model_name, preprocessor, problem_type,
+                     cleaning_summary, metrics_list, model_comparison, best_score, extra_sections,
+                     store, stage, model_dir, report_dir, n_rows=None, profiler=None, cache=None):
+    """
+    Persist the model + preprocessor under <model_dir>/<run_id>/, write the
+    report, then record the run for incremental retraining and serving (a
+    failed report removes the model directory). `n_rows` is the dataset's
+    row count when `df` is only a sample of it; `profiler`'s result becomes
+    report["profile"].
+    `cache` ({"cache": RunCache, "key": run_key}) stores the result.
+    """
+    n_rows = len(df) if n_rows is None else n_rows
+    # One report file and one model directory per run, so concurrent or later runs of the same
+    # family never overwrite (or mix) each other's model and preprocessor
+    run_id = uuid.uuid4().hex[:16]
+
+    try:
+        return _save_run(df, dataset_id, user_target, model, model_name, preprocessor, problem_type,
+                         cleaning_summary, metrics_list, model_comparison, best_score, extra_sections,
+                         store, stage, model_dir, report_dir, n_rows, profiler, cache, run_id)
+    except BaseException:
+        # A run that failed before its record was written is never served; don't leave its model behind
+        run_dir = run_model_dir(model_dir, run_id)
+        if not os.path.exists(os.path.join(run_dir, RUN_RECORD_FILE)):
+            shutil.rmtree(run_dir, ignore_errors=True)
+        raise
+
+
+def _save_run(df, dataset_id, user_target, model, model_name, preprocessor, problem_type,
+              cleaning_summary, metrics_list, model_comparison, best_score, extra_sections,
+              store, stage, model_dir, report_dir, n_rows, profiler, cache, run_id):
+    """_save_and_report's body; the run is recorded only once its report is written."""
+    from functions import save_model, generate_report_json
+
+    # Save model
+    stage("save_model")
+    model_base = os.path.join(run_model_dir(model_dir, run_id), model_name.replace(" ", "_"))
+    preprocessor_path = model_base + ".preprocessor.pkl"
+    save_model(preprocessor, preprocessor_path, compress_level=3)
+    model_path = model_formats.save(model, model_base)
+    run = {
+        "run_id": run_id,
+        "dataset_id": dataset_id,
+        "target": user_target,
+        "model_name": model_name,
+        "model_path": model_path,
+        "preprocessor_path": preprocessor_path,
+        "model_version": os.stat(model_path).st_mtime_ns,
+        "problem_type": problem_type,
+        "rows": n_rows,
+        "trained_at": time.time(),
+    }
+
+    # Feature engineering summary
+    X = df.drop(columns=[user_target])
+    feature_eng_summary = {
+        "categorical_features": X.select_dtypes(include=['object', 'category']).columns.tolist(),
+        "numerical_features": X.select_dtypes(exclude=['object', 'category']).columns.tolist()
+    }
+
+    # Best model summary
+    best_model_details = {
+        "name": model_name,
+        "score": best_score
+    }
+
+    # Generate JSON report
+    stage("report")
+    report_json = generate_report_json(
+        df, cleaning_summary, feature_eng_summary, model_comparison, best_model_details, target=user_target,
+        plot_url=lambda kind, column: plot_url(dataset_id, kind, column)
+    )
+    report_json["dataset_summary"]["shape"] = (n_rows, df.shape[1])
+    report_json["metrics"] = metrics_list
+    report_json["ingestion"] = df.attrs.get("ingestion")
+    report_json.update(extra_sections)
+    report_json["run_id"] = run_id
+    report_json["dataset_id"] = dataset_id
+
+    # Convert numpy objects to JSON-safe
+    if profiler is not None:
+        report_json["profile"] = profiler.finish()
+    report_json_safe = convert_numpy(report_json)
+
+    # Save JSON report to file
+    os.makedirs(report_dir, exist_ok=True)
+    report_path = os.path.join(report_dir, report_filename(run_id))
+    with open(report_path, "w") as f:
+        json.dump(report_json_safe, f)
+    write_run_record(model_dir, run)
+    store.record_run(dataset_id, user_target, run)
+
+    result = {
+        "message": "AutoML pipeline completed successfully",
+        "best_model": model_name,
+        "model_path": model_path,
+        "preprocessor_path": preprocessor_path,
+        "report_path": report_path,
+        "run_id": run_id,
+        "dataset_id": dataset_id,
+        "report": report_json_safe
+    }
+    if cache is not None and cache["cache"] is not None:
+        cache["cache"].put(cache["key"], result, run)
+        result["cache"] = {"key": cache["key"], "hit": False}
+    return result
+
+
+def _resolve_out_of_core(store, dataset_id, out_of_core):
+    if out_of_core == "auto":
+        return store.get_meta(dataset_id)["source_bytes"] >= OUT_OF_CORE_MIN_BYTES
+    if isinstance(out_of_core, str):
+        return out_of_core.lower() not in ("0", "false", "no")
+    return bool(out_of_core)
+
+
+def _cache_config(candidate_timeout, search_mode, search_time_budget, search_max_fits, incremental,
+                  out_of_core):
+    """Everything besides dataset and target that changes a run's result (see run_cache.run_key)."""
+    return {
+        "candidate_timeout": candidate_timeout,
+        "search_mode": search_mode,
+        "search_time_budget": search_time_budget,
+        "search_max_fits": search_max_fits,
+        "incremental": bool(incremental),
+        "out_of_core": out_of_core,
+        "model_format": model_formats.MODEL_FORMAT,
+        "categorical_encoding": CATEGORICAL_ENCODING,
+        "tuning_engine": TUNING_ENGINE,
+    }
+
+
+def _load_cached_run(cache, key, store, dataset_id, user_target, model_dir, report_dir):
+    hit = cache.get(key, model_dir, report_dir)
+    if hit is None:
+        return None
+    result, run = hit
+    # The restored files are now this dataset's latest model (incremental retraining starts from it)
+    write_run_record(model_dir, run)
+    store.record_run(dataset_id, user_target, run)
+    return result
+
+
+def cached_run_result(dataset_id, user_target, model_dir=MODEL_DIR, report_dir=REPORT_DIR,
+                      incremental=INCREMENTAL, store=None):
+    """
+    The cached result run_automl_pipeline would return for a stored dataset
+    with the default configuration, or None; lets the API answer repeat
+    requests without queueing a job.
+    """
+    if not RUN_CACHE:
+        return None
+    store = store or DatasetStore()
+    config = _cache_config(CANDIDATE_TIMEOUT, SEARCH_MODE, SEARCH_TIME_BUDGET, SEARCH_MAX_FITS, incremental,
+                           _resolve_out_of_core(store, dataset_id, OUT_OF_CORE))
+    return _load_cached_run(RunCache(), run_key(dataset_id, user_target, config), store, dataset_id,
+                            user_target, model_dir, report_dir)
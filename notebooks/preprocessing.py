@@ -0,0 +1,435 @@
+# preprocessing.py
+import os
+import warnings
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+NUMERIC_STRATEGIES = ("mean", "median", "most_frequent")
+
+# -----------------------------
+# Defaults
+# -----------------------------
+# encoding="auto": categoricals with at most this many levels are one-hot encoded, the rest target encoded
+ONEHOT_MAX_CATEGORIES = int(os.environ.get("AUTOML_ONEHOT_MAX_CATEGORIES", 32))
+TARGET_ENCODING_FOLDS = 5
+TARGET_ENCODING_SMOOTHING = 10.0   # pseudo-count pulling rare categories towards the prior
+
+
+def _column_modes(X):
+    """Most frequent non-NaN value per column of a 2-D float array."""
+    modes = np.full(X.shape[1], np.nan)
+    for j in range(X.shape[1]):
+        col = X[:, j]
+        col = col[~np.isnan(col)]
+        if col.size:
+            values, counts = np.unique(col, return_counts=True)
+            modes[j] = values[np.argmax(counts)]
+    return modes
+
+
+def _merge_moments(n_a, mean_a, var_a, B):
+    """Chan et al. merge of (count, mean, population variance) with the rows of B."""
+    n_b = len(B)
+    if n_b == 0:
+        return mean_a, var_a
+    mean_b, var_b = B.mean(axis=0), B.var(axis=0)
+    n = n_a + n_b
+    delta = mean_b - mean_a
+    mean = mean_a + delta * n_b / n
+    m2 = var_a * n_a + var_b * n_b + delta ** 2 * n_a * n_b / n
+    return mean, m2 / n
+
+
+class PreprocessingPipeline:
+    """
+    Fitted, serialisable replacement for clean_data + feature_engineering.
+
+    fit() learns, from training data only:
+    - imputation values (numeric: median by default, categorical: mode),
+    - IQR / z-score outlier caps for numeric columns,
+    - label-encoding classes for categorical columns,
+    - standard-scaling mean/std for every encoded column.
+
+    transform() applies all of it to a frame in a few whole-block numpy
+    operations (one float matrix for the numeric columns, one integer code
+    lookup per categorical column) and returns a new float frame with the
+    original column order, without per-column DataFrame copies. Unseen or
+    missing categories map to the training mode.
+
+    partial_fit() folds in further training rows (see its docstring) for
+    incremental retraining.
+
+    With encoding="auto" categoricals are encoded by cardinality instead:
+    columns with at most `onehot_max_categories` levels are one-hot encoded
+    and the rest get a frequency column plus a smoothed target encoding
+    (one column per class but the first for classification), computed out
+    of fold on the training rows when fit_transform / transform get
+    `oof_target`. transform() then returns one of two views:
+    - "sparse": a scipy CSR matrix [scaled numeric | one-hot | target and
+      frequency encodings], for linear models, SVMs and random forests,
+    - "xgboost": a DataFrame whose one-hot columns are instead pandas
+      categoricals, for XGBoost's native categorical splits
+      (enable_categorical=True).
+    `view_` is the view transform() returns by default; the pipeline sets
+    it to the one the saved model was trained on.
+
+    The object pickles with joblib next to the model so prediction can
+    reuse exactly the same transformation.
+    """
+
+    def __init__(self, strategies=None, default_missing="auto", outlier_method="iqr",
+                 scale=True, dtype=np.float64, encoding="label", target_type="regression",
+                 onehot_max_categories=ONEHOT_MAX_CATEGORIES, te_folds=TARGET_ENCODING_FOLDS,
+                 te_smoothing=TARGET_ENCODING_SMOOTHING, random_state=42):
+        self.strategies = strategies or {}
+        self.default_missing = default_missing
+        self.outlier_method = outlier_method
+        self.scale = scale
+        self.dtype = dtype
+        self.encoding = encoding
+        self.target_type = target_type
+        self.onehot_max_categories = onehot_max_categories
+        self.te_folds = te_folds
+        self.te_smoothing = te_smoothing
+        self.random_state = random_state
+
+    # --- helpers ---
+    def _numeric_strategy(self, col):
+        method = self.strategies.get(col)
+        if method is None:
+            method = "median" if self.default_missing == "auto" else self.default_missing
+        if method not in NUMERIC_STRATEGIES:
+            raise ValueError(f"Unsupported imputation strategy '{method}' for column '{col}'")
+        return method
+
+    def _encode(self, s, j):
+        """Integer codes for categorical column index j of cat_cols_."""
+        classes = self.classes_[j]
+        fill_code = self.cat_fill_codes_[j]
+        if isinstance(s.dtype, pd.CategoricalDtype):
+            lookup = classes.get_indexer(s.cat.categories.astype(str))
+            raw = s.cat.codes.to_numpy()
+            codes = np.where(raw >= 0, lookup[raw], -1)
+        else:
+            codes = classes.get_indexer(s.astype(str).where(s.notna(), None))
+        return np.where(codes >= 0, codes, fill_code)
+
+    def _numeric_block(self, X):
+        return X[self.num_cols_].to_numpy(dtype=np.float64, na_value=np.nan) if self.num_cols_ \
+            else np.empty((len(X), 0))
+
+    def _fill_values(self, N):
+        """Imputation value per numeric column of N, grouped by strategy (one reduction per group)."""
+        fill = np.full(len(self.num_cols_), np.nan)
+        strategies = np.array([self._numeric_strategy(c) for c in self.num_cols_], dtype=object)
+        for method in NUMERIC_STRATEGIES:
+            idx = np.flatnonzero(strategies == method)
+            if idx.size == 0:
+                continue
+            with np.errstate(all="ignore"), warnings.catch_warnings():
+                warnings.simplefilter("ignore", RuntimeWarning)
+                if method == "median":
+                    fill[idx] = np.nanmedian(N[:, idx], axis=0)
+                elif method == "mean":
+                    fill[idx] = np.nanmean(N[:, idx], axis=0)
+                else:
+                    fill[idx] = _column_modes(N[:, idx])
+        return fill
+
+    def _codes_block(self, X):
+        C = np.empty((len(X), len(self.cat_cols_)))
+        for j, col in enumerate(self.cat_cols_):
+            C[:, j] = self._encode(X[col], j)
+        return C
+
+    # --- fit / transform ---
+    def fit(self, X, y=None):
+        self.columns_ = list(X.columns)
+        self.num_cols_ = X.select_dtypes(include=[np.number, "bool"]).columns.tolist()
+        self.cat_cols_ = [c for c in self.columns_ if c not in set(self.num_cols_)]
+
+        # Numeric imputation values
+        N = self._numeric_block(X)
+        self.n_samples_ = len(X)
+        self.num_count_ = (~np.isnan(N)).sum(axis=0)
+        self.num_fill_ = np.nan_to_num(self._fill_values(N), nan=0.0)
+        N = np.where(np.isnan(N), self.num_fill_, N)
+
+        # Outlier caps on the imputed training block
+        if self.outlier_method == "iqr" and N.size:
+            q1, q3 = np.quantile(N, [0.25, 0.75], axis=0)
+            iqr = q3 - q1
+            self.lower_, self.upper_ = q1 - 1.5 * iqr, q3 + 1.5 * iqr
+        elif self.outlier_method == "zscore" and N.size:
+            mean, std = N.mean(axis=0), N.std(axis=0, ddof=1)
+            self.lower_, self.upper_ = mean - 3 * std, mean + 3 * std
+        else:
+            self.lower_ = np.full(N.shape[1], -np.inf)
+            self.upper_ = np.full(N.shape[1], np.inf)
+        N = np.clip(N, self.lower_, self.upper_)
+
+        # Categorical fill values and classes (LabelEncoder order: sorted strings)
+        self.classes_, self.cat_fill_codes_ = [], []
+        C = np.empty((len(X), len(self.cat_cols_)))
+        for j, col in enumerate(self.cat_cols_):
+            s = X[col]
+            counts = s.value_counts(dropna=True)
+            mode = str(counts.index[0]) if len(counts) else "missing"
+            observed = counts.index[counts.to_numpy() > 0].astype(str)
+            classes = pd.Index(np.unique(np.append(observed.to_numpy(dtype=object), mode).astype(str)))
+            self.classes_.append(classes)
+            self.cat_fill_codes_.append(int(classes.get_loc(mode)))
+            C[:, j] = self._encode(s, j)
+
+        # Scaling statistics over the encoded block
+        if self.scale:
+            self.num_mean_, self.num_var_ = N.mean(axis=0), N.var(axis=0)
+            self.cat_mean_, self.cat_var_ = C.mean(axis=0), C.var(axis=0)
+            self._set_std()
+        self.view_ = "dense"
+        if self.encoding == "auto":
+            self._fit_cardinality(C.astype(np.int64), y)
+        return self
+
+    # --- cardinality-aware encoding (encoding="auto") ---
+    def _target_matrix(self, y):
+        """Target as columns: indicators of every class but the first, or the value itself."""
+        y = np.asarray(y)
+        if self.target_type == "classification":
+            return (y[:, None] == self.te_classes_[None, 1:]).astype(np.float64)
+        return y.astype(np.float64)[:, None]
+
+    def _te_map(self, codes, T, n_levels):
+        """Smoothed mean of T per level: (sum + m * prior) / (count + m)."""
+        counts = np.bincount(codes, minlength=n_levels)
+        sums = np.stack([np.bincount(codes, weights=T[:, k], minlength=n_levels) for k in range(T.shape[1])],
+                        axis=1)
+        return (sums + self.te_smoothing * self.te_prior_) / (counts + self.te_smoothing)[:, None]
+
+    def _fit_cardinality(self, codes, y):
+        n_levels = [len(c) for c in self.classes_]
+        self.onehot_idx_ = [j for j, n in enumerate(n_levels) if n <= self.onehot_max_categories]
+        self.te_idx_ = [j for j, n in enumerate(n_levels) if n > self.onehot_max_categories]
+        self.onehot_offsets_ = np.concatenate([[0], np.cumsum([n_levels[j] for j in self.onehot_idx_])])
+        self.freq_maps_ = [np.bincount(codes[:, j], minlength=n_levels[j]) / max(len(codes), 1)
+                           for j in self.te_idx_]
+        self.te_maps_ = []
+        if y is not None and self.te_idx_:
+            y = np.asarray(y)
+            self.te_classes_ = np.unique(y) if self.target_type == "classification" else None
+            T = self._target_matrix(y)
+            self.te_prior_ = T.mean(axis=0)
+            self.te_maps_ = [self._te_map(codes[:, j], T, n_levels[j]) for j in self.te_idx_]
+
+        names = []
+        for j in self.te_idx_:
+            col = self.cat_cols_[j]
+            names.append(f"{col}__freq")
+            if self.te_maps_:
+                classes = self.te_classes_[1:] if self.te_classes_ is not None else [None]
+                names.extend(f"{col}__te" if c is None else f"{col}__te_{c}" for c in classes)
+        self.encoded_names_ = names
+
+        # Standardise the encoded block with the statistics of its out-of-fold training values
+        E = self._encoded_block(codes, oof_target=y)
+        self.enc_mean_ = E.mean(axis=0)
+        self.enc_std_ = np.where(E.std(axis=0) > 0, E.std(axis=0), 1.0)
+        self.view_ = "sparse"
+
+    def _encoded_block(self, codes, oof_target=None):
+        """
+        Frequency and target-encoding columns of the high-cardinality
+        categoricals. With `oof_target` (the training target of exactly the
+        fitted rows) each row's target encoding comes from the other folds.
+        """
+        n = len(codes)
+        blocks = []
+        folds = None
+        if oof_target is not None and self.te_maps_ and n >= self.te_folds:
+            from sklearn.model_selection import KFold
+            folds = list(KFold(self.te_folds, shuffle=True, random_state=self.random_state).split(codes))
+            T = self._target_matrix(oof_target)
+        for i, j in enumerate(self.te_idx_):
+            c = codes[:, j]
+            blocks.append(self.freq_maps_[i][c][:, None])
+            if not self.te_maps_:
+                continue
+            if folds is None:
+                blocks.append(self.te_maps_[i][c])
+                continue
+            te = np.empty((n, len(self.te_prior_)))
+            for fit_rows, enc_rows in folds:
+                te[enc_rows] = self._te_map(c[fit_rows], T[fit_rows], len(self.te_maps_[i]))[c[enc_rows]]
+            blocks.append(te)
+        return np.hstack(blocks) if blocks else np.empty((n, 0))
+
+    @property
+    def feature_names_(self):
+        """Output column names of the "sparse" view."""
+        onehot = [f"{self.cat_cols_[j]}={level}" for j in self.onehot_idx_ for level in self.classes_[j]]
+        return list(self.num_cols_) + onehot + list(self.encoded_names_)
+
+    def encoding_summary(self):
+        if getattr(self, "encoding", "label") != "auto":
+            return {"encoding": "label", "n_features": len(self.columns_)}
+        return {
+            "encoding": "auto",
+            "view": self.view_,
+            "onehot": [self.cat_cols_[j] for j in self.onehot_idx_],
+            "target_encoded": [self.cat_cols_[j] for j in self.te_idx_],
+            "n_features": len(self.feature_names_),
+        }
+
+    def _set_std(self):
+        self.num_std_ = np.where(self.num_var_ > 0, np.sqrt(self.num_var_), 1.0)
+        self.cat_std_ = np.where(self.cat_var_ > 0, np.sqrt(self.cat_var_), 1.0)
+
+    def partial_fit(self, X, y=None):
+        """
+        Fold further training rows into a fitted pipeline without revisiting
+        the rows it was fitted on.
+
+        - mean imputation values and the scaling mean/std are merged exactly;
+          median / most-frequent fills are blended by non-null count,
+        - categories first seen in X are appended to classes_, so the codes
+          of known categories (and what a trained model learnt about them)
+          keep their meaning,
+        - outlier caps are kept as fitted.
+
+        Sets `drift_`: the largest change of a scaling mean (in old standard
+        deviations) or relative change of a standard deviation, a measure of
+        how far the feature space moved under an already trained model.
+        """
+        if not hasattr(self, "n_samples_"):
+            raise ValueError("Pipeline was not fitted with incremental statistics; refit it")
+        X = X[self.columns_]
+
+        N = self._numeric_block(X)
+        counts = (~np.isnan(N)).sum(axis=0)
+        total = self.num_count_ + counts
+        weight = np.where(total > 0, counts / np.maximum(total, 1), 0.0)
+        batch_fill = np.where(counts > 0, self._fill_values(N), self.num_fill_)
+        self.num_fill_ = self.num_fill_ + weight * (batch_fill - self.num_fill_)
+        self.num_count_ = total
+        N = np.clip(np.where(np.isnan(N), self.num_fill_, N), self.lower_, self.upper_)
+
+        # encoding="auto" keeps the levels fixed: one-hot width and target encodings are part of the model
+        for j, col in enumerate(self.cat_cols_ if getattr(self, "encoding", "label") != "auto" else []):
+            s = X[col]
+            if isinstance(s.dtype, pd.CategoricalDtype):
+                seen = s.cat.categories[np.bincount(s.cat.codes[s.cat.codes >= 0],
+                                                    minlength=len(s.cat.categories)) > 0].astype(str)
+            else:
+                seen = pd.Index(s.dropna().astype(str).unique())
+            new = seen.difference(self.classes_[j])
+            if len(new):
+                self.classes_[j] = self.classes_[j].append(pd.Index(np.sort(new.to_numpy(dtype=object).astype(str))))
+
+        self.drift_ = 0.0
+        if self.scale:
+            C = self._codes_block(X)
+            old = (np.concatenate([self.num_mean_, self.cat_mean_]), np.concatenate([self.num_std_, self.cat_std_]))
+            self.num_mean_, self.num_var_ = _merge_moments(self.n_samples_, self.num_mean_, self.num_var_, N)
+            self.cat_mean_, self.cat_var_ = _merge_moments(self.n_samples_, self.cat_mean_, self.cat_var_, C)
+            self._set_std()
+            mean_shift = np.abs(np.concatenate([self.num_mean_, self.cat_mean_]) - old[0]) / old[1]
+            std_shift = np.abs(np.concatenate([self.num_std_, self.cat_std_]) / old[1] - 1)
+            self.drift_ = float(max(mean_shift.max(initial=0.0), std_shift.max(initial=0.0)))
+        self.n_samples_ += len(X)
+        return self
+
+    def transform(self, X, view=None, oof_target=None):
+        """
+        Encode X. `view` ("dense", "sparse" or "xgboost", default view_)
+        only matters for encoding="auto"; `oof_target` is the training
+        target when X holds exactly the rows the pipeline was fitted on.
+        """
+        missing = [c for c in self.columns_ if c not in X.columns]
+        if missing:
+            raise ValueError(f"Missing columns: {missing}")
+
+        N = self._numeric_block(X)
+        N = np.where(np.isnan(N), self.num_fill_, N)
+        N = np.clip(N, self.lower_, self.upper_)
+
+        C = self._codes_block(X)
+
+        if self.scale:
+            N = (N - self.num_mean_) / self.num_std_
+        view = view or getattr(self, "view_", "dense")
+        if view != "dense":
+            return self._transform_view(X, N, C.astype(np.int64), view, oof_target)
+        if self.scale:
+            C = (C - self.cat_mean_) / self.cat_std_
+
+        out = np.empty((len(X), len(self.columns_)), dtype=self.dtype)
+        pos = {c: i for i, c in enumerate(self.columns_)}
+        if self.num_cols_:
+            out[:, [pos[c] for c in self.num_cols_]] = N
+        if self.cat_cols_:
+            out[:, [pos[c] for c in self.cat_cols_]] = C
+        return pd.DataFrame(out, columns=self.columns_, index=X.index)
+
+    def _transform_view(self, X, N, codes, view, oof_target):
+        E = (self._encoded_block(codes, oof_target) - self.enc_mean_) / self.enc_std_
+        if view == "xgboost":
+            data = {c: N[:, i] for i, c in enumerate(self.num_cols_)}
+            for j in self.onehot_idx_:
+                data[self.cat_cols_[j]] = pd.Categorical.from_codes(codes[:, j], categories=self.classes_[j])
+            for i, name in enumerate(self.encoded_names_):
+                data[name] = E[:, i]
+            return pd.DataFrame(data, index=X.index)
+        if view != "sparse":
+            raise ValueError(f"Unknown view '{view}'")
+        if not self.onehot_idx_:
+            return pd.DataFrame(np.hstack([N, E]).astype(self.dtype, copy=False), columns=self.feature_names_,
+                                index=X.index)
+        n, k = len(X), len(self.onehot_idx_)
+        cols = (codes[:, self.onehot_idx_] + self.onehot_offsets_[:-1]).ravel()
+        onehot = sparse.csr_matrix((np.ones(n * k, dtype=self.dtype), (np.repeat(np.arange(n), k), cols)),
+                                   shape=(n, int(self.onehot_offsets_[-1])))
+        return sparse.hstack([sparse.csr_matrix(N), onehot, sparse.csr_matrix(E)], format="csr", dtype=self.dtype)
+
+    def fit_transform(self, X, y=None, view=None):
+        """fit + transform; with encoding="auto" and y, training rows get out-of-fold target encodings."""
+        self.fit(X, y)
+        return self.transform(X, view=view, oof_target=y if self.encoding == "auto" else None)
+
+    def count_capped(self, X):
+        """Number of numeric cells the fitted caps would clip in X."""
+        N = self._numeric_block(X)
+        N = np.where(np.isnan(N), self.num_fill_, N)
+        return int(((N < self.lower_) | (N > self.upper_)).sum())
+
+
+class TargetEncoder:
+    """
+    Label-encodes string/categorical targets; passes numeric targets
+    through unless `encode_numeric` (numeric class labels -> 0..k-1).
+    """
+
+    def __init__(self, encode_numeric=False):
+        self.encode_numeric = encode_numeric
+
+    def fit(self, y):
+        self.classes_ = None
+        # Any non-numeric dtype: object, category and pandas' str dtype alike
+        if not pd.api.types.is_numeric_dtype(y):
+            self.classes_ = pd.Index(np.unique(y.astype(str)))
+        elif self.encode_numeric:
+            self.classes_ = pd.Index(np.unique(y.dropna().to_numpy()))
+        return self
+
+    def transform(self, y):
+        if self.classes_ is None:
+            return y.to_numpy()
+        codes = self.classes_.get_indexer(y if pd.api.types.is_numeric_dtype(self.classes_) else y.astype(str))
+        if (codes < 0).any():
+            raise ValueError("Target contains labels not seen during training")
+        return codes
+
+    def inverse_transform(self, codes):
+        if self.classes_ is None:
+            return np.asarray(codes)
+        return self.classes_.to_numpy()[np.asarray(codes, dtype=int)]
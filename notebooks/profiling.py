@@ -0,0 +1,216 @@
+# profiling.py
+import os
+import sys
+import time
+import resource
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from html import escape
+
+# -----------------------------
+# Defaults
+# -----------------------------
+RSS_SAMPLE_INTERVAL = float(os.environ.get("AUTOML_RSS_SAMPLE_INTERVAL", 0.05))   # seconds
+FLAMEGRAPH_INTERVAL = float(os.environ.get("AUTOML_FLAMEGRAPH_INTERVAL", 0.01))   # seconds between stack samples
+
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+def current_rss():
+    """Resident set size of this process in bytes (the peak so far where /proc isn't available)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except (OSError, IndexError, ValueError):
+        scale = 1 if sys.platform == "darwin" else 1024
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale
+
+
+def cpu_seconds():
+    """CPU time of this process plus its reaped child processes (e.g. candidate workers)."""
+    own = time.process_time()
+    children = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return own + children.ru_utime + children.ru_stime
+
+
+class PeakRSS:
+    """Background thread tracking the largest RSS of this process until stop()."""
+
+    def __init__(self, interval=RSS_SAMPLE_INTERVAL):
+        self.start_rss = self.peak = current_rss()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, args=(interval,), daemon=True)
+        self._thread.start()
+
+    def _run(self, interval):
+        while not self._stop.wait(interval):
+            self.peak = max(self.peak, current_rss())
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+        self.peak = max(self.peak, current_rss())
+        return self.peak
+
+
+@contextmanager
+def measure():
+    """
+    Context manager yielding a dict that is filled on exit with wall_s,
+    cpu_s and peak_rss_mb of the enclosed block.
+    """
+    stats = {}
+    rss = PeakRSS()
+    wall, cpu = time.perf_counter(), cpu_seconds()
+    try:
+        yield stats
+    finally:
+        stats["wall_s"] = time.perf_counter() - wall
+        stats["cpu_s"] = cpu_seconds() - cpu
+        stats["peak_rss_mb"] = rss.stop() / 1024 ** 2
+
+
+class SamplingProfiler:
+    """
+    Samples the Python stack of one thread every `interval` seconds and
+    counts identical stacks, for a flamegraph of where a run spent its time.
+    """
+
+    def __init__(self, thread_id=None, interval=FLAMEGRAPH_INTERVAL):
+        self.thread_id = thread_id or threading.get_ident()
+        self.interval = interval
+        self.stacks = Counter()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})")
+                frame = frame.f_back
+            if stack:
+                self.stacks[";".join(reversed(stack))] += 1
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        return self
+
+    def write_folded(self, path):
+        """Collapsed stacks, one "frame;frame;... count" line each (flamegraph.pl / speedscope input)."""
+        with open(path, "w") as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+        return path
+
+    def write_svg(self, path, width=1200, row_height=16):
+        """A static flamegraph SVG: callers at the bottom, width proportional to samples."""
+        tree = {}
+        for stack, count in self.stacks.items():
+            node = tree
+            for frame in stack.split(";"):
+                entry = node.setdefault(frame, [0, {}])
+                entry[0] += count
+                node = entry[1]
+        total = sum(self.stacks.values()) or 1
+        rects, depth_max = [], 0
+
+        def layout(node, x, depth):
+            nonlocal depth_max
+            depth_max = max(depth_max, depth)
+            for frame, (count, children) in sorted(node.items()):
+                w = width * count / total
+                if w >= 0.5:
+                    rects.append((x, depth, w, frame, count))
+                    layout(children, x, depth + 1)
+                x += w
+
+        layout(tree, 0.0, 0)
+        height = (depth_max + 1) * row_height
+        out = [f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" '
+               f'font-family="monospace" font-size="11">']
+        for x, depth, w, frame, count in rects:
+            y = height - (depth + 1) * row_height
+            hue = 20 + sum(map(ord, frame)) % 40
+            label = escape(frame[:max(0, int(w / 7))])
+            out.append(f'<g><title>{escape(frame)} ({count} samples, {100 * count / total:.1f}%)</title>'
+                       f'<rect x="{x:.1f}" y="{y}" width="{w:.1f}" height="{row_height - 1}" '
+                       f'fill="hsl({hue},90%,60%)"/><text x="{x + 2:.1f}" y="{y + row_height - 4}">{label}</text></g>')
+        out.append("</svg>")
+        with open(path, "w") as f:
+            f.write("\n".join(out))
+        return path
+
+
+class RunProfiler:
+    """
+    Per-stage wall time, CPU time and peak RSS of one pipeline run.
+
+    stage(name) closes the current stage and opens the next, matching the
+    pipeline's progress callbacks. `fits` and `tuning` are passed as
+    `fit_log` to train_candidates / tune_best_model / hyperband_search,
+    which append one entry per fit. With `flamegraph_path` (no extension)
+    a SamplingProfiler runs for the whole job and finish() writes
+    `<path>.folded` and `<path>.svg`.
+    """
+
+    def __init__(self, flamegraph_path=None):
+        self.stages = []
+        self.fits = []
+        self.tuning = []
+        self._current = None
+        self._started = time.perf_counter()
+        self._cpu_started = cpu_seconds()
+        self.flamegraph_path = flamegraph_path
+        self._sampler = SamplingProfiler().start() if flamegraph_path else None
+
+    def stage(self, name):
+        self._close()
+        self._current = (name, time.perf_counter(), cpu_seconds(), PeakRSS())
+
+    def _close(self):
+        if self._current is None:
+            return
+        name, wall, cpu, rss = self._current
+        self.stages.append({
+            "stage": name,
+            "wall_s": time.perf_counter() - wall,
+            "cpu_s": cpu_seconds() - cpu,
+            "start_rss_mb": rss.start_rss / 1024 ** 2,
+            "peak_rss_mb": rss.stop() / 1024 ** 2,
+        })
+        self._current = None
+
+    def finish(self):
+        """Close the open stage (and the flamegraph sampler); returns the report["profile"] section."""
+        self._close()
+        profile = {
+            "total": {
+                "wall_s": time.perf_counter() - self._started,
+                "cpu_s": cpu_seconds() - self._cpu_started,
+                "peak_rss_mb": max((s["peak_rss_mb"] for s in self.stages), default=current_rss() / 1024 ** 2),
+            },
+            "stages": self.stages,
+            "fits": self.fits,
+            "tuning": self.tuning,
+        }
+        if self._sampler is not None:
+            self._sampler.stop()
+            os.makedirs(os.path.dirname(self.flamegraph_path) or ".", exist_ok=True)
+            profile["flamegraph"] = {
+                "samples": sum(self._sampler.stacks.values()),
+                "folded": self._sampler.write_folded(self.flamegraph_path + ".folded"),
+                "svg": self._sampler.write_svg(self.flamegraph_path + ".svg"),
+            }
+            self._sampler = None
+        return profile
@@ -0,0 +1,184 @@
+# registry.py
+import os
+import json
+import threading
+from collections import OrderedDict
+import joblib
+import numpy as np
+import pandas as pd
+
+import model_formats
+from pipeline import RUN_RECORD_FILE
+
+# -----------------------------
+# Defaults
+# -----------------------------
+MAX_MODELS = int(os.environ.get("AUTOML_REGISTRY_MAX_MODELS", 8))
+MAX_MODEL_BYTES = int(os.environ.get("AUTOML_REGISTRY_MAX_BYTES", 2 * 1024 ** 3))
+PREDICT_BATCH_ROWS = 100_000
+
+
+def artifact_nbytes(*paths):
+    """
+    Size of a model from its artifact files. Stands in for its in-memory
+    size without serialising the model again or touching memory-mapped
+    arrays (joblib-mmap models stay paged out until used).
+    """
+    return sum(os.path.getsize(p) for p in paths if p and os.path.exists(p))
+
+
+class LoadedModel:
+    """A model and the preprocessing it was trained with, ready to score frames."""
+
+    def __init__(self, name, model, preprocessor, version, model_name=None, nbytes=0):
+        self.name = name
+        self.model_name = model_name or name
+        self.model = model
+        self.preprocessor = preprocessor
+        self.version = version
+        self.nbytes = nbytes
+
+    @property
+    def target_encoder(self):
+        return getattr(self.preprocessor, "target_encoder_", None)
+
+    def predict_frame(self, df):
+        """Vectorised prediction for a raw feature frame; returns a result frame."""
+        X = df
+        if self.preprocessor is not None:
+            X = self.preprocessor.transform(df[self.preprocessor.columns_])
+        out = pd.DataFrame(index=df.index)
+        encoder = self.target_encoder
+        if hasattr(self.model, "predict_proba"):
+            # One pass: class predictions are the argmax of the probabilities
+            proba = self.model.predict_proba(X)
+            classes = np.asarray(getattr(self.model, "classes_", np.arange(proba.shape[1])))
+            preds = classes[proba.argmax(axis=1)]
+            labels = encoder.inverse_transform(classes) if encoder is not None else classes
+            out["prediction"] = encoder.inverse_transform(preds) if encoder is not None else preds
+            for j, cls in enumerate(labels):
+                out[f"proba_{cls}"] = proba[:, j]
+        else:
+            preds = self.model.predict(X)
+            out["prediction"] = encoder.inverse_transform(preds) if encoder is not None else preds
+        return out
+
+
+class ModelRegistry:
+    """
+    Process-wide cache of loaded models with LRU eviction.
+
+    Models are keyed by run_id. A run's model and preprocessor are loaded
+    from the paths in its run record (`<model_dir>/<run_id>/run.json`,
+    written by pipeline.write_run_record) the first time it is requested
+    and kept in memory while it is among the most recently used
+    `max_models` models and their total size (artifact_nbytes) stays
+    under `max_bytes`. The pair is reloaded on the next request after either
+    file is rewritten on disk (e.g. a run-cache restore).
+    """
+
+    def __init__(self, model_dir="models", max_models=MAX_MODELS, max_bytes=MAX_MODEL_BYTES):
+        self.model_dir = model_dir
+        self.max_models = max_models
+        self.max_bytes = max_bytes
+        self._models = OrderedDict()
+        self._lock = threading.Lock()
+        self._load_locks = {}
+
+    def record(self, run_id):
+        """The run record saved for `run_id`; KeyError for unknown runs."""
+        if not run_id or not run_id.isalnum():
+            raise KeyError(f"Invalid run id '{run_id}'")
+        try:
+            with open(os.path.join(self.model_dir, run_id, RUN_RECORD_FILE)) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            raise KeyError(f"Run '{run_id}' not found")
+
+    def latest_run(self, model_name):
+        """run_id of the most recently trained run of `model_name`; KeyError if there is none."""
+        best = None
+        with os.scandir(self.model_dir) as entries:
+            for entry in entries:
+                if not entry.is_dir() or not entry.name.isalnum():
+                    continue
+                try:
+                    run = self.record(entry.name)
+                except KeyError:
+                    continue
+                if run.get("model_name") == model_name and (best is None or run["trained_at"] > best["trained_at"]):
+                    best = run
+        if best is None:
+            raise KeyError(f"No run of model '{model_name}'")
+        return best["run_id"]
+
+    def paths(self, run_id):
+        """(model path, preprocessor path) of a run, as recorded when it was saved."""
+        run = self.record(run_id)
+        return run["model_path"], run["preprocessor_path"]
+
+    def _version(self, name):
+        # Model and preprocessor are versioned together: rewriting either one reloads both
+        model_path, pre_path = self.paths(name)
+        try:
+            return os.stat(model_path).st_mtime_ns, os.stat(pre_path).st_mtime_ns
+        except FileNotFoundError:
+            raise KeyError(f"Model for run '{name}' not found")
+
+    def get(self, name):
+        version = self._version(name)
+        with self._lock:
+            entry = self._models.get(name)
+            if entry is not None and entry.version == version:
+                self._models.move_to_end(name)
+                return entry
+            load_lock = self._load_locks.setdefault(name, threading.Lock())
+
+        # Load outside the registry lock; concurrent requests for the same model wait here
+        with load_lock:
+            with self._lock:
+                entry = self._models.get(name)
+                if entry is not None and entry.version == version:
+                    self._models.move_to_end(name)
+                    return entry
+            entry = self._load(name, version)
+            with self._lock:
+                self._models[name] = entry
+                self._models.move_to_end(name)
+                self._evict(keep=name)
+            return entry
+
+    def _load(self, name, version):
+        run = self.record(name)
+        model = model_formats.load(os.path.splitext(run["model_path"])[0])
+        preprocessor = joblib.load(run["preprocessor_path"])
+        return LoadedModel(name, model, preprocessor, version, model_name=run.get("model_name"),
+                           nbytes=artifact_nbytes(run["model_path"], run["preprocessor_path"]))
+
+    def _evict(self, keep=None):
+        total = sum(e.nbytes for e in self._models.values())
+        for name in list(self._models):
+            if len(self._models) <= self.max_models and total <= self.max_bytes:
+                break
+            if name == keep:
+                continue
+            total -= self._models.pop(name).nbytes
+
+    def evict(self, name):
+        with self._lock:
+            return self._models.pop(name, None) is not None
+
+    def info(self):
+        with self._lock:
+            return [{"name": e.name, "model_name": e.model_name, "bytes": e.nbytes}
+                    for e in self._models.values()]
+
+
+def iter_batches(path, fmt, batch_rows=PREDICT_BATCH_ROWS):
+    """Yield DataFrames of at most `batch_rows` rows from a CSV or Parquet file."""
+    if fmt == "parquet":
+        import pyarrow.parquet as pq
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=batch_rows):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(path, chunksize=batch_rows)
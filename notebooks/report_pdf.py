@@ -0,0 +1,232 @@
+# report_pdf.py
+import os
+import json
+import time
+import threading
+import pandas as pd
+
+from reporting import build_figure, plot_payload
+
+# -----------------------------
+# Defaults
+# -----------------------------
+PAGE_SIZE = (8.27, 11.69)   # A4, inches
+TABLE_ROWS_PER_PAGE = 30
+TABLE_MAX_COLUMNS = 8
+
+_render_locks = {}
+_render_locks_guard = threading.Lock()
+
+
+def pdf_path_for(report_path):
+    """The PDF rendered from a report JSON sits next to it with the same name."""
+    return os.path.splitext(report_path)[0] + ".pdf"
+
+
+def _fmt(value):
+    if isinstance(value, float):
+        return f"{value:.4g}"
+    if isinstance(value, (list, tuple)):
+        return " x ".join(map(str, value))
+    return "" if value is None else str(value)
+
+
+def _page():
+    from matplotlib.figure import Figure
+    return Figure(figsize=PAGE_SIZE)
+
+
+def text_page(title, lines):
+    """A page with a title and one key / value or free-text line per entry."""
+    fig = _page()
+    fig.text(0.08, 0.94, title, fontsize=18, weight="bold")
+    y = 0.89
+    for line in lines:
+        if y < 0.05:
+            break
+        fig.text(0.08, y, line, fontsize=10, family="monospace")
+        y -= 0.025
+    return fig
+
+
+def table_pages(title, columns, rows, rows_per_page=TABLE_ROWS_PER_PAGE):
+    """Pages of a table, `rows_per_page` rows and TABLE_MAX_COLUMNS columns at a time."""
+    columns = list(columns)[:TABLE_MAX_COLUMNS]
+    rows = [[_fmt(v) for v in row[:len(columns)]] for row in rows]
+    n_pages = max(1, -(-len(rows) // rows_per_page))
+    for page in range(n_pages):
+        fig = _page()
+        fig.text(0.08, 0.94, title if n_pages == 1 else f"{title} ({page + 1}/{n_pages})",
+                 fontsize=16, weight="bold")
+        chunk = rows[page * rows_per_page:(page + 1) * rows_per_page]
+        if chunk:
+            ax = fig.add_axes([0.05, 0.05, 0.9, 0.85])
+            ax.axis("off")
+            table = ax.table(cellText=chunk, colLabels=columns, loc="upper center", cellLoc="left")
+            table.auto_set_font_size(False)
+            table.set_fontsize(8)
+            table.scale(1, 1.3)
+        yield fig
+
+
+def _summary_lines(summary):
+    return [f"{k.replace('_', ' ')}: {_fmt(v)}" for k, v in (summary or {}).items()
+            if not isinstance(v, dict)]
+
+
+def iter_report_pages(report, load_columns=None):
+    """
+    Yield the report's pages as matplotlib Figures, one at a time and in
+    order: overview, cleaning / encoding, model metrics and comparison,
+    EDA tables, every plot of report["plots"], then the profile.
+
+    Plots are drawn from data loaded by `load_columns(columns)` (a
+    DataFrame of just those columns) one column at a time; without it, or
+    when the dataset is gone, only the count / pie plots (from the stored
+    value counts) are drawn.
+    """
+    dataset = report.get("dataset_summary", {})
+    best = report.get("best_model", {})
+    yield text_page("AutoML Report", [
+        f"run: {report.get('run_id', '')}",
+        f"dataset: {report.get('dataset_id', '')}",
+        f"rows x columns: {_fmt(dataset.get('shape'))}",
+        f"target: {dataset.get('target')}",
+        f"best model: {best.get('name')}",
+        f"best score: {_fmt(best.get('score'))}",
+        f"generated: {time.strftime('%Y-%m-%d %H:%M:%S')}",
+    ])
+
+    lines = ["Cleaning"] + ["  " + l for l in _summary_lines(report.get("cleaning_summary"))]
+    features = report.get("feature_engineering") or {}
+    for key in ("numerical_features", "categorical_features"):
+        values = features.get(key) or []
+        lines.append(f"{key.replace('_', ' ')} ({len(values)}): {', '.join(map(str, values[:12]))}"
+                     + (" ..." if len(values) > 12 else ""))
+    if report.get("encoding"):
+        lines += ["", "Encoding"] + ["  " + l for l in _summary_lines(report["encoding"])]
+    yield text_page("Data preparation", lines)
+
+    metrics = report.get("metrics") or []
+    if metrics:
+        columns = ["Model"] + [k for k in dict.fromkeys(k for m in metrics for k in m) if k != "Model"]
+        yield from table_pages("Model metrics", columns, [[m.get(c) for c in columns] for m in metrics])
+
+    comparison = [(name, score) for name, score in report.get("model_comparison") or [] if score is not None]
+    if comparison:
+        fig = _page()
+        ax = fig.add_axes([0.3, 0.55, 0.62, 0.35])
+        ax.barh([str(n) for n, _ in comparison], [s for _, s in comparison], color="#6d28d9")
+        ax.invert_yaxis()
+        ax.set_title("Model comparison (validation score)")
+        yield fig
+
+    eda = report.get("eda") or {}
+    numeric = eda.get("numeric_summary") or {}
+    if numeric:
+        stats = ["mean", "std", "min", "median", "max", "nulls"]
+        yield from table_pages("Numeric features", ["column"] + stats,
+                               [[col] + [s.get(k) for k in stats] for col, s in numeric.items()])
+    categorical = eda.get("categorical_summary") or {}
+    if categorical:
+        cardinality = eda.get("categorical_cardinality") or {}
+        rows = [[col, cardinality.get(col), ", ".join(f"{k} ({v})" for k, v in list(counts.items())[:4])]
+                for col, counts in categorical.items()]
+        yield from table_pages("Categorical features", ["column", "distinct", "most frequent"], rows)
+
+    correlations = eda.get("correlations") or {}
+    if correlations.get("top_pairs"):
+        yield from table_pages("Strongest correlations", ["a", "b", "r"],
+                               [[p["a"], p["b"], p["r"]] for p in correlations["top_pairs"]])
+    rows = [[a["feature"], dataset.get("target"), a["measure"], a["value"]]
+            for a in eda.get("target_association") or []]
+    rows += [[a["a"], a["b"], a["measure"], a["value"]] for a in correlations.get("associations") or []]
+    if rows:
+        yield from table_pages("Associations", ["a", "b", "measure", "value"], rows)
+
+    yield from _plot_pages(report.get("plots") or {}, eda, load_columns)
+
+    stages = (report.get("profile") or {}).get("stages") or []
+    if stages:
+        yield from table_pages("Profile", ["stage", "wall_s", "cpu_s", "peak_rss_mb"],
+                               [[s.get("stage"), s.get("wall_s"), s.get("cpu_s"), s.get("peak_rss_mb")]
+                                for s in stages])
+
+
+def _plot_pages(plots, eda, load_columns):
+    from eda_stats import OTHER_BUCKET
+    value_counts = {
+        col: pd.Series({k: v for k, v in counts.items() if k != OTHER_BUCKET}, dtype="int64")
+        for col, counts in (eda.get("categorical_summary") or {}).items()
+    }
+    loaded = {}   # the one column (or heatmap frame) currently in memory
+
+    def frame(columns):
+        key = tuple(columns)
+        if key not in loaded:
+            loaded.clear()
+            loaded[key] = load_columns(list(columns))
+        return loaded[key]
+
+    for descriptor in plots.values():
+        if not isinstance(descriptor, dict):
+            continue   # inline base64 plots carry no descriptor
+        kind, column = descriptor.get("kind"), descriptor.get("column")
+        try:
+            if kind in ("count", "pie") and column in value_counts:
+                payload = plot_payload(None, kind, column, value_counts)
+            elif kind == "heatmap" and (eda.get("correlations") or {}).get("heatmap_matrix") is not None:
+                payload = plot_payload(None, kind, column, correlations=eda["correlations"])
+            elif load_columns is None:
+                continue
+            elif kind == "heatmap":
+                payload = plot_payload(frame(eda.get("numeric_summary") or {}), kind, column)
+            else:
+                payload = plot_payload(frame([column]), kind, column)
+        except (KeyError, ValueError, OSError):
+            continue
+        fig = build_figure(kind, column, payload)
+        fig.set_size_inches(PAGE_SIZE[0], PAGE_SIZE[0] * 0.75)
+        yield fig
+
+
+def write_report_pdf(report, path, load_columns=None):
+    """
+    Render `report` (the generate_report_json dict) to `path`.
+
+    Pages are drawn and written one at a time through PdfPages, so only the
+    current figure is in memory; the file appears atomically when complete.
+    """
+    from matplotlib.backends.backend_pdf import PdfPages
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with PdfPages(tmp, metadata={"Title": f"AutoML report {report.get('run_id', '')}".strip(),
+                                     "Creator": "AutoML"}) as pdf:
+            for fig in iter_report_pages(report, load_columns):
+                pdf.savefig(fig)
+        os.replace(tmp, path)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+    return path
+
+
+def get_or_render_report_pdf(report_path, store=None):
+    """
+    Path of the PDF for the report JSON at `report_path`, rendered on the
+    first request (and again if the JSON is newer). Concurrent requests for
+    the same report wait for one rendering.
+    """
+    pdf_path = pdf_path_for(report_path)
+    with _render_locks_guard:
+        lock = _render_locks.setdefault(pdf_path, threading.Lock())
+    with lock:
+        if os.path.exists(pdf_path) and os.stat(pdf_path).st_mtime_ns >= os.stat(report_path).st_mtime_ns:
+            return pdf_path
+        with open(report_path) as f:
+            report = json.load(f)
+        load_columns = None
+        dataset_id = report.get("dataset_id")
+        if store is not None and dataset_id and store.exists(dataset_id):
+            load_columns = lambda columns: store.load(dataset_id, columns=columns)
+        return write_report_pdf(report, pdf_path, load_columns)
@@ -0,0 +1,241 @@
+# reporting.py
+import os
+import io
+import base64
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing as mp
+
+# -----------------------------
+# Defaults
+# -----------------------------
+PLOT_CACHE_DIR = os.path.join("reports", "plot_cache")
+MAX_PLOT_COLUMNS = int(os.environ.get("AUTOML_MAX_PLOT_COLUMNS", 50))
+REPORT_WORKERS = int(os.environ.get("AUTOML_REPORT_WORKERS", min(4, os.cpu_count() or 1)))
+PARALLEL_MIN_PLOTS = 8   # below this, process start-up costs more than it saves
+PIE_MAX_CATEGORIES = 6
+COUNT_TOP_N = 10
+
+
+# -----------------------------
+# Rendering (object-oriented Figure API, safe in worker processes)
+# -----------------------------
+PLOT_FORMATS = {"png": "image/png", "svg": "image/svg+xml", "webp": "image/webp"}
+
+
+def _figure_to_bytes(fig, fmt="png"):
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    if fmt not in PLOT_FORMATS:
+        raise ValueError(f"Unsupported plot format '{fmt}'")
+    FigureCanvasAgg(fig)
+    buf = io.BytesIO()
+    fig.savefig(buf, format=fmt)
+    return buf.getvalue()
+
+
+def build_figure(kind, column, payload):
+    """
+    Draw one plot on a new matplotlib Figure (not registered with pyplot).
+
+    `payload` is the minimal data for the plot: the column values for
+    "hist"/"box", value counts for "count"/"pie", the correlation matrix for
+    "heatmap".
+    """
+    import seaborn as sns
+    from matplotlib.figure import Figure
+
+    if kind == "hist":
+        fig = Figure(figsize=(5, 4))
+        ax = fig.subplots()
+        sns.histplot(payload, kde=True, bins=30, ax=ax)
+        ax.set_title(f"Histogram - {column}")
+    elif kind == "box":
+        fig = Figure(figsize=(5, 4))
+        ax = fig.subplots()
+        sns.boxplot(x=payload, ax=ax)
+        ax.set_title(f"Boxplot - {column}")
+    elif kind == "count":
+        fig = Figure(figsize=(5, 4))
+        ax = fig.subplots()
+        top = payload.iloc[:COUNT_TOP_N]
+        sns.barplot(x=top.index.astype(str), y=top.values, ax=ax)
+        ax.set_xlabel(column)
+        ax.set_ylabel("count")
+        ax.set_title(f"Countplot - {column}")
+    elif kind == "pie":
+        fig = Figure(figsize=(4, 4))
+        ax = fig.subplots()
+        payload.plot.pie(autopct="%1.1f%%", startangle=90, ax=ax)
+        ax.set_ylabel("")
+        ax.set_title(f"Pie Chart - {column}")
+    elif kind == "heatmap":
+        from correlation import HEATMAP_ANNOTATE_MAX_COLUMNS
+        n = len(payload.columns)
+        side = min(14, 4 + 0.35 * n)
+        fig = Figure(figsize=(side + 1, side))
+        ax = fig.subplots()
+        sns.heatmap(payload, annot=n <= HEATMAP_ANNOTATE_MAX_COLUMNS, fmt=".2f", cmap="coolwarm", vmin=-1, vmax=1,
+                    square=True, xticklabels=True, yticklabels=True, ax=ax)
+        total = payload.attrs.get("n_columns_total", n)
+        ax.set_title("Correlation Heatmap" + (f" ({n} of {total} columns, clustered)" if total > n else ""))
+    else:
+        raise ValueError(f"Unknown plot kind '{kind}'")
+
+    fig.tight_layout()
+    return fig
+
+
+def render_plot(kind, column, payload, fmt="png"):
+    """Render one plot (build_figure) and return the encoded image bytes."""
+    return _figure_to_bytes(build_figure(kind, column, payload), fmt)
+
+
+def _render_task(task):
+    kind, column, payload, fmt = task
+    return render_plot(kind, column, payload, fmt)
+
+
+# -----------------------------
+# Plot cache
+# -----------------------------
+class PlotCache:
+    """On-disk cache of rendered plots keyed by (dataset key, plot kind, column)."""
+
+    def __init__(self, root=PLOT_CACHE_DIR):
+        self.root = root
+
+    def path(self, dataset_key, kind, column, fmt="png"):
+        col_key = hashlib.sha1(str(column).encode("utf-8")).hexdigest()[:16]
+        return os.path.join(self.root, dataset_key, f"{kind}_{col_key}.{fmt}")
+
+    def get(self, dataset_key, kind, column, fmt="png"):
+        if dataset_key is None:
+            return None
+        p = self.path(dataset_key, kind, column, fmt)
+        if os.path.exists(p):
+            with open(p, "rb") as f:
+                return f.read()
+        return None
+
+    def put(self, dataset_key, kind, column, data, fmt="png"):
+        if dataset_key is None:
+            return
+        p = self.path(dataset_key, kind, column, fmt)
+        os.makedirs(os.path.dirname(p), exist_ok=True)
+        tmp = f"{p}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, p)
+
+
+def dataset_cache_key(df):
+    """
+    The dataset's content fingerprint (fingerprint.DatasetFingerprint, set
+    by DatasetStore.load), else its dataset_id, else the fingerprint of the
+    frame itself. Plots don't depend on row order, so re-uploads of the same
+    rows share cached plots.
+    """
+    if df.attrs.get("fingerprint"):
+        return df.attrs["fingerprint"]
+    if df.attrs.get("dataset_id"):
+        return df.attrs["dataset_id"]
+    from fingerprint import row_fingerprints, dataset_fingerprint
+    return dataset_fingerprint(row_fingerprints(df), df.columns)
+
+
+# -----------------------------
+# Engine
+# -----------------------------
+def plan_plots(num_cols, cat_cols, n_unique, max_columns=MAX_PLOT_COLUMNS, target=None):
+    """
+    List the (kind, column) plots for a report, capped at `max_columns`
+    plotted columns. `n_unique` maps categorical columns to their number of
+    distinct values (pie charts only for <= PIE_MAX_CATEGORIES). The
+    heatmap's column is the numeric `target` it leaves out, like
+    correlation.correlation_summary, or None.
+
+    Returns (descriptors, skipped_columns).
+    """
+    plot_cols = list(num_cols) + list(cat_cols)
+    if max_columns is not None and len(plot_cols) > max_columns:
+        plotted, skipped = set(plot_cols[:max_columns]), plot_cols[max_columns:]
+    else:
+        plotted, skipped = set(plot_cols), []
+
+    descriptors = []
+    for col in num_cols:
+        if col in plotted:
+            descriptors += [("hist", col), ("box", col)]
+    for col in cat_cols:
+        if col in plotted:
+            descriptors.append(("count", col))
+            if n_unique[col] <= PIE_MAX_CATEGORIES:
+                descriptors.append(("pie", col))
+    if len([c for c in num_cols if c != target]) > 1:
+        descriptors.append(("heatmap", target if target in num_cols else None))
+    return descriptors, skipped
+
+
+def plot_key(kind, column):
+    return "correlation_heatmap" if kind == "heatmap" else f"{kind}_{column}"
+
+
+def plot_payload(df, kind, column, value_counts=None, correlations=None):
+    """
+    Extract the minimal data `render_plot` needs for one plot. The heatmap
+    reuses the matrix of a correlation_summary result (`correlations`) when
+    given; otherwise it is computed from `df` without the `column` it
+    excludes.
+    """
+    if kind in ("hist", "box"):
+        return df[column].dropna().to_numpy()
+    if kind in ("count", "pie"):
+        counts = value_counts[column] if value_counts and column in value_counts else df[column].value_counts()
+        return counts.iloc[:COUNT_TOP_N] if kind == "count" else counts
+    if kind == "heatmap":
+        from correlation import heatmap_frame
+        if correlations and correlations.get("heatmap_matrix") is not None:
+            return heatmap_frame(None, columns=correlations["heatmap_columns"], matrix=correlations["heatmap_matrix"],
+                                 n_columns_total=correlations.get("n_numeric"))
+        return heatmap_frame(df, exclude=column)
+    raise ValueError(f"Unknown plot kind '{kind}'")
+
+
+def get_or_render_plot(df, kind, column, dataset_key=None, cache=None, fmt="png"):
+    """Return one plot's image bytes, rendering and caching it on a miss."""
+    cache = cache or PlotCache()
+    data = cache.get(dataset_key, kind, column, fmt)
+    if data is None:
+        data = render_plot(kind, column, plot_payload(df, kind, column), fmt)
+        cache.put(dataset_key, kind, column, data, fmt)
+    return data
+
+
+def render_plots(df, descriptors, dataset_key=None, cache=None, workers=REPORT_WORKERS, fmt="png",
+                 value_counts=None, correlations=None):
+    """
+    Render plot descriptors, reusing cached images for `dataset_key`. Cache
+    misses are rendered in a process pool when there are enough of them.
+    `correlations` (correlation_summary) supplies the heatmap's matrix.
+
+    Returns {"<kind>_<column>": base64 string}.
+    """
+    cache = cache or PlotCache()
+    results, misses = {}, []
+    for kind, col in descriptors:
+        key = plot_key(kind, col)
+        results[key] = cache.get(dataset_key, kind, col, fmt)
+        if results[key] is None:
+            misses.append((key, (kind, col, plot_payload(df, kind, col, value_counts, correlations), fmt)))
+
+    if misses:
+        if workers > 1 and len(misses) >= PARALLEL_MIN_PLOTS:
+            with ProcessPoolExecutor(max_workers=workers, mp_context=mp.get_context("spawn")) as pool:
+                rendered = list(pool.map(_render_task, [t for _, t in misses], chunksize=4))
+        else:
+            rendered = [_render_task(t) for _, t in misses]
+        for (key, (kind, col, _, _)), data in zip(misses, rendered):
+            cache.put(dataset_key, kind, col, data, fmt)
+            results[key] = data
+
+    return {key: base64.b64encode(data).decode("utf-8") for key, data in results.items()}
@@ -0,0 +1,168 @@
+# run_cache.py
+import os
+import sys
+import json
+import time
+import uuid
+import shutil
+import hashlib
+import threading
+
+import model_formats
+from dataset_store import convert_json_safe
+
+# -----------------------------
+# Defaults
+# -----------------------------
+CACHE_DIR = os.path.join("uploads", "run_cache")
+MAX_CACHE_BYTES = int(os.environ.get("AUTOML_RUN_CACHE_MAX_BYTES", 5 * 1024 ** 3))
+MAX_CACHE_ENTRIES = int(os.environ.get("AUTOML_RUN_CACHE_MAX_ENTRIES", 200))
+CACHE_TTL = float(os.environ.get("AUTOML_RUN_CACHE_TTL", 7 * 24 * 3600))   # seconds
+# Bump when a pipeline change makes earlier results stale
+CACHE_VERSION = 2
+
+
+# Module name -> distribution name; versions come from package metadata so the API can compute
+# cache keys without importing the libraries themselves
+LIBRARIES = {"numpy": "numpy", "pandas": "pandas", "sklearn": "scikit-learn", "xgboost": "xgboost"}
+
+
+def library_versions():
+    from importlib.metadata import version
+    versions = {name: version(dist) for name, dist in LIBRARIES.items()}
+    versions["python"] = "%d.%d.%d" % sys.version_info[:3]
+    return versions
+
+
+def run_key(dataset_id, target, config):
+    """Cache key of a run: dataset content hash, target, pipeline config and library versions."""
+    payload = {"cache_version": CACHE_VERSION, "dataset_id": dataset_id, "target": target,
+               "config": config, "versions": library_versions()}
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()
+
+
+class RunCache:
+    """
+    Finished pipeline results on disk, one directory per run_key.
+
+    An entry holds the result dict (metrics table and report included) plus
+    copies of the model artifact, its manifest and the preprocessor, so a
+    hit can restore exactly the model that run produced into
+    models/<run_id>/ even after that directory was removed. Entries expire after `ttl` seconds;
+    least-recently-used ones are evicted beyond `max_bytes` / `max_entries`.
+    """
+
+    def __init__(self, root=CACHE_DIR, max_bytes=MAX_CACHE_BYTES, max_entries=MAX_CACHE_ENTRIES, ttl=CACHE_TTL):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        os.makedirs(root, exist_ok=True)
+
+    def _dir(self, key):
+        if not key or os.sep in key or key.startswith("."):
+            raise ValueError(f"Invalid cache key '{key}'")
+        return os.path.join(self.root, key)
+
+    def _read_meta(self, key):
+        try:
+            with open(os.path.join(self._dir(key), "meta.json")) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def get(self, key, model_dir, report_dir):
+        """
+        (result, run) cached for `key`, or None. On a hit the cached model
+        files are copied back into `<model_dir>/<run_id>/` and the report into
+        `report_dir`; `run` is the DatasetStore.record_run entry for them.
+        """
+        meta = self._read_meta(key)
+        if meta is None:
+            return None
+        entry = self._dir(key)
+        if time.time() - meta["created_at"] > self.ttl:
+            shutil.rmtree(entry, ignore_errors=True)
+            return None
+        try:
+            with open(os.path.join(entry, "result.json")) as f:
+                result = json.load(f)
+            run_dir = os.path.join(model_dir, result["run_id"])
+            os.makedirs(run_dir, exist_ok=True)
+            for name in meta["model_files"]:
+                tmp = os.path.join(run_dir, f".{name}.{uuid.uuid4().hex}.tmp")
+                shutil.copyfile(os.path.join(entry, name), tmp)
+                os.replace(tmp, os.path.join(run_dir, name))
+        except OSError:
+            return None
+        os.utime(entry)   # last access, for LRU eviction
+
+        result["model_path"] = os.path.join(run_dir, os.path.basename(result["model_path"]))
+        result["preprocessor_path"] = os.path.join(run_dir, os.path.basename(result["preprocessor_path"]))
+        result["report_path"] = os.path.join(report_dir, os.path.basename(result["report_path"]))
+        os.makedirs(report_dir, exist_ok=True)
+        with open(result["report_path"], "w") as f:
+            json.dump(result["report"], f)
+        result["cache"] = {"key": key, "hit": True, "created_at": meta["created_at"],
+                           "age_seconds": time.time() - meta["created_at"]}
+        run = dict(meta["run"], model_path=result["model_path"], preprocessor_path=result["preprocessor_path"],
+                   model_version=os.stat(result["model_path"]).st_mtime_ns)
+        return result, run
+
+    def put(self, key, result, run):
+        """Store a pipeline result, its record_run entry and copies of the model files it points to."""
+        base = os.path.splitext(result["model_path"])[0]
+        files = [result["model_path"], model_formats.manifest_path(base), result["preprocessor_path"]]
+        tmp = self._dir(key) + f".{uuid.uuid4().hex}.tmp"
+        os.makedirs(tmp)
+        try:
+            names = []
+            for path in files:
+                if os.path.exists(path):
+                    shutil.copyfile(path, os.path.join(tmp, os.path.basename(path)))
+                    names.append(os.path.basename(path))
+            with open(os.path.join(tmp, "result.json"), "w") as f:
+                json.dump(convert_json_safe({k: v for k, v in result.items() if k != "cache"}), f)
+            size = sum(os.path.getsize(os.path.join(tmp, n)) for n in os.listdir(tmp))
+            with open(os.path.join(tmp, "meta.json"), "w") as f:
+                json.dump(convert_json_safe({"key": key, "created_at": time.time(), "size_bytes": size,
+                                             "model_files": names, "run": run}), f)
+            with self._lock:
+                shutil.rmtree(self._dir(key), ignore_errors=True)
+                os.rename(tmp, self._dir(key))
+        except OSError:
+            shutil.rmtree(tmp, ignore_errors=True)
+            raise
+        self.evict(keep=(key,))
+
+    def invalidate(self, key):
+        shutil.rmtree(self._dir(key), ignore_errors=True)
+
+    def evict(self, keep=()):
+        """Drop expired entries, then least-recently-used ones until size and count limits hold."""
+        with self._lock:
+            now = time.time()
+            entries = []
+            for name in os.listdir(self.root):
+                meta = self._read_meta(name) if not name.endswith(".tmp") else None
+                if meta is None:
+                    continue
+                if now - meta["created_at"] > self.ttl and name not in keep:
+                    shutil.rmtree(self._dir(name), ignore_errors=True)
+                    continue
+                entries.append((os.stat(self._dir(name)).st_mtime, name, meta.get("size_bytes", 0)))
+            entries.sort()
+            total = sum(e[2] for e in entries)
+            count = len(entries)
+            evicted = []
+            for _, name, size in entries:
+                if total <= self.max_bytes and count <= self.max_entries:
+                    break
+                if name in keep:
+                    continue
+                shutil.rmtree(self._dir(name), ignore_errors=True)
+                total -= size
+                count -= 1
+                evicted.append(name)
+            return evicted
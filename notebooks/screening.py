@@ -0,0 +1,207 @@
+# screening.py
+import os
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from sklearn.base import BaseEstimator, ClassifierMixin, RegressorMixin, clone
+from sklearn.kernel_approximation import Nystroem
+from sklearn.linear_model import LogisticRegression, Ridge
+from sklearn.utils import check_array
+
+from functions import train_candidates
+
+# -----------------------------
+# Defaults
+# -----------------------------
+SCREEN_MAX_ROWS = int(os.environ.get("AUTOML_SCREEN_MAX_ROWS", 100_000))
+# Above this many training rows exact kernel SVMs are replaced by Nystroem approximations
+KERNEL_MAX_ROWS = int(os.environ.get("AUTOML_KERNEL_MAX_ROWS", 50_000))
+SCREEN_TOP_K = int(os.environ.get("AUTOML_SCREEN_TOP_K", 2))   # families refitted on every row
+QUANTILE_BINS = 10
+NYSTROEM_COMPONENTS = 500
+
+# Relative per-row fitting cost; a family is screened on SCREEN_MAX_ROWS / cost rows
+FIT_COST = {
+    "SVC": 10, "SVR": 10,
+    "SVC (Nystroem)": 1, "SVR (Nystroem)": 1,
+    "RandomForest": 1, "XGBoost": 1,
+    "LogisticRegression": 0.5, "LinearRegression": 0.25,
+}
+
+
+def _as_float(X):
+    return check_array(X, accept_sparse="csr", dtype=np.float64)
+
+
+def _rbf_gamma(gamma, X):
+    if gamma == "scale":
+        var = X.multiply(X).mean() - X.mean() ** 2 if sparse.issparse(X) else X.var()
+        return 1.0 / (X.shape[1] * var) if var > 0 else 1.0
+    if gamma == "auto":
+        return 1.0 / X.shape[1]
+    return gamma
+
+
+class NystroemSVC(ClassifierMixin, BaseEstimator):
+    """
+    RBF-kernel classifier for large training sets: a Nystroem feature map
+    followed by a linear model, linear instead of quadratic in the rows.
+    """
+
+    def __init__(self, C=1.0, gamma="scale", n_components=NYSTROEM_COMPONENTS, class_weight=None,
+                 random_state=42):
+        self.C = C
+        self.gamma = gamma
+        self.n_components = n_components
+        self.class_weight = class_weight
+        self.random_state = random_state
+
+    def fit(self, X, y, sample_weight=None):
+        X = _as_float(X)
+        self.feature_map_ = Nystroem(gamma=_rbf_gamma(self.gamma, X), random_state=self.random_state,
+                                     n_components=min(self.n_components, X.shape[0])).fit(X)
+        self.linear_ = LogisticRegression(C=self.C, class_weight=self.class_weight, max_iter=500)
+        self.linear_.fit(self.feature_map_.transform(X), y, sample_weight=sample_weight)
+        self.classes_ = self.linear_.classes_
+        return self
+
+    def predict_proba(self, X):
+        return self.linear_.predict_proba(self.feature_map_.transform(_as_float(X)))
+
+    def predict(self, X):
+        return self.linear_.predict(self.feature_map_.transform(_as_float(X)))
+
+
+class NystroemSVR(RegressorMixin, BaseEstimator):
+    """Regression counterpart of NystroemSVC (Nystroem features + ridge, alpha = 1 / 2C)."""
+
+    def __init__(self, C=1.0, gamma="scale", n_components=NYSTROEM_COMPONENTS, random_state=42):
+        self.C = C
+        self.gamma = gamma
+        self.n_components = n_components
+        self.random_state = random_state
+
+    def fit(self, X, y, sample_weight=None):
+        X = _as_float(X)
+        self.feature_map_ = Nystroem(gamma=_rbf_gamma(self.gamma, X), random_state=self.random_state,
+                                     n_components=min(self.n_components, X.shape[0])).fit(X)
+        self.linear_ = Ridge(alpha=1.0 / (2 * self.C))
+        self.linear_.fit(self.feature_map_.transform(X), y, sample_weight=sample_weight)
+        return self
+
+    def predict(self, X):
+        return self.linear_.predict(self.feature_map_.transform(_as_float(X)))
+
+
+def approximate_kernel_model(model):
+    """Nystroem stand-in for an rbf SVC / SVR with the same C and gamma, or None."""
+    params = model.get_params()
+    if params.get("kernel") not in ("rbf", None):
+        return None
+    if type(model).__name__ == "SVC":
+        return NystroemSVC(C=params["C"], gamma=params["gamma"])
+    if type(model).__name__ == "SVR":
+        return NystroemSVR(C=params["C"], gamma=params["gamma"])
+    return None
+
+
+def stratified_order(y, problem_type="classification", n_bins=QUANTILE_BINS, random_state=42):
+    """
+    Permutation of the row positions of y in which every prefix is a
+    stratified sample: by class, or for regression by target quantile bin.
+    Rows of a stratum are spread evenly over the ordering, so the first m
+    rows hold about m * share of every stratum.
+    """
+    y = np.asarray(y)
+    if problem_type == "classification":
+        strata = y
+    else:
+        strata = pd.qcut(y, q=n_bins, labels=False, duplicates="drop")
+    _, inv, counts = np.unique(strata, return_inverse=True, return_counts=True)
+    rng = np.random.default_rng(random_state)
+    perm = rng.permutation(len(y))
+    perm = perm[np.argsort(inv[perm], kind="stable")]   # grouped by stratum, shuffled within
+    starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+    rank = np.empty(len(y))
+    rank[perm] = np.arange(len(y)) - starts[inv[perm]]
+    key = (rank + rng.random(len(y))) / counts[inv]
+    return np.argsort(key, kind="stable")
+
+
+def screening_rows(name, n_rows, max_rows=SCREEN_MAX_ROWS):
+    """Rows a family is screened on: SCREEN_MAX_ROWS scaled down by its FIT_COST."""
+    return int(min(n_rows, max(1, max_rows / FIT_COST.get(name, 1))))
+
+
+def screen_candidates(candidates, X_train, X_test, y_train, y_test, problem_type,
+                      n_jobs=1, timeout=None, max_rows=SCREEN_MAX_ROWS,
+                      kernel_max_rows=KERNEL_MAX_ROWS, top_k=SCREEN_TOP_K, random_state=42, fit_log=None,
+                      on_result=None):
+    """
+    train_candidates on stratified subsamples, then refit the best families on all rows.
+
+    Each candidate is fitted on the first screening_rows() rows of
+    stratified_order(y_train) (so smaller samples are nested in larger
+    ones) and scored on the full test set. With more than `kernel_max_rows`
+    training rows, rbf SVC / SVR are replaced by their Nystroem
+    approximation ("<name> (Nystroem)"). The `top_k` best screened
+    candidates that saw only a sample are refitted on every training row;
+    their full-data scores and models replace the screening ones.
+
+    Returns (metrics_list, scores_list, models_list, names_list, summary),
+    the first four as from train_candidates; every metrics entry carries
+    its "Train_Rows". `fit_log` and `on_result` are passed on to both
+    train_candidates calls; refit results reach `on_result` as "<name> (full data)".
+    """
+    n_rows = len(y_train)
+    screened, approximated = {}, []
+    for name, model in candidates.items():
+        approx = approximate_kernel_model(model) if n_rows > kernel_max_rows else None
+        if approx is not None:
+            name = f"{name} (Nystroem)"
+            approximated.append(name)
+            model = approx
+        screened[name] = model
+
+    sizes = {name: screening_rows(name, n_rows, max_rows) for name in screened}
+    order = stratified_order(y_train, problem_type, random_state=random_state) \
+        if any(size < n_rows for size in sizes.values()) else None
+    train_rows = {name: np.sort(order[:size]) for name, size in sizes.items() if size < n_rows}
+
+    metrics_list, scores_list, models_list, names_list = train_candidates(
+        screened, X_train, X_test, y_train, y_test, problem_type,
+        n_jobs=n_jobs, timeout=timeout, train_rows=train_rows, fit_log=fit_log, on_result=on_result
+    )
+    for entry in metrics_list:
+        entry["Train_Rows"] = sizes[entry["Model"]]
+
+    # Refit the best families that were only screened on a sample
+    ranked = sorted(range(len(names_list)), key=lambda i: scores_list[i], reverse=True)[:top_k]
+    refit = {names_list[i]: clone(screened[names_list[i]]) for i in ranked if names_list[i] in train_rows}
+    refitted = []
+    if refit:
+        try:
+            r_metrics, r_scores, r_models, r_names = train_candidates(
+                refit, X_train, X_test, y_train, y_test, problem_type, n_jobs=n_jobs, timeout=timeout,
+                fit_log=fit_log,
+                on_result=on_result and (lambda e: on_result(dict(e, Model=f"{e['Model']} (full data)")))
+            )
+        except RuntimeError:
+            r_metrics, r_scores, r_models, r_names = [], [], [], []
+        for entry in [m for m in r_metrics if m["Status"] != "ok"]:
+            metrics_list.append(dict(entry, Model=f"{entry['Model']} (full data)", Train_Rows=n_rows))
+        for metrics, score, model, name in zip([m for m in r_metrics if m["Status"] == "ok"],
+                                               r_scores, r_models, r_names):
+            metrics_list.append(dict(metrics, Model=f"{name} (full data)", Train_Rows=n_rows))
+            i = names_list.index(name)
+            scores_list[i], models_list[i] = score, model
+            refitted.append(name)
+
+    summary = {
+        "train_rows": n_rows,
+        "stratify": "class" if problem_type == "classification" else "target_quantile",
+        "sample_rows": sizes,
+        "kernel_approximated": approximated,
+        "refit_full_data": refitted,
+    }
+    return metrics_list, scores_list, models_list, names_list, summary
@@ -0,0 +1,247 @@
+# search.py
+import math
+import time
+import numpy as np
+from scipy import sparse
+from sklearn.base import clone
+from sklearn.model_selection import ParameterSampler, train_test_split
+from sklearn.metrics import f1_score, r2_score
+
+from functions import get_candidate_models, get_param_distributions
+from profiling import measure
+
+# -----------------------------
+# Defaults
+# -----------------------------
+ETA = 3                    # keep the best 1/ETA configurations at every rung
+MIN_RESOURCE = 1 / 9       # smallest data fraction a configuration is trained on
+MIN_RUNG_ROWS = 200
+EARLY_STOPPING_ROUNDS = 10
+
+
+class SearchBudget:
+    """Total wall-clock (seconds) and/or fit-count budget shared by a whole search."""
+
+    def __init__(self, time_budget=None, max_fits=None):
+        self.time_budget = time_budget
+        self.max_fits = max_fits
+        self.started = time.monotonic()
+        self.fits = 0
+
+    def exhausted(self):
+        if self.max_fits is not None and self.fits >= self.max_fits:
+            return True
+        if self.time_budget is not None and time.monotonic() - self.started >= self.time_budget:
+            return True
+        return False
+
+    def elapsed(self):
+        return time.monotonic() - self.started
+
+
+def sample_configs(problem_type, n_configs, random_state=42):
+    """
+    Draw `n_configs` (family, params) pairs spread evenly over the model
+    families of get_param_distributions. Families without hyperparameters
+    contribute a single configuration.
+    """
+    distributions, _ = get_param_distributions(problem_type)
+    families = list(get_candidate_models(problem_type))
+    per_family = max(1, math.ceil(n_configs / len(families)))
+    configs = []
+    for i, family in enumerate(families):
+        dist = distributions.get(family) or {}
+        if not dist:
+            configs.append((family, {}))
+            continue
+        for params in ParameterSampler(dist, n_iter=per_family, random_state=random_state + i):
+            configs.append((family, params))
+    return configs
+
+
+def _build_estimator(problem_type, family, params, fraction, for_search=True):
+    """Estimator for one configuration at a given resource fraction."""
+    model = clone(get_candidate_models(problem_type)[family]).set_params(**params)
+    if for_search and family == "SVC":
+        # Platt scaling costs an internal 5-fold CV and isn't needed for the F1 score
+        model.set_params(probability=False)
+    if family == "XGBoost":
+        # Boosting rounds scale with the rung's resource; early stopping trims the rest
+        max_rounds = params.get("n_estimators", model.get_params()["n_estimators"])
+        model.set_params(n_estimators=max(10, int(math.ceil(max_rounds * fraction))))
+        if for_search:
+            model.set_params(early_stopping_rounds=EARLY_STOPPING_ROUNDS)
+    if problem_type == "classification" and "class_weight" in model.get_params():
+        model.set_params(class_weight="balanced")
+    return model
+
+
+def _fit_score(model, family, X_tr, y_tr, X_val, y_val, problem_type):
+    fit_kwargs = {}
+    if family == "XGBoost":
+        fit_kwargs = {"eval_set": [(X_val, y_val)], "verbose": False}
+    model.fit(X_tr, y_tr, **fit_kwargs)
+    y_pred = model.predict(X_val)
+    if problem_type == "classification":
+        return f1_score(y_val, y_pred, average="weighted", zero_division=0)
+    return r2_score(y_val, y_pred)
+
+
+def _as_matrix(X):
+    """X as an ndarray, or as CSR when it is sparse (PreprocessingPipeline encoding="auto")."""
+    return X.tocsr() if sparse.issparse(X) else np.asarray(X)
+
+
+def successive_halving(configs, X, y, problem_type, budget, eta=ETA, min_resource=MIN_RESOURCE,
+                       validation_size=0.2, random_state=42, rungs_log=None, bracket=0, fit_log=None,
+                       on_result=None):
+    """
+    Successive halving over data subsamples.
+
+    All configurations are fitted on a `min_resource` fraction of the
+    training rows and scored on a fixed validation split; the best 1/eta
+    survive to the next rung with eta times more data, until one remains or
+    the full training set is reached. XGBoost additionally gets
+    proportionally more boosting rounds and early stopping on the
+    validation split.
+
+    Returns (survivors, rungs) where survivors is a list of
+    (score, config_id, family, params) from the last completed rung.
+    `fit_log` (a list) gets the profiling.measure stats of every fit;
+    `on_result` is called with every evaluated entry (plus "bracket" and
+    "n_rows") as soon as it is scored.
+    """
+    stratify = y if problem_type == "classification" else None
+    try:
+        X_tr, X_val, y_tr, y_val = train_test_split(X, y, test_size=validation_size,
+                                                    random_state=random_state, stratify=stratify)
+    except ValueError:
+        X_tr, X_val, y_tr, y_val = train_test_split(X, y, test_size=validation_size,
+                                                    random_state=random_state)
+    X_tr, y_tr = _as_matrix(X_tr), np.asarray(y_tr)
+    X_val, y_val = _as_matrix(X_val), np.asarray(y_val)
+    n_train = X_tr.shape[0]
+
+    rng = np.random.default_rng(random_state)
+    order = rng.permutation(n_train)
+    rungs = [] if rungs_log is None else rungs_log
+    alive = [(None, cid, family, params) for cid, (family, params) in configs]
+    fraction = min_resource
+    survivors = alive
+
+    while alive and not budget.exhausted():
+        n_rows = min(n_train, max(MIN_RUNG_ROWS, int(n_train * fraction)))
+        idx = order[:n_rows]
+        scored = []
+        for _, cid, family, params in alive:
+            if budget.exhausted():
+                break
+            model = _build_estimator(problem_type, family, params, fraction)
+            with measure() as stats:
+                try:
+                    score = _fit_score(model, family, X_tr[idx], y_tr[idx], X_val, y_val, problem_type)
+                except Exception as e:
+                    score, error = -np.inf, f"{type(e).__name__}: {e}"
+                else:
+                    error = None
+            budget.fits += 1
+            if fit_log is not None:
+                fit_log.append(dict(stats, model=family, config_id=cid, bracket=bracket, rows=int(n_rows),
+                                    status="ok" if error is None else "failed"))
+            entry = {"config_id": cid, "model": family, "params": params, "score": score,
+                     "fit_seconds": round(stats["wall_s"], 3)}
+            if family == "XGBoost" and getattr(model, "best_iteration", None) is not None:
+                entry["best_iteration"] = int(model.best_iteration)
+            if error:
+                entry["error"] = error
+            scored.append((score, cid, family, params, entry))
+            if on_result is not None:
+                on_result(dict(entry, bracket=bracket, n_rows=int(n_rows)))
+
+        if not scored:
+            break
+        scored.sort(key=lambda s: s[0], reverse=True)
+        n_keep = 1 if n_rows >= n_train else max(1, len(scored) // eta)
+        kept, pruned = scored[:n_keep], scored[n_keep:]
+        rungs.append({
+            "bracket": bracket,
+            "rung": len([r for r in rungs if r["bracket"] == bracket]),
+            "n_rows": int(n_rows),
+            "evaluated": [s[4] for s in scored],
+            "pruned": [s[1] for s in pruned],
+            "not_evaluated": [cid for _, cid, _, _ in alive[len(scored):]],
+        })
+        survivors = [(s[0], s[1], s[2], s[3]) for s in kept]
+        if n_rows >= n_train or len(survivors) == 1:
+            break
+        alive = survivors
+        fraction *= eta
+
+    return survivors, rungs
+
+
+def hyperband_search(X, y, problem_type, time_budget=None, max_fits=None, eta=ETA,
+                     n_configs=27, min_resource=MIN_RESOURCE, random_state=42, refit=True, fit_log=None,
+                     on_result=None):
+    """
+    Budgeted model search over (model family, hyperparameters).
+
+    Runs Hyperband: several successive-halving brackets trading the number of
+    configurations against the starting data fraction, all drawing from one
+    SearchBudget (`time_budget` seconds and/or `max_fits` fits). The winning
+    configuration is refitted on all of X, y unless `refit=False`.
+    `fit_log` and `on_result` are passed on to successive_halving.
+
+    Returns (best_model, best_family, best_score, search_report).
+    """
+    budget = SearchBudget(time_budget, max_fits)
+    s_max = max(0, int(round(math.log(1 / min_resource, eta))))
+    rungs, finalists = [], []
+    next_id = 0
+
+    for s in range(s_max, -1, -1):
+        if budget.exhausted():
+            break
+        # Standard Hyperband allocation, scaled so the most exploratory bracket gets n_configs
+        n = max(1, int(math.ceil(n_configs / eta ** s_max * (s_max + 1) / (s + 1) * eta ** s)))
+        configs = sample_configs(problem_type, n, random_state=random_state + s)
+        configs = [(next_id + i, c) for i, c in enumerate(configs)]
+        next_id += len(configs)
+        survivors, _ = successive_halving(
+            configs, X, y, problem_type, budget, eta=eta, min_resource=eta ** -s,
+            random_state=random_state, rungs_log=rungs, bracket=s_max - s, fit_log=fit_log,
+            on_result=on_result,
+        )
+        finalists.extend(survivors)
+
+    finalists = [f for f in finalists if f[0] is not None and np.isfinite(f[0])]
+    if not finalists:
+        raise RuntimeError("Search budget exhausted before any configuration was evaluated.")
+
+    best_score, best_id, best_family, best_params = max(finalists, key=lambda f: f[0])
+    best_model = _build_estimator(problem_type, best_family, best_params, 1.0, for_search=False)
+    best_iters = [e.get("best_iteration") for r in rungs for e in r["evaluated"]
+                  if e["config_id"] == best_id and e.get("best_iteration") is not None]
+    if best_family == "XGBoost" and best_iters:
+        best_model.set_params(n_estimators=best_iters[-1] + 1)
+    if refit:
+        best_model.fit(_as_matrix(X), np.asarray(y))
+
+    # Best validation score reached by each family, for the leaderboard
+    family_best = {}
+    for r in rungs:
+        for e in r["evaluated"]:
+            if np.isfinite(e["score"]) and e["score"] > family_best.get(e["model"], (-np.inf,))[0]:
+                family_best[e["model"]] = (e["score"], e["params"], r["n_rows"])
+
+    report = {
+        "mode": "hyperband",
+        "eta": eta,
+        "fits": budget.fits,
+        "elapsed_seconds": round(budget.elapsed(), 3),
+        "budget_exhausted": budget.exhausted(),
+        "best": {"config_id": best_id, "model": best_family, "params": best_params, "score": best_score},
+        "family_best": {k: {"score": v[0], "params": v[1], "n_rows": v[2]} for k, v in family_best.items()},
+        "rungs": rungs,
+    }
+    return best_model, best_family, best_score, report
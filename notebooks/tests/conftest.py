@@ -0,0 +1,46 @@
+# conftest.py
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# The backend modules import each other by bare name (run from notebooks/)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    """Empty working directory: the store, models, reports and run cache use relative paths."""
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+@pytest.fixture
+def dataset_csv(workdir):
+    """Small binary-classification CSV (numeric signal, one categorical column, target "label")."""
+    rng = np.random.default_rng(0)
+    n = 300
+    df = pd.DataFrame({"a": rng.normal(size=n), "b": rng.normal(size=n), "c": rng.choice(["x", "y", "z"], n)})
+    df["label"] = np.where(df["a"] + rng.normal(scale=0.5, size=n) > 0, "yes", "no")
+    path = workdir / "data.csv"
+    df.to_csv(path, index=False)
+    return str(path)
+
+
+@pytest.fixture
+def trained_run(dataset_csv):
+    """Result of one full (uncached) pipeline run on dataset_csv."""
+    from pipeline import run_automl_pipeline
+    return run_automl_pipeline(dataset_csv, "label", use_cache=False, incremental=False)
+
+
+@pytest.fixture
+def client(workdir):
+    """TestClient for the API; the app's directories are created relative to workdir."""
+    from fastapi.testclient import TestClient
+    import main
+    for path in (main.UPLOAD_DIR, main.MODEL_DIR, main.REPORT_DIR):
+        os.makedirs(path, exist_ok=True)
+    return TestClient(main.app)
@@ -0,0 +1,38 @@
+# test_benchmarks.py
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks"))
+
+from datasets import make_dataset  # noqa: E402
+import bench_pipeline  # noqa: E402
+
+
+def test_synthetic_dataset_has_the_requested_shape():
+    df = make_dataset(4000, n_numeric=3, n_categorical=2, cardinality=7, missing_rate=0.1, n_classes=3)
+    assert list(df.columns) == ["num_0", "num_1", "num_2", "cat_0", "cat_1", "target"]
+    assert df["cat_0"].nunique() == 7
+    assert df.drop(columns="target").isna().mean().mean() == pytest.approx(0.1, abs=0.02)
+    assert df["target"].value_counts(normalize=True).min() > 0.3
+    assert make_dataset(100, problem_type="regression")["target"].dtype.kind == "f"
+
+
+def test_pipeline_benchmark_measures_every_stage(workdir):
+    grid = {"rows": [300], "n_numeric": [3], "n_categorical": [1]}
+    report = bench_pipeline.run(grid, memory=False, full_run=False, tune_iter=2, output="bench.json")
+    assert [r["function"] for r in report["results"]] == bench_pipeline.STAGE_ORDER
+    assert all(r["wall_s"] >= 0 and r["case"] == {"rows": 300, "n_numeric": 3, "n_categorical": 1}
+               for r in report["results"])
+    with open("bench.json") as f:
+        assert json.load(f)["results"] == report["results"]
+
+
+def test_compare_flags_only_meaningful_slowdowns():
+    def result(fn, wall):
+        return {"case_key": "rows=10", "function": fn, "wall_s": wall}
+    baseline = {"results": [result("a", 1.0), result("b", 1.0), result("c", 0.01)]}
+    regressions = bench_pipeline.compare([result("a", 1.2), result("b", 2.0), result("c", 0.04)], baseline)
+    assert [(r["function"], r["ratio"]) for r in regressions] == [("b", 2.0)]
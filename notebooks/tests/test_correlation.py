@@ -0,0 +1,47 @@
+# test_correlation.py
+import numpy as np
+import pandas as pd
+
+from correlation import ASSOCIATION_MAX_LEVELS, category_codes, correlation_matrix, correlation_summary
+
+
+def _frame(n=600, levels=300, seed=0):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        "a": rng.normal(size=n),
+        "b": rng.normal(size=n),
+        "id": [f"k{i}" for i in rng.integers(0, levels, n)],
+        "y": rng.integers(0, 2, n),
+    })
+    df["c"] = df["a"] * 2 + rng.normal(scale=0.1, size=n)
+    return df
+
+
+def test_category_codes_keep_the_most_frequent_levels_of_category_dtype():
+    s = _frame()["id"]
+    for values in (s.astype("category"), s.astype(object)):
+        codes, n_levels = category_codes(values)
+        assert n_levels == ASSOCIATION_MAX_LEVELS + 1
+        assert codes.min() >= 0 and codes.max() == n_levels - 1
+        per_code = s.groupby(codes).nunique()
+        assert (per_code.drop(ASSOCIATION_MAX_LEVELS) == 1).all()
+        counts = s.value_counts()
+        kept = s[codes < ASSOCIATION_MAX_LEVELS].unique()
+        assert counts[kept].min() >= counts.drop(kept).max()
+
+
+def test_summary_handles_high_cardinality_category_columns():
+    df = _frame()
+    df["id"] = df["id"].astype("category")
+    summary = correlation_summary(df, ["a", "b", "c"], ["id"], target="y")
+    assert {a["measure"] for a in summary["associations"]} == {"correlation_ratio"}
+
+
+def test_heatmap_matrix_matches_pandas_and_excludes_target():
+    df = _frame()
+    summary = correlation_summary(df, ["a", "b", "c", "y"], [], target="y")
+    cols = summary["heatmap_columns"]
+    assert "y" not in cols
+    expected = df[cols].corr().to_numpy()
+    np.testing.assert_allclose(np.array(summary["heatmap_matrix"], dtype=float), expected, atol=1e-3)
+    np.testing.assert_allclose(correlation_matrix(df, ["a", "c"]).to_numpy(), df[["a", "c"]].corr(), atol=1e-5)
@@ -0,0 +1,74 @@
+# test_dataset_store.py
+import multiprocessing as mp
+import os
+
+import numpy as np
+import pandas as pd
+
+from dataset_store import PIN_PREFIX, DatasetStore
+
+
+def _write(path, n=50, seed=0):
+    rng = np.random.default_rng(seed)
+    pd.DataFrame({"x": rng.normal(size=n), "k": rng.choice(["a", "b"], n)}).to_csv(path, index=False)
+    return str(path)
+
+
+def _record_runs(root, dataset_id, worker, n):
+    # Runs in a spawned process with its own DatasetStore
+    store = DatasetStore(root)
+    for i in range(n):
+        store.record_run(dataset_id, f"t{worker}_{i}", {"run_id": f"{worker}x{i}"})
+        store.touch(dataset_id)
+
+
+def test_identical_uploads_share_one_dataset(tmp_path):
+    store = DatasetStore(str(tmp_path / "store"))
+    first = store.add_file(_write(tmp_path / "a.csv"))
+    second = store.add_file(_write(tmp_path / "b.csv"))
+    assert first["dataset_id"] == second["dataset_id"]
+    assert not first["deduplicated"] and second["deduplicated"]
+    assert not os.path.exists(tmp_path / "b.csv")
+    source = pd.read_csv(store.source_path(first["dataset_id"]))
+    pd.testing.assert_frame_equal(store.load(first["dataset_id"]), source, check_dtype=False,
+                                  check_categorical=False, atol=1e-6)
+
+
+def test_deferred_conversion_fills_in_meta_on_first_load(tmp_path):
+    store = DatasetStore(str(tmp_path / "store"))
+    meta = store.add_file(_write(tmp_path / "a.csv"), convert=False)
+    assert meta["rows"] is None and meta["format"] is None
+    assert len(store.load(meta["dataset_id"])) == 50
+    meta = store.get_meta(meta["dataset_id"])
+    assert meta["rows"] == 50 and set(meta["schema"]) == {"x", "k"}
+
+
+def test_concurrent_meta_updates_are_not_lost(tmp_path):
+    root = str(tmp_path / "store")
+    dataset_id = DatasetStore(root).add_file(_write(tmp_path / "a.csv"))["dataset_id"]
+    ctx = mp.get_context("spawn")
+    workers = [ctx.Process(target=_record_runs, args=(root, dataset_id, w, 20)) for w in range(3)]
+    for p in workers:
+        p.start()
+    for p in workers:
+        p.join(60)
+    assert [p.exitcode for p in workers] == [0, 0, 0]
+    assert len(DatasetStore(root).get_meta(dataset_id)["runs"]) == 60
+    assert not [name for name in os.listdir(os.path.join(root, dataset_id)) if name.endswith(".tmp")]
+
+
+def test_eviction_skips_pinned_datasets_and_clears_stale_pins(tmp_path):
+    store = DatasetStore(str(tmp_path / "store"), max_entries=1)
+    old = store.add_file(_write(tmp_path / "a.csv", seed=1))["dataset_id"]
+    with store.in_use(old):
+        new = store.add_file(_write(tmp_path / "b.csv", seed=2))["dataset_id"]
+        assert store.exists(old) and store.exists(new)
+    assert not [n for n in os.listdir(os.path.join(store.root, old)) if n.startswith(PIN_PREFIX)]
+
+    # A pin left behind by a process that died does not protect the dataset
+    dead = mp.get_context("spawn").Process(target=len, args=((),))
+    dead.start()
+    dead.join()
+    open(os.path.join(store.root, old, f"{PIN_PREFIX}{dead.pid}.x"), "w").close()
+    assert store.evict() == [old]
+    assert not store.exists(old) and store.exists(new)
@@ -0,0 +1,53 @@
+# test_eda_stats.py
+import numpy as np
+import pandas as pd
+import pytest
+
+from eda_stats import OTHER_BUCKET, compute_eda_stats
+
+
+def _frame(n=5000, seed=0):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        "x": rng.normal(10, 3, n),
+        "y": rng.exponential(2, n),
+        "c": rng.choice(list("abcdefghij"), n, p=np.linspace(1, 10, 10) / 55),
+    })
+    df.loc[::7, "x"] = np.nan
+    df.loc[::11, "c"] = None
+    return df
+
+
+def test_chunked_stats_match_pandas_exactly_below_the_sample_size():
+    df = _frame()
+    acc = compute_eda_stats(df, chunksize=700)
+    assert acc.n_rows == len(df) and not acc.approximate
+    stats = acc.numeric_summary()
+    for col in ("x", "y"):
+        s = df[col]
+        assert stats[col]["count"] == s.count() and stats[col]["nulls"] == s.isna().sum()
+        assert stats[col]["mean"] == pytest.approx(s.mean())
+        assert stats[col]["std"] == pytest.approx(s.std())
+        assert stats[col]["min"] == s.min() and stats[col]["max"] == s.max()
+        assert stats[col]["median"] == pytest.approx(s.median())
+        assert stats[col]["q1"] == pytest.approx(s.quantile(0.25))
+    assert acc.missing_values() == df.isna().sum().to_dict()
+
+
+def test_large_data_uses_a_row_sample_for_quantiles():
+    df = _frame(n=20000)
+    acc = compute_eda_stats(df, chunksize=3000, exact_max_rows=2000)
+    assert acc.approximate and acc.result()["sample_rows"] == 2000
+    stats = acc.numeric_summary()["y"]
+    assert stats["mean"] == pytest.approx(df["y"].mean())    # moments stay exact
+    assert stats["median"] == pytest.approx(df["y"].median(), rel=0.1)
+
+
+def test_category_counts_are_pruned_into_other():
+    df = _frame()
+    acc = compute_eda_stats(df, chunksize=1000, top_k=3, max_tracked=5)
+    counts = acc.categorical_summary()["c"]
+    expected = df["c"].value_counts()
+    assert list(counts)[:3] == list(expected.index[:3])
+    assert [counts[k] for k in expected.index[:3]] == list(expected.iloc[:3])
+    assert sum(counts.values()) == df["c"].count() and counts[OTHER_BUCKET] > 0
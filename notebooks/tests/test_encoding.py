@@ -0,0 +1,61 @@
+# test_encoding.py
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.model_selection import KFold
+
+from functions import detect_problem_type
+from preprocessing import PreprocessingPipeline, TargetEncoder
+
+
+def _high_cardinality(n=300, levels=40, seed=0):
+    rng = np.random.default_rng(seed)
+    codes = rng.integers(0, levels, n)
+    X = pd.DataFrame({"x": rng.normal(size=n), "id": [f"k{c:02d}" for c in codes]})
+    y = codes / levels + rng.normal(scale=0.1, size=n)
+    return X, y
+
+
+def test_target_encoding_is_out_of_fold_on_training_rows():
+    X, y = _high_cardinality()
+    pipe = PreprocessingPipeline(encoding="auto", target_type="regression", onehot_max_categories=4, scale=False)
+    out = pipe.fit_transform(X, y)
+    te = out["id__te"].to_numpy() * pipe.enc_std_[1] + pipe.enc_mean_[1]
+
+    codes = pipe.classes_[0].get_indexer(X["id"])
+    prior, m = y.mean(), pipe.te_smoothing
+    expected = np.empty(len(y))
+    for fit_rows, enc_rows in KFold(pipe.te_folds, shuffle=True, random_state=pipe.random_state).split(codes):
+        sums = np.bincount(codes[fit_rows], weights=y[fit_rows], minlength=len(pipe.classes_[0]))
+        counts = np.bincount(codes[fit_rows], minlength=len(pipe.classes_[0]))
+        expected[enc_rows] = ((sums + m * prior) / (counts + m))[codes[enc_rows]]
+    np.testing.assert_allclose(te, expected)
+
+
+def test_target_encoding_of_new_rows_uses_all_training_rows():
+    X, y = _high_cardinality()
+    pipe = PreprocessingPipeline(encoding="auto", target_type="regression", onehot_max_categories=4, scale=False)
+    pipe.fit_transform(X, y)
+    out = pipe.transform(X.iloc[:20])
+    te = out["id__te"].to_numpy() * pipe.enc_std_[1] + pipe.enc_mean_[1]
+
+    codes = pipe.classes_[0].get_indexer(X["id"])
+    n_levels = len(pipe.classes_[0])
+    full = (np.bincount(codes, weights=y, minlength=n_levels) + pipe.te_smoothing * y.mean()) \
+        / (np.bincount(codes, minlength=n_levels) + pipe.te_smoothing)
+    np.testing.assert_allclose(te, full[codes[:20]])
+
+
+@pytest.mark.parametrize("dtype", [object, "str", "category"])
+def test_target_encoder_encodes_every_string_dtype(dtype):
+    y = pd.Series(["class_1", "class_0", "class_1", "class_2"], dtype=dtype)
+    encoder = TargetEncoder().fit(y)
+    assert detect_problem_type(y) == "classification"
+    np.testing.assert_array_equal(encoder.transform(y), [1, 0, 1, 2])
+    assert list(encoder.inverse_transform([2, 0])) == ["class_2", "class_0"]
+
+
+def test_target_encoder_passes_numeric_targets_through():
+    y = pd.Series([0.5, 1.5, 2.5])
+    assert TargetEncoder().fit(y).classes_ is None
+    np.testing.assert_array_equal(TargetEncoder(encode_numeric=True).fit(y).transform(y), [0, 1, 2])
@@ -0,0 +1,84 @@
+# test_events.py
+import asyncio
+import json
+import time
+
+import pytest
+
+from events import EventLog
+from jobs import JobManager
+
+
+def _chatty(progress, on_event, n_events=200):
+    # Runs in a pool process; every event is put on the queue right before the job returns
+    progress("train_candidates")
+    for i in range(n_events):
+        on_event({"type": "candidate", "completed": i + 1, "total": n_events,
+                  "result": {"Model": f"m{i}", "Score": i / n_events}})
+    return {"best_model": f"m{n_events - 1}"}
+
+
+def _parse(stream):
+    """(event type, data) of each message of a Server-Sent Events body, comments skipped."""
+    messages = []
+    for block in stream.strip().split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in block.splitlines() if not line.startswith(":"))
+        if fields:
+            messages.append((fields["event"], json.loads(fields["data"])))
+    return messages
+
+
+async def _collect(log, since=None):
+    return "".join([chunk async for chunk in log.stream(since, heartbeat=0.05)])
+
+
+def test_event_log_tracks_state_and_resyncs_lagging_readers():
+    log = EventLog("job", max_events=3)
+    log.append({"type": "stage", "stage": "train_candidates", "status": "started", "index": 4})
+    for i, score in enumerate([0.5, 0.9, 0.7]):
+        log.append({"type": "candidate", "completed": i + 1, "total": 4, "result": {"Model": f"m{i}", "Score": score}})
+
+    state = log.snapshot()
+    assert state["status"] == "running" and state["fraction"] == 0.75
+    assert [e["Model"] for e in state["leaderboard"]] == ["m1", "m2", "m0"]
+    events, missed = log.since(0)
+    assert [e["seq"] for e in events] == [2, 3, 4] and missed
+    assert log.since(1) == (events, False)
+
+
+def test_stream_replays_from_a_cursor_and_ends_with_the_job():
+    log = EventLog("job")
+    for i in range(3):
+        log.append({"type": "candidate", "completed": i + 1, "total": 3, "result": {"Model": f"m{i}", "Score": i}})
+    log.append({"type": "finished", "status": "succeeded"}, close=True)
+
+    messages = _parse(asyncio.run(_collect(log)))
+    assert messages[0][0] == "snapshot" and messages[0][1]["closed"]
+    resumed = _parse(asyncio.run(_collect(log, since=2)))
+    assert [(kind, data["seq"]) for kind, data in resumed] == [("candidate", 3), ("finished", 4)]
+
+
+@pytest.fixture
+def manager():
+    manager = JobManager(max_workers=1)
+    yield manager
+    manager.shutdown()
+
+
+def test_every_worker_event_arrives_before_finished(manager, client, monkeypatch):
+    import main
+    job_id = manager.submit(target=_chatty)
+    log = manager.events(job_id)
+    deadline = time.time() + 60
+    while not log.closed and time.time() < deadline:
+        time.sleep(0.05)
+
+    events, _ = log.since(0)
+    assert [e["type"] for e in events] == ["queued"] + ["candidate"] * 200 + ["finished"]
+    assert events[-1]["best_model"] == "m199"
+
+    monkeypatch.setattr(main, "job_manager", manager)
+    res = client.get(f"/jobs/{job_id}/events", headers={"Last-Event-ID": "200"})
+    assert res.headers["content-type"].startswith("text/event-stream")
+    assert [kind for kind, _ in _parse(res.text)] == ["candidate", "finished"]
+    assert client.get("/jobs/unknown/events").status_code == 404
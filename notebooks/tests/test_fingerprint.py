@@ -0,0 +1,50 @@
+# test_fingerprint.py
+import numpy as np
+import pandas as pd
+
+from fingerprint import DatasetFingerprint, count_shared, duplicate_mask, row_fingerprints
+
+
+def _frame(n=200, seed=0):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        "a": rng.integers(0, 5, n),
+        "b": rng.choice(["x", "y"], n),
+        "c": rng.integers(0, 4, n) / 2,
+    })
+    return pd.concat([df, df.sample(30, random_state=0)], ignore_index=True)
+
+
+def test_duplicate_mask_matches_drop_duplicates():
+    df = _frame()
+    np.testing.assert_array_equal(duplicate_mask(row_fingerprints(df)), df.duplicated().to_numpy())
+
+
+def test_count_shared_matches_row_membership():
+    df = _frame()
+    train, test = df.iloc[:150], df.iloc[150:]
+    train_rows = set(map(tuple, train.itertuples(index=False)))
+    expected = sum(tuple(row) in train_rows for row in test.itertuples(index=False))
+    assert count_shared(row_fingerprints(test), row_fingerprints(train)) == expected
+    assert count_shared(row_fingerprints(test), []) == 0
+
+
+def test_fingerprints_ignore_downcast_and_nullable_dtypes():
+    df = _frame()
+    downcast = df.astype({"a": "int8", "b": "category", "c": "float32"})
+    nullable = df.astype({"a": "Int64"})
+    expected = row_fingerprints(df)
+    np.testing.assert_array_equal(row_fingerprints(downcast), expected)
+    np.testing.assert_array_equal(row_fingerprints(nullable), expected)
+
+
+def test_dataset_fingerprint_ignores_row_order_and_chunking():
+    df = _frame()
+    whole = DatasetFingerprint(df.columns).update(row_fingerprints(df)).hexdigest()
+    shuffled = df.sample(frac=1.0, random_state=1)
+    chunked = DatasetFingerprint(df.columns)
+    for start in range(0, len(shuffled), 64):
+        chunked.update(row_fingerprints(shuffled.iloc[start:start + 64]))
+    assert chunked.hexdigest() == whole
+    changed = df.assign(c=df["c"] + 1)
+    assert DatasetFingerprint(df.columns).update(row_fingerprints(changed)).hexdigest() != whole
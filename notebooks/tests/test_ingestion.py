@@ -0,0 +1,52 @@
+# test_ingestion.py
+import numpy as np
+import pandas as pd
+import pytest
+
+from ingestion import downcast_frame, iter_csv_chunks, read_csv_optimized
+
+
+def _csv(path, n=1000, seed=0):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        "small_int": rng.integers(0, 100, n),
+        "halves": rng.integers(0, 8, n) / 2,
+        "price": rng.normal(100, 10, n).round(2),
+        "account_id": (rng.integers(10 ** 8, 10 ** 9, n) + 0.5),
+        "city": rng.choice(["paris", "rome", "oslo"], n),
+        "note": [f"free text {i}" for i in range(n)],
+    })
+    df.loc[n - 1, "halves"] = np.nan   # only in the last chunk
+    df.to_csv(path, index=False)
+    return str(path), df
+
+
+@pytest.mark.parametrize("use_pyarrow", [False, True])
+def test_optimized_read_keeps_values_with_compact_dtypes(tmp_path, use_pyarrow):
+    path, expected = _csv(tmp_path / "data.csv")
+    df, report = read_csv_optimized(path, chunksize=300, use_pyarrow=use_pyarrow)
+
+    assert report["parser"] == ("pyarrow" if use_pyarrow else "c")
+    assert report["chunks"] == (1 if use_pyarrow else 4)
+    assert df["small_int"].dtype == np.int8
+    assert df["halves"].dtype == np.float32
+    assert isinstance(df["city"].dtype, pd.CategoricalDtype)
+    assert not isinstance(df["note"].dtype, pd.CategoricalDtype)
+    pd.testing.assert_frame_equal(df.astype({c: object for c in ("city", "note")}),
+                                  expected.astype({c: object for c in ("city", "note")}), check_dtype=False)
+
+
+def test_floats_downcast_only_when_lossless():
+    df = pd.DataFrame({"halves": [0.5, 1.25, np.nan], "price": [19.99, 5.1, 7.0],
+                       "account_id": [123456789.5, 1.0, 2.0]})
+    out = downcast_frame(df)
+    assert out.dtypes.to_dict() == {"halves": np.float32, "price": np.float64, "account_id": np.float64}
+    assert downcast_frame(df, downcast_floats=False)["halves"].dtype == np.float64
+
+
+def test_stream_chunks_share_one_set_of_dtypes(tmp_path):
+    path, _ = _csv(tmp_path / "data.csv")
+    chunks = list(iter_csv_chunks(path, chunksize=300, sample_rows=100))
+    assert len(chunks) == 4 and sum(len(c) for c in chunks) == 1000
+    assert all(c.dtypes.equals(chunks[0].dtypes) for c in chunks)
+    assert chunks[0]["small_int"].dtype == "Int64"
@@ -0,0 +1,84 @@
+# test_jobs.py
+import time
+
+import pytest
+
+from jobs import CANCELLED, FAILED, FINISHED_STATES, SUCCEEDED, JobManager, QueueFullError
+
+
+def _stages(progress, on_event, stages=("load", "split"), delay=0.0, fail=False):
+    # Runs in a pool process: module-level so it can be pickled by name
+    for stage in stages:
+        progress(stage)
+        time.sleep(delay)
+    if fail:
+        raise ValueError("bad target")
+    return {"best_model": "Fake", "stages": list(stages)}
+
+
+def _wait(manager, job_id, timeout=60):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        job = manager.get(job_id)
+        if job["status"] in FINISHED_STATES:
+            return job
+        time.sleep(0.05)
+    raise AssertionError(f"job {job_id} did not finish")
+
+
+@pytest.fixture
+def manager():
+    manager = JobManager(max_workers=1, max_queued=3)
+    yield manager
+    manager.shutdown()
+
+
+def test_jobs_run_in_the_pool_and_report_their_result(manager):
+    ok = manager.submit(target=_stages)
+    bad = manager.submit(target=_stages, fail=True)
+
+    job = _wait(manager, ok)
+    assert job["status"] == SUCCEEDED and job["stage"] == "split"
+    assert job["result"] == {"best_model": "Fake", "stages": ["load", "split"]}
+    job = _wait(manager, bad)
+    assert job["status"] == FAILED and job["error"] == "ValueError: bad target"
+    assert manager.get("unknown") is None
+
+
+def test_queued_jobs_cancel_and_the_queue_is_bounded(manager):
+    running = manager.submit(target=_stages, delay=1.0)
+    next_up = manager.submit(target=_stages)
+    queued = manager.submit(target=_stages)
+    with pytest.raises(QueueFullError):
+        manager.submit(target=_stages)
+
+    # The pool already handed next_up to a worker's call queue: it stops at its first stage instead
+    assert manager.cancel(queued) and manager.cancel(next_up)
+    assert manager.get(queued)["status"] == CANCELLED
+    assert _wait(manager, running)["status"] == SUCCEEDED
+    assert _wait(manager, next_up)["status"] == CANCELLED
+
+
+def test_running_jobs_stop_at_the_next_stage(manager):
+    job_id = manager.submit(target=_stages, stages=("load", "split", "train_candidates"), delay=1.0)
+    deadline = time.time() + 60
+    while manager.get(job_id)["stage"] is None and time.time() < deadline:
+        time.sleep(0.05)
+    manager.cancel(job_id)
+    job = _wait(manager, job_id)
+    assert job["status"] == CANCELLED and job["stage"] != "train_candidates"
+
+
+def test_run_automl_is_queued_and_finishes_as_a_job(dataset_csv, client):
+    import main
+    with open(dataset_csv, "rb") as f:
+        upload = client.post("/upload-dataset/", files={"file": ("data.csv", f, "text/csv")}).json()
+    try:
+        res = client.post("/run-automl/", data={"dataset_id": upload["dataset_id"], "user_target": "label"})
+        assert res.status_code == 202 and res.json()["status"] == "queued"
+        job = _wait(main.job_manager, res.json()["job_id"], timeout=120)
+        assert job["status"] == SUCCEEDED, job["error"]
+        assert client.get(f"/jobs/{job['job_id']}").json()["result"]["run_id"] == job["result"]["run_id"]
+        assert client.get("/jobs/unknown").status_code == 404
+    finally:
+        main.job_manager.shutdown()
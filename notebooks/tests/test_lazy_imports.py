@@ -0,0 +1,31 @@
+# test_lazy_imports.py
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+import warmup
+
+NOTEBOOKS = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ML_STACK = ("scipy", "sklearn", "xgboost", "matplotlib", "seaborn")
+
+
+@pytest.mark.parametrize("module", ["main", "jobs", "pipeline"])
+def test_importing_the_backend_does_not_load_the_ml_stack(module):
+    code = (f"import sys, json; sys.path.insert(0, {NOTEBOOKS!r}); import {module}; "
+            f"print(json.dumps([m for m in {ML_STACK!r} if m in sys.modules]))")
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True, cwd=NOTEBOOKS)
+    assert json.loads(out.stdout.splitlines()[-1]) == []
+
+
+def test_prewarm_imports_what_is_installed():
+    timings = warmup.prewarm(("json", "no_such_module_for_automl"))
+    assert timings["json"] >= 0 and timings["no_such_module_for_automl"] is None
+
+
+@pytest.mark.parametrize("mode, api, workers", [("none", False, False), ("api", True, False),
+                                                ("workers", False, True), ("ALL", True, True)])
+def test_prewarm_modes(mode, api, workers):
+    assert (warmup.prewarms("api", mode), warmup.prewarms("workers", mode)) == (api, workers)
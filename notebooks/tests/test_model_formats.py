@@ -0,0 +1,66 @@
+# test_model_formats.py
+import os
+
+import joblib
+import numpy as np
+import pytest
+from sklearn.datasets import make_classification
+from sklearn.linear_model import LogisticRegression
+from xgboost import XGBClassifier
+
+import model_formats
+
+
+@pytest.fixture(scope="module")
+def data():
+    return make_classification(n_samples=300, n_features=6, random_state=0)
+
+
+@pytest.mark.parametrize("fmt, ext", [("joblib", ".pkl"), ("joblib-mmap", ".joblib"), ("auto", ".joblib")])
+def test_sklearn_models_round_trip(tmp_path, data, fmt, ext):
+    X, y = data
+    model = LogisticRegression().fit(X, y)
+    base = str(tmp_path / "run" / "model")
+    assert model_formats.save(model, base, fmt=fmt) == base + ext
+
+    loaded = model_formats.load(base)
+    np.testing.assert_array_equal(loaded.predict_proba(X), model.predict_proba(X))
+    # Uncompressed joblib keeps the coefficients memory-mapped (read-only) after loading
+    assert isinstance(loaded.coef_, np.memmap) == (ext == ".joblib")
+    assert not isinstance(model_formats.load(base, mmap=False).coef_, np.memmap)
+
+
+def test_xgboost_is_saved_natively(tmp_path, data):
+    X, y = data
+    model = XGBClassifier(n_estimators=20).fit(X, y)
+    base = str(tmp_path / "model")
+    assert model_formats.save(model, base) == base + ".ubj"
+    loaded = model_formats.load(base)
+    assert type(loaded) is XGBClassifier
+    np.testing.assert_allclose(loaded.predict_proba(X), model.predict_proba(X))
+
+
+def test_saving_in_another_format_replaces_the_old_file(tmp_path, data):
+    X, y = data
+    model = LogisticRegression().fit(X, y)
+    base = str(tmp_path / "model")
+    model_formats.save(model, base, fmt="joblib")
+    model_formats.save(model, base, fmt="joblib-mmap")
+    assert sorted(os.listdir(tmp_path)) == ["model.joblib", "model.model.json"]
+    assert model_formats.find(base) == (base + ".joblib", "joblib-mmap")
+
+
+def test_models_saved_before_the_manifest_still_load(tmp_path, data):
+    X, y = data
+    model = LogisticRegression().fit(X, y)
+    base = str(tmp_path / "legacy")
+    joblib.dump(model, base + ".pkl", compress=3)
+    assert model_formats.find(base) == (base + ".pkl", "joblib")
+    np.testing.assert_array_equal(model_formats.load(base).predict(X), model.predict(X))
+    with pytest.raises(FileNotFoundError):
+        model_formats.load(str(tmp_path / "missing"))
+
+
+def test_onnx_export_of_unfitted_models_is_refused(tmp_path):
+    with pytest.raises(model_formats.ONNXExportError, match="not fitted"):
+        model_formats.export_onnx(LogisticRegression(), str(tmp_path / "m.onnx"))
@@ -0,0 +1,60 @@
+# test_out_of_core.py
+import numpy as np
+import pytest
+
+pytest.importorskip("xgboost")
+from sklearn.linear_model import LinearRegression, LogisticRegression
+
+from functions import score_model
+from out_of_core import StreamingMetrics, hash_split
+
+
+def _streamed(model, X, y, problem_type, n_classes=None, chunk=37):
+    scorer = StreamingMetrics(problem_type, n_classes)
+    for start in range(0, len(X), chunk):
+        Xc, yc = X[start:start + chunk], y[start:start + chunk]
+        if problem_type == "classification":
+            proba = model.predict_proba(Xc)
+            scorer.update(yc, proba.argmax(axis=1), proba)
+        else:
+            scorer.update(yc, model.predict(Xc))
+    return scorer.result()
+
+
+@pytest.mark.parametrize("n_classes", [2, 4])
+def test_streaming_classification_metrics_match_score_model(n_classes):
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(500, 5))
+    y = (np.digitize(X[:, 0] + 0.8 * rng.normal(size=500), np.linspace(-1, 1, n_classes - 1))).astype(np.int64)
+    model = LogisticRegression(max_iter=500).fit(X[:300], y[:300])
+
+    expected, expected_score = score_model(model, X[300:], y[300:], "classification")
+    metrics, score = _streamed(model, X[300:], y[300:], "classification", n_classes)
+
+    assert score == pytest.approx(expected_score)
+    for key in ("Accuracy", "F1", "ROC_AUC"):
+        assert metrics[key] == pytest.approx(expected[key]), key
+
+
+def test_streaming_regression_metrics_match_score_model():
+    rng = np.random.default_rng(1)
+    X = rng.normal(size=(400, 3))
+    y = X @ np.array([1.5, -2.0, 0.5]) + rng.normal(size=400)
+    model = LinearRegression().fit(X[:250], y[:250])
+
+    expected, expected_score = score_model(model, X[250:], y[250:], "regression")
+    metrics, score = _streamed(model, X[250:], y[250:], "regression")
+
+    assert score == pytest.approx(expected_score)
+    for key in ("MAE", "RMSE", "R2"):
+        assert metrics[key] == pytest.approx(expected[key]), key
+
+
+def test_hash_split_does_not_depend_on_chunking():
+    import pandas as pd
+    rng = np.random.default_rng(2)
+    df = pd.DataFrame({"a": rng.integers(0, 1000, 1000), "b": rng.normal(size=1000)})
+    whole = hash_split(df)
+    chunked = np.concatenate([hash_split(df.iloc[i:i + 128]) for i in range(0, len(df), 128)])
+    np.testing.assert_array_equal(whole, chunked)
+    assert 0.1 < whole.mean() < 0.3
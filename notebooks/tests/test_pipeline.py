@@ -0,0 +1,38 @@
+# test_pipeline.py
+import json
+import os
+
+import pytest
+
+import functions
+from dataset_store import DatasetStore
+from pipeline import RUN_RECORD_FILE, run_automl_pipeline
+
+
+def test_run_saves_its_artifacts_under_its_run_id(dataset_csv):
+    first = run_automl_pipeline(dataset_csv, "label", use_cache=False, incremental=False)
+    second = run_automl_pipeline(dataset_csv, "label", use_cache=False, incremental=False)
+    assert first["run_id"] != second["run_id"]
+
+    for result in (first, second):
+        run_dir = os.path.join("models", result["run_id"])
+        with open(os.path.join(run_dir, RUN_RECORD_FILE)) as f:
+            record = json.load(f)
+        assert record["run_id"] == result["run_id"] and record["target"] == "label"
+        for key in ("model_path", "preprocessor_path"):
+            assert os.path.dirname(record[key]) == run_dir and os.path.exists(record[key])
+        assert os.path.exists(result["report_path"])
+
+
+def test_failed_report_leaves_no_model_behind(dataset_csv, monkeypatch):
+    def broken(*args, **kwargs):
+        raise RuntimeError("report failed")
+
+    monkeypatch.setattr(functions, "generate_report_json", broken)
+    with pytest.raises(RuntimeError, match="report failed"):
+        run_automl_pipeline(dataset_csv, "label", use_cache=False, incremental=False)
+
+    assert os.listdir("models") == []
+    store = DatasetStore()
+    (dataset_id,) = [d for d in os.listdir(store.root) if store.exists(d)]
+    assert "label" not in store.get_meta(dataset_id).get("runs", {})
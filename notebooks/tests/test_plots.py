@@ -0,0 +1,36 @@
+# test_plots.py
+import pytest
+
+from reporting import plan_plots
+
+
+def test_report_links_plots_that_render_on_demand(trained_run, client):
+    plots = trained_run["report"]["plots"]
+    assert {p["kind"] for p in plots.values()} >= {"hist", "box", "count", "heatmap"}
+    assert all(set(p) == {"kind", "column", "url"} for p in plots.values())
+
+    for plot in plots.values():
+        res = client.get(plot["url"])
+        assert res.status_code == 200 and res.headers["content-type"] == "image/png"
+        assert res.content.startswith(b"\x89PNG")
+        again = client.get(plot["url"], headers={"If-None-Match": res.headers["etag"]})
+        assert again.status_code == 304
+
+
+def test_heatmap_leaves_out_the_target(trained_run, client):
+    assert plan_plots(["a", "b", "y"], [], {}, target="y")[0][-1] == ("heatmap", "y")
+    # A categorical target is not among the heatmap's columns anyway
+    heatmap = trained_run["report"]["plots"]["correlation_heatmap"]
+    assert heatmap["column"] is None
+    svg = client.get(heatmap["url"] + "&format=svg")
+    assert svg.status_code == 200 and svg.headers["content-type"] == "image/svg+xml"
+
+
+@pytest.mark.parametrize("query, status", [
+    ("kind=hist&column=nope", 404),
+    ("kind=hist&column=a&format=bmp", 400),
+    ("kind=nope&column=a", 400),
+])
+def test_bad_plot_requests(trained_run, client, query, status):
+    assert client.get(f"/plots/{trained_run['dataset_id']}?{query}").status_code == status
+    assert client.get("/plots/0123abcd?kind=hist&column=a").status_code == 404
@@ -0,0 +1,48 @@
+# test_preprocessing.py
+import numpy as np
+import pandas as pd
+
+from preprocessing import PreprocessingPipeline
+
+
+def _frame(n=400, seed=0, missing=False):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        "x1": rng.normal(10, 3, n),
+        "x2": rng.exponential(2.0, n),
+        "city": rng.choice(["a", "b", "c", "d"], n),
+    })
+    if missing:
+        df.loc[rng.random(n) < 0.1, "x1"] = np.nan
+    return df
+
+
+def test_transform_matches_manual_cleaning():
+    df = _frame(missing=True)
+    pipe = PreprocessingPipeline().fit(df)
+    out = pipe.transform(df)
+
+    x1 = df["x1"].fillna(df["x1"].median())
+    q1, q3 = np.quantile(x1, [0.25, 0.75])
+    x1 = x1.clip(q1 - 1.5 * (q3 - q1), q3 + 1.5 * (q3 - q1))
+    np.testing.assert_allclose(out["x1"], (x1 - x1.mean()) / x1.std(ddof=0))
+
+    codes = df["city"].map({c: i for i, c in enumerate(sorted(df["city"].unique()))})
+    np.testing.assert_allclose(out["city"], (codes - codes.mean()) / codes.std(ddof=0))
+    assert list(out.columns) == list(df.columns)
+
+
+def test_unseen_and_missing_categories_map_to_the_training_mode():
+    df = _frame()
+    pipe = PreprocessingPipeline(scale=False).fit(df)
+    mode_code = list(pipe.classes_[0]).index(df["city"].mode()[0])
+    new = df.iloc[:2].copy()
+    new["city"] = ["zzz", None]
+    assert pipe.transform(new)["city"].tolist() == [mode_code, mode_code]
+
+
+def test_category_dtype_encodes_like_strings():
+    df = _frame()
+    as_cat = df.assign(city=df["city"].astype("category"))
+    pipe = PreprocessingPipeline().fit(df)
+    pd.testing.assert_frame_equal(pipe.transform(as_cat), pipe.transform(df))
@@ -0,0 +1,52 @@
+# test_profiling.py
+import time
+
+import metrics
+from profiling import RunProfiler, measure
+
+
+def test_run_profiler_records_each_stage():
+    profiler = RunProfiler()
+    profiler.stage("sleep")
+    time.sleep(0.2)
+    profiler.stage("spin")
+    with measure() as stats:
+        sum(i * i for i in range(300_000))
+    profile = profiler.finish()
+
+    assert [s["stage"] for s in profile["stages"]] == ["sleep", "spin"]
+    sleep, spin = profile["stages"]
+    assert sleep["wall_s"] >= 0.2 and sleep["cpu_s"] < sleep["wall_s"]
+    assert spin["cpu_s"] > 0 and spin["peak_rss_mb"] >= spin["start_rss_mb"] > 0
+    assert profile["total"]["wall_s"] >= sleep["wall_s"] + spin["wall_s"]
+    assert stats["wall_s"] > 0 and stats["peak_rss_mb"] > 0
+
+
+def test_pipeline_report_carries_the_profile(trained_run):
+    profile = trained_run["report"]["profile"]
+    stages = [s["stage"] for s in profile["stages"]]
+    assert len(stages) == len(set(stages)) > 3
+    assert trained_run["best_model"].replace("(Tuned)", "") in {f["model"] for f in profile["fits"]}
+    assert all(f["status"] in ("ok", "failed", "timed out") for f in profile["fits"])
+
+
+def test_histogram_renders_cumulative_buckets():
+    hist = metrics.Histogram("h_seconds", "help", ["stage"], buckets=(1, 5))
+    for value in (0.5, 2, 2, 10):
+        hist.observe(value, "fit")
+    hist.observe(None, "fit")
+    lines = hist.render()
+    assert 'h_seconds_bucket{stage="fit",le="1.0"} 1' in lines
+    assert 'h_seconds_bucket{stage="fit",le="5.0"} 3' in lines
+    assert 'h_seconds_bucket{stage="fit",le="+Inf"} 4' in lines
+    assert 'h_seconds_count{stage="fit"} 4' in lines and hist.mean("fit") == 14.5 / 4
+
+
+def test_metrics_endpoint_reports_finished_jobs(client):
+    before = metrics.JOBS._values.get(("succeeded",), 0)
+    metrics.observe_job("succeeded", 3.0, {"stages": [{"stage": "train", "wall_s": 2.0, "cpu_s": 1.0}],
+                                           "fits": [], "tuning": []})
+    res = client.get("/metrics")
+    assert res.status_code == 200 and res.headers["content-type"].startswith("text/plain")
+    assert f'automl_jobs_total{{status="succeeded"}} {before + 1}' in res.text.splitlines()
+    assert 'automl_stage_seconds_bucket{stage="train",le="2.5"}' in res.text
@@ -0,0 +1,83 @@
+# test_registry.py
+import os
+
+import pandas as pd
+import pytest
+
+from registry import ModelRegistry, artifact_nbytes
+
+
+def _records(path, n=5):
+    return pd.read_csv(path).drop(columns=["label"]).head(n)
+
+
+def test_registry_caches_and_sizes_models_from_their_files(trained_run):
+    registry = ModelRegistry("models")
+    entry = registry.get(trained_run["run_id"])
+    assert registry.get(trained_run["run_id"]) is entry
+    assert entry.nbytes == os.path.getsize(trained_run["model_path"]) \
+        + os.path.getsize(trained_run["preprocessor_path"])
+    assert registry.info() == [{"name": trained_run["run_id"], "model_name": trained_run["best_model"],
+                                "bytes": entry.nbytes}]
+    assert artifact_nbytes(trained_run["model_path"], None, "missing.pkl") \
+        == os.path.getsize(trained_run["model_path"])
+
+
+def test_rewriting_the_preprocessor_reloads_the_model(trained_run):
+    registry = ModelRegistry("models")
+    entry = registry.get(trained_run["run_id"])
+    st = os.stat(trained_run["preprocessor_path"])
+    os.utime(trained_run["preprocessor_path"], ns=(st.st_atime_ns, st.st_mtime_ns + 10 ** 9))
+    assert registry.get(trained_run["run_id"]) is not entry
+
+
+def test_registry_evicts_least_recently_used(dataset_csv):
+    from pipeline import run_automl_pipeline
+    runs = [run_automl_pipeline(dataset_csv, "label", use_cache=False, incremental=False)["run_id"]
+            for _ in range(3)]
+    registry = ModelRegistry("models", max_models=2)
+    for run_id in runs:
+        registry.get(run_id)
+    registry.get(runs[1])
+    registry.get(runs[0])
+    assert [e["name"] for e in registry.info()] == [runs[1], runs[0]]
+    assert registry.latest_run(registry.record(runs[2])["model_name"]) == runs[2]
+
+
+def test_unknown_and_invalid_runs_raise_key_error(workdir):
+    registry = ModelRegistry("models")
+    for run_id in ("0123abcd", "../models", ""):
+        with pytest.raises(KeyError):
+            registry.get(run_id)
+
+
+def test_predict_endpoints_score_with_the_runs_model(trained_run, dataset_csv, client):
+    run_id = trained_run["run_id"]
+    features = _records(dataset_csv)
+    expected = ModelRegistry("models").get(run_id).predict_frame(features)
+
+    res = client.post(f"/predict/{run_id}", json={"records": features.to_dict(orient="records")})
+    assert res.status_code == 200
+    body = res.json()
+    assert body["run_id"] == run_id and body["model"] == trained_run["best_model"]
+    assert [p["prediction"] for p in body["predictions"]] == expected["prediction"].tolist()
+
+    features.to_csv("batch.csv", index=False)
+    with open("batch.csv", "rb") as f:
+        res = client.post(f"/predict/{run_id}/batch", files={"file": ("batch.csv", f, "text/csv")})
+    assert res.status_code == 200
+    assert res.text.splitlines()[1:] == expected.to_csv(index=False).splitlines()[1:]
+
+    assert client.post("/predict/0123abcd", json={"records": [{"a": 1}]}).status_code == 404
+    assert client.post(f"/predict/{run_id}", json={"rows": []}).status_code == 400
+
+
+def test_download_model_by_run_id_and_deprecated_model_name(trained_run, client):
+    with open(trained_run["model_path"], "rb") as f:
+        content = f.read()
+    by_run = client.get("/download-model/", params={"run_id": trained_run["run_id"]})
+    by_name = client.get("/download-model/", params={"model_name": trained_run["best_model"]})
+    assert by_run.status_code == by_name.status_code == 200
+    assert by_run.content == by_name.content == content
+    assert client.get("/download-model/", params={"model_name": "Nope"}).status_code == 404
+    assert client.get("/download-model/").status_code == 400
@@ -0,0 +1,36 @@
+# test_report_pdf.py
+import os
+
+import report_pdf
+
+
+def test_long_tables_are_split_across_pages():
+    rows = [[i, i / 3, "x"] for i in range(25)]
+    pages = list(report_pdf.table_pages("Rows", ["n", "third", "s"], rows, rows_per_page=10))
+    assert len(pages) == 3
+    assert [t.get_text() for t in pages[-1].texts] == ["Rows (3/3)"]
+    assert len(list(report_pdf.table_pages("Empty", ["n"], []))) == 1
+
+
+def test_pdf_is_rendered_once_and_served_from_disk(client, trained_run):
+    res = client.get("/download-report-pdf/", params={"run_id": trained_run["run_id"]})
+    assert res.status_code == 200 and res.headers["content-type"] == "application/pdf"
+    assert res.content.startswith(b"%PDF")
+
+    pdf_path = report_pdf.pdf_path_for(trained_run["report_path"])
+    rendered = os.stat(pdf_path).st_mtime_ns
+    again = client.get("/download-report-pdf/", params={"report_path": trained_run["report_path"]})
+    assert again.content == res.content and os.stat(pdf_path).st_mtime_ns == rendered
+
+    # A newer report JSON is rendered again
+    os.utime(trained_run["report_path"], ns=(rendered + 10**9, rendered + 10**9))
+    client.get("/download-report-pdf/", params={"run_id": trained_run["run_id"]})
+    assert os.stat(pdf_path).st_mtime_ns > rendered
+
+
+def test_only_reports_in_the_report_dir_are_served(client, trained_run):
+    assert client.get("/download-report-pdf/", params={"run_id": "../models"}).status_code == 400
+    assert client.get("/download-report-pdf/", params={"run_id": "missing"}).status_code == 404
+    outside = os.path.join("..", os.path.basename(os.getcwd()), "data.csv")
+    assert client.get("/download-report-pdf/", params={"report_path": outside}).status_code == 404
+    assert client.get("/download-report-pdf/").status_code == 400
@@ -0,0 +1,36 @@
+# test_reporting.py
+import base64
+
+import numpy as np
+import pandas as pd
+
+import reporting
+from reporting import PlotCache, plan_plots, render_plots
+
+
+def _frame(n=200, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({"x": rng.normal(size=n), "y": rng.exponential(size=n), "z": rng.uniform(size=n),
+                         "k": rng.choice(["a", "b"], n)})
+
+
+def test_rendered_plots_are_cached_per_dataset(tmp_path, monkeypatch):
+    df = _frame()
+    descriptors, skipped = plan_plots(["x", "y", "z"], ["k"], {"k": 2})
+    # Enough cache misses for the process pool
+    assert skipped == [] and len(descriptors) >= reporting.PARALLEL_MIN_PLOTS
+    cache = PlotCache(str(tmp_path))
+    first = render_plots(df, descriptors, dataset_key="d1", cache=cache, workers=2)
+    assert all(base64.b64decode(v).startswith(b"\x89PNG") for v in first.values())
+
+    def fail(*args, **kwargs):
+        raise AssertionError("cached plot rendered again")
+
+    monkeypatch.setattr(reporting, "render_plot", fail)
+    assert render_plots(df, descriptors, dataset_key="d1", cache=cache, workers=1) == first
+
+
+def test_plot_columns_are_capped():
+    descriptors, skipped = plan_plots(["x", "y", "z"], ["k"], {"k": 40}, max_columns=2)
+    assert skipped == ["z", "k"]
+    assert descriptors == [("hist", "x"), ("box", "x"), ("hist", "y"), ("box", "y"), ("heatmap", None)]
@@ -0,0 +1,53 @@
+# test_run_cache.py
+import os
+import shutil
+
+from run_cache import RunCache, run_key
+from pipeline import run_automl_pipeline
+
+
+def test_repeat_run_is_served_from_the_cache(dataset_csv):
+    first = run_automl_pipeline(dataset_csv, "label", incremental=False)
+    assert first["cache"]["hit"] is False
+
+    # Cached model files are restored even when the run directory is gone
+    shutil.rmtree(os.path.join("models", first["run_id"]))
+    second = run_automl_pipeline(dataset_csv, "label", incremental=False)
+    assert second["cache"]["hit"] is True
+    assert second["run_id"] == first["run_id"] and second["best_model"] == first["best_model"]
+    assert os.path.exists(second["model_path"]) and os.path.exists(second["preprocessor_path"])
+
+    third = run_automl_pipeline(dataset_csv, "label", incremental=False, force_refresh=True)
+    assert third["cache"]["hit"] is False and third["run_id"] != first["run_id"]
+
+
+def test_changed_config_misses_the_cache(workdir):
+    assert run_key("d1", "label", {"search_mode": "grid"}) == run_key("d1", "label", {"search_mode": "grid"})
+    assert run_key("d1", "label", {"search_mode": "grid"}) != run_key("d1", "label", {"search_mode": "halving"})
+    assert run_key("d1", "label", {}) != run_key("d2", "label", {})
+    assert RunCache().get(run_key("d1", "label", {}), "models", "reports") is None
+
+
+def test_eviction_keeps_the_most_recently_used_entries(dataset_csv):
+    result = run_automl_pipeline(dataset_csv, "label", use_cache=False, incremental=False)
+    run = {"model_path": result["model_path"], "preprocessor_path": result["preprocessor_path"]}
+    cache = RunCache(max_entries=2)
+    for key in ("k1", "k2"):
+        cache.put(key, result, run)
+    os.utime(cache._dir("k1"), (0, 0))
+    assert cache.get("k1", "models", "reports") is not None   # a hit refreshes k1's access time
+    os.utime(cache._dir("k2"), (1, 1))
+    cache.put("k3", result, run)
+    assert sorted(os.listdir(cache.root)) == ["k1", "k3"]
+
+
+def test_api_answers_repeat_runs_from_the_cache(client, dataset_csv):
+    with open(dataset_csv, "rb") as f:
+        upload = client.post("/upload-dataset/", files={"file": ("data.csv", f, "text/csv")}).json()
+    first = run_automl_pipeline(upload["file_path"], "label", dataset_id=upload["dataset_id"])
+
+    res = client.post("/run-automl/", data={"dataset_id": upload["dataset_id"], "user_target": "label"})
+    assert res.status_code == 200
+    body = res.json()
+    assert body["job_id"] is None and body["status"] == "succeeded"
+    assert body["result"]["run_id"] == first["run_id"] and body["result"]["cache"]["hit"] is True
@@ -0,0 +1,53 @@
+# test_screening.py
+import numpy as np
+from sklearn.datasets import make_classification
+from sklearn.model_selection import train_test_split
+
+from functions import get_candidate_models
+from screening import NystroemSVC, screen_candidates, screening_rows, stratified_order
+
+
+def test_every_prefix_of_the_order_is_stratified():
+    y = np.repeat([0, 1, 2], [700, 200, 100])
+    order = stratified_order(y)
+    assert sorted(order) == list(range(len(y)))
+    for m in (10, 57, 300, 999):
+        counts = np.bincount(y[order[:m]], minlength=3)
+        np.testing.assert_allclose(counts, m * np.array([0.7, 0.2, 0.1]), atol=1.5)
+
+
+def test_regression_order_is_stratified_by_target_quantile():
+    y = np.random.default_rng(0).exponential(size=1000)
+    prefix = y[stratified_order(y, "regression")[:100]]
+    deciles = np.quantile(y, np.linspace(0, 1, 11))
+    np.testing.assert_array_equal(np.histogram(prefix, deciles)[0], np.full(10, 10))
+
+
+def test_screening_samples_by_cost_and_refits_the_best_on_all_rows():
+    X, y = make_classification(n_samples=2500, n_features=8, random_state=0)
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=0)
+    candidates = get_candidate_models("classification")
+
+    metrics, scores, models, names, summary = screen_candidates(
+        candidates, X_train, X_test, y_train, y_test, "classification", max_rows=1000, kernel_max_rows=1000,
+        top_k=1)
+
+    assert "SVC (Nystroem)" in names and "SVC" not in names
+    assert summary["sample_rows"] == {name: screening_rows(name, 2000, 1000) for name in names}
+    assert summary["sample_rows"]["LogisticRegression"] == 2000
+    assert summary["sample_rows"]["RandomForest"] == 1000
+    screened = max((m for m in metrics if not m["Model"].endswith("(full data)")), key=lambda m: m["F1"])
+    expected = [screened["Model"]] if screened["Train_Rows"] < 2000 else []
+    assert summary["refit_full_data"] == expected
+    assert [m["Train_Rows"] for m in metrics if m["Model"].endswith("(full data)")] == [2000] * len(expected)
+    best = names[int(np.argmax(scores))]
+    assert models[names.index(best)].predict(X_test).shape == y_test.shape
+
+
+def test_nystroem_svc_tracks_the_exact_kernel_svm():
+    from sklearn.svm import SVC
+    X, y = make_classification(n_samples=1500, n_features=8, random_state=1)
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.3, random_state=0)
+    exact = SVC().fit(X_train, y_train).score(X_test, y_test)
+    approx = NystroemSVC(n_components=300).fit(X_train, y_train).score(X_test, y_test)
+    assert approx >= exact - 0.05
@@ -0,0 +1,49 @@
+# test_search.py
+import numpy as np
+from sklearn.datasets import make_classification
+
+from search import SearchBudget, hyperband_search, successive_halving
+
+
+def _data(n=2000):
+    return make_classification(n_samples=n, n_features=8, n_informative=4, random_state=0)
+
+
+def test_successive_halving_keeps_the_best_third_on_growing_subsamples():
+    X, y = _data()
+    configs = list(enumerate([("LogisticRegression", {"C": c}) for c in np.logspace(-4, 2, 9)]))
+    survivors, rungs = successive_halving(configs, X, y, "classification", SearchBudget(), eta=3,
+                                          min_resource=1 / 9)
+
+    # 9 -> 3 -> 1: the search stops once a single configuration survives
+    assert [len(r["evaluated"]) for r in rungs] == [9, 3]
+    assert [r["n_rows"] for r in rungs] == [200, 533]
+    for rung, following in zip(rungs, rungs[1:]):
+        kept = {e["config_id"] for e in following["evaluated"]}
+        assert kept.isdisjoint(rung["pruned"])
+        best = sorted(rung["evaluated"], key=lambda e: -e["score"])[:len(kept)]
+        assert kept == {e["config_id"] for e in best}
+    best = max(rungs[-1]["evaluated"], key=lambda e: e["score"])
+    assert [s[1] for s in survivors] == [best["config_id"]]
+
+
+def test_failed_configurations_are_pruned_with_their_error():
+    X, y = _data()
+    configs = [(0, ("LogisticRegression", {"C": -1.0})), (1, ("LogisticRegression", {"C": 1.0}))]
+    survivors, rungs = successive_halving(configs, X, y, "classification", SearchBudget(), eta=2,
+                                          min_resource=1 / 4)
+    failed = [e for e in rungs[0]["evaluated"] if e["config_id"] == 0][0]
+    assert failed["score"] == -np.inf and "C" in failed["error"]
+    assert [s[1] for s in survivors] == [1]
+
+
+def test_hyperband_respects_the_fit_budget_and_refits_the_winner():
+    X, y = _data()
+    fit_log = []
+    model, family, score, report = hyperband_search(X, y, "classification", max_fits=12, n_configs=9,
+                                                    fit_log=fit_log)
+    assert report["fits"] == len(fit_log) == 12 and report["budget_exhausted"]
+    evaluated = [e for r in report["rungs"] for e in r["evaluated"]]
+    assert len(evaluated) == 12
+    assert report["best"]["model"] == family and score == max(f["score"] for f in report["family_best"].values())
+    assert model.predict(X).shape == y.shape
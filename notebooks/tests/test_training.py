@@ -0,0 +1,66 @@
+# test_training.py
+import time
+
+import pytest
+from sklearn.datasets import make_classification
+from sklearn.linear_model import LogisticRegression
+from sklearn.model_selection import train_test_split
+from sklearn.tree import DecisionTreeClassifier
+
+from functions import train_candidates
+
+
+class SlowClassifier(DecisionTreeClassifier):
+    """Stands in for a candidate that overruns its budget (picklable for the spawned workers)."""
+
+    def fit(self, X, y):
+        time.sleep(60)
+        return super().fit(X, y)
+
+
+class BrokenClassifier(DecisionTreeClassifier):
+    def fit(self, X, y):
+        raise ValueError("cannot fit")
+
+
+@pytest.fixture(scope="module")
+def split():
+    X, y = make_classification(n_samples=300, n_features=8, random_state=0)
+    return train_test_split(X, y, test_size=0.25, random_state=0)
+
+
+def _candidates():
+    return {"LogisticRegression": LogisticRegression(), "Tree": DecisionTreeClassifier(random_state=0)}
+
+
+def test_parallel_training_matches_sequential(split):
+    X_train, X_test, y_train, y_test = split
+    sequential = train_candidates(_candidates(), X_train, X_test, y_train, y_test, "classification")
+    parallel = train_candidates(_candidates(), X_train, X_test, y_train, y_test, "classification", n_jobs=2)
+    assert parallel[3] == sequential[3]
+    assert parallel[1] == pytest.approx(sequential[1])
+
+
+def test_slow_and_failing_candidates_are_dropped(split):
+    X_train, X_test, y_train, y_test = split
+    candidates = dict(_candidates(), Slow=SlowClassifier(), Broken=BrokenClassifier())
+    fit_log, seen = [], []
+    started = time.monotonic()
+    metrics, scores, models, names = train_candidates(
+        candidates, X_train, X_test, y_train, y_test, "classification", n_jobs=2, timeout=10,
+        fit_log=fit_log, on_result=seen.append
+    )
+    assert time.monotonic() - started < 45
+    status = {m["Model"]: m["Status"] for m in metrics}
+    assert status == {"LogisticRegression": "ok", "Tree": "ok", "Slow": "timed out", "Broken": "failed"}
+    assert sorted(names) == ["LogisticRegression", "Tree"] and len(scores) == len(models) == 2
+    assert "cannot fit" in next(m["Error"] for m in metrics if m["Model"] == "Broken")
+    assert sorted(e["model"] for e in fit_log) == sorted(candidates)
+    assert {e["Model"]: e["Score"] is not None for e in seen} == {"LogisticRegression": True, "Tree": True,
+                                                                "Slow": False, "Broken": False}
+
+
+def test_no_successful_candidate_is_an_error(split):
+    X_train, X_test, y_train, y_test = split
+    with pytest.raises(RuntimeError, match="No candidate"):
+        train_candidates({"Broken": BrokenClassifier()}, X_train, X_test, y_train, y_test, "classification")
@@ -0,0 +1,52 @@
+# test_tuning.py
+import os
+import numpy as np
+import pytest
+from scipy import sparse
+from sklearn.linear_model import Ridge
+from sklearn.model_selection import KFold, RandomizedSearchCV, StratifiedKFold
+
+from tuning import FoldCache, cached_random_search
+
+
+@pytest.mark.parametrize("problem_type,splitter", [("classification", StratifiedKFold), ("regression", KFold)])
+def test_fold_cache_matches_the_search_split(tmp_path, problem_type, splitter):
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(90, 4))
+    y = rng.integers(0, 3, 90) if problem_type == "classification" else rng.normal(size=90)
+
+    with FoldCache(X, y, problem_type, n_splits=3, folder=str(tmp_path)) as cache:
+        expected = list(splitter(3).split(X, y))
+        for i, (train, val) in enumerate(expected):
+            X_tr, y_tr, X_val, y_val = cache.fold(i)
+            assert isinstance(X_tr, np.memmap)
+            np.testing.assert_array_equal(X_tr, X[train])
+            np.testing.assert_array_equal(y_tr, y[train])
+            np.testing.assert_array_equal(X_val, X[val])
+            np.testing.assert_array_equal(y_val, y[val])
+        folder = cache.folder
+    assert not os.path.exists(folder)
+
+
+def test_fold_cache_keeps_sparse_matrices(tmp_path):
+    X = sparse.random(60, 10, density=0.2, format="csr", random_state=0)
+    y = np.arange(60) % 2
+    with FoldCache(X, y, "classification", n_splits=3, folder=str(tmp_path)) as cache:
+        train, _ = cache.folds[0]
+        X_tr = cache.fold(0)[0]
+        assert sparse.issparse(X_tr)
+        np.testing.assert_array_equal(X_tr.toarray(), X[train].toarray())
+
+
+def test_cached_random_search_scores_like_randomized_search_cv():
+    rng = np.random.default_rng(1)
+    X = rng.normal(size=(120, 5))
+    y = X @ rng.normal(size=5) + rng.normal(size=120)
+    params = {"alpha": [0.01, 0.1, 1.0, 10.0, 100.0], "fit_intercept": [True, False]}
+
+    best, results = cached_random_search(Ridge(), params, X, y, "regression", "r2", n_iter=6, cv=3, n_jobs=1)
+    search = RandomizedSearchCV(Ridge(), params, n_iter=6, cv=3, scoring="r2", random_state=42).fit(X, y)
+
+    assert results["params"] == list(search.cv_results_["params"])
+    np.testing.assert_allclose(results["mean_test_score"], search.cv_results_["mean_test_score"])
+    assert best.get_params() == search.best_estimator_.get_params()
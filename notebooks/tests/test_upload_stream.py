@@ -0,0 +1,68 @@
+# test_upload_stream.py
+import asyncio
+import hashlib
+import io
+import os
+
+import pytest
+
+from upload_stream import HeaderTooLong, UploadTooLarge, sniff_csv, stream_upload_to_disk
+
+
+class _Upload:
+    """The part of starlette's UploadFile that stream_upload_to_disk uses."""
+
+    def __init__(self, data):
+        self._f = io.BytesIO(data)
+
+    async def read(self, size=-1):
+        return self._f.read(size)
+
+
+def _rows(n, width=3):
+    # Fixed-width rows, so the extrapolated row count is exact up to rounding
+    return "".join(",".join(f"{(i * width + j) % 1000:03d}" for j in range(width)) + "\n" for i in range(n))
+
+
+def test_upload_is_copied_and_hashed_in_chunks(tmp_path):
+    data = os.urandom(10_000)
+    dest = tmp_path / "upload.part"
+    size, digest = asyncio.run(stream_upload_to_disk(_Upload(data), str(dest), chunk_size=1024))
+    assert (size, digest) == (len(data), hashlib.sha256(data).hexdigest())
+    assert dest.read_bytes() == data
+
+    with pytest.raises(UploadTooLarge):
+        asyncio.run(stream_upload_to_disk(_Upload(data), str(dest), max_bytes=5000, chunk_size=1024))
+    assert not dest.exists()
+
+
+def test_sniff_counts_small_files_and_estimates_large_ones(tmp_path):
+    small = tmp_path / "small.csv"
+    small.write_text('a,b,c\n1,"two\nlines",3\n' + _rows(10))
+    assert sniff_csv(str(small)) == {"columns": ["a", "b", "c"], "row_estimate": 11, "row_count_exact": True,
+                                     "size_bytes": small.stat().st_size}
+
+    large = tmp_path / "large.csv"
+    large.write_text("a,b,c\n" + _rows(20_000))
+    info = sniff_csv(str(large), sample_bytes=4096)
+    assert not info["row_count_exact"]
+    assert info["row_estimate"] == pytest.approx(20_000, abs=1)
+
+
+def test_sniff_reads_past_the_sample_for_wide_headers(tmp_path):
+    wide = tmp_path / "wide.csv"
+    columns = [f"column_{i}" for i in range(2000)]
+    wide.write_text(",".join(columns) + "\n" + _rows(3, width=2000))
+    info = sniff_csv(str(wide), sample_bytes=1024)
+    assert info["columns"] == columns and info["row_estimate"] > 0
+
+    with pytest.raises(HeaderTooLong, match="header"):
+        sniff_csv(str(wide), sample_bytes=1024, max_bytes=4096)
+
+
+def test_upload_endpoint_registers_and_rejects_empty_files(client):
+    res = client.post("/upload-dataset/", files={"file": ("d.csv", b"a,b\n1,2\n3,4\n", "text/csv")})
+    body = res.json()
+    assert res.status_code == 200 and body["columns"] == ["a", "b"] and body["rows"] == 2
+    assert client.post("/upload-dataset/", files={"file": ("e.csv", b"a,b\n", "text/csv")}).status_code == 400
+    assert os.listdir("uploads") == ["datasets"]
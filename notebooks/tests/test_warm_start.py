@@ -0,0 +1,47 @@
+# test_warm_start.py
+import numpy as np
+import pandas as pd
+import pytest
+
+from preprocessing import PreprocessingPipeline
+
+
+def _frame(n=400, seed=0, missing=False):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        "x1": rng.normal(10, 3, n),
+        "x2": rng.exponential(2.0, n),
+        "city": rng.choice(["a", "b", "c", "d"], n),
+    })
+    if missing:
+        df.loc[rng.random(n) < 0.1, "x1"] = np.nan
+    return df
+
+
+def test_partial_fit_over_two_halves_equals_fit_on_whole():
+    df = _frame()
+    kwargs = {"default_missing": "mean", "outlier_method": None}
+    whole = PreprocessingPipeline(**kwargs).fit(df)
+    halves = PreprocessingPipeline(**kwargs).fit(df.iloc[:200]).partial_fit(df.iloc[200:])
+
+    for attr in ("num_fill_", "num_mean_", "num_std_", "cat_mean_", "cat_std_"):
+        np.testing.assert_allclose(getattr(halves, attr), getattr(whole, attr), err_msg=attr)
+    assert halves.n_samples_ == whole.n_samples_
+    pd.testing.assert_frame_equal(halves.transform(df), whole.transform(df))
+
+
+def test_partial_fit_merges_mean_fill_by_non_null_count():
+    df = _frame(missing=True)
+    whole = PreprocessingPipeline(default_missing="mean").fit(df)
+    halves = PreprocessingPipeline(default_missing="mean").fit(df.iloc[:150]).partial_fit(df.iloc[150:])
+    np.testing.assert_allclose(halves.num_fill_, whole.num_fill_)
+    assert halves.num_fill_[0] == pytest.approx(df["x1"].mean())
+
+
+def test_partial_fit_appends_new_categories_after_known_codes():
+    df = _frame()
+    pipe = PreprocessingPipeline().fit(df)
+    known = list(pipe.classes_[0])
+    extra = df.iloc[:10].assign(city="z")
+    pipe.partial_fit(extra)
+    assert list(pipe.classes_[0]) == known + ["z"]
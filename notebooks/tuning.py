@@ -0,0 +1,199 @@
+# tuning.py
+import os
+import time
+import shutil
+import tempfile
+import numpy as np
+import joblib
+from joblib import Parallel, delayed, effective_n_jobs
+
+# -----------------------------
+# Defaults
+# -----------------------------
+# "fold_cache" (FoldCache + cached_random_search) or "sklearn" (plain RandomizedSearchCV)
+TUNING_ENGINE = os.environ.get("AUTOML_TUNING_ENGINE", "fold_cache")
+# Fold matrices live here; tmpfs keeps them in shared memory across worker processes
+FOLD_CACHE_DIR = os.environ.get("AUTOML_FOLD_CACHE_DIR") or ("/dev/shm" if os.path.isdir("/dev/shm") else None)
+
+
+def _take(X, rows):
+    return X.iloc[rows] if hasattr(X, "iloc") else X[rows]
+
+
+class FoldCache:
+    """
+    The cross-validation split of one tuning run, built once.
+
+    Every fold's (X_train, y_train, X_val, y_val) is dumped to
+    `folder` when the cache is created and re-opened memory-mapped
+    (fold(i), or load_fold(path) in a worker process), so the tuning jobs
+    share one copy of the matrices instead of each getting a pickled one.
+    Dense arrays and the data / indices / indptr arrays of sparse matrices
+    are mapped; the directory is removed by close().
+
+    The split is the one RandomizedSearchCV(cv=n_splits) would make:
+    StratifiedKFold for classification, KFold otherwise, unshuffled.
+    """
+
+    def __init__(self, X, y, problem_type, n_splits=3, folder=FOLD_CACHE_DIR):
+        from sklearn.model_selection import KFold, StratifiedKFold
+        y = np.asarray(y)
+        splitter = StratifiedKFold(n_splits) if problem_type == "classification" else KFold(n_splits)
+        self.folds = list(splitter.split(np.zeros((len(y), 1)), y))
+        self.n_splits = n_splits
+        self._dmatrices = {}
+        self._loaded = {}
+        try:
+            self.folder = self._dump(X, y, folder)
+        except OSError:
+            # A full tmpfs (e.g. a container's 64 MB /dev/shm): fall back to the default temp dir
+            self.folder = self._dump(X, y, None)
+
+    def _dump(self, X, y, folder):
+        path = tempfile.mkdtemp(prefix="automl_folds_", dir=folder)
+        try:
+            self.paths = []
+            for i, (train, val) in enumerate(self.folds):
+                fold_path = os.path.join(path, f"fold_{i}.joblib")
+                joblib.dump((_take(X, train), y[train], _take(X, val), y[val]), fold_path)
+                self.paths.append(fold_path)
+        except OSError:
+            shutil.rmtree(path, ignore_errors=True)
+            raise
+        return path
+
+    def fold(self, i):
+        if i not in self._loaded:
+            self._loaded[i] = load_fold(self.paths[i])
+        return self._loaded[i]
+
+    def dmatrices(self, i, enable_categorical=False, max_bin=None):
+        """
+        XGBoost matrices of fold i, built on first use: a QuantileDMatrix
+        for training (the histogram sketch is computed once per fold, not
+        once per configuration) and a DMatrix for validation.
+        """
+        import xgboost as xgb
+        key = (i, bool(enable_categorical), max_bin)
+        if key not in self._dmatrices:
+            X_tr, y_tr, X_val, y_val = self.fold(i)
+            kwargs = {"max_bin": max_bin} if max_bin else {}
+            dtrain = xgb.QuantileDMatrix(X_tr, y_tr, enable_categorical=enable_categorical, **kwargs)
+            dval = xgb.DMatrix(X_val, y_val, enable_categorical=enable_categorical)
+            self._dmatrices[key] = (dtrain, dval)
+        return self._dmatrices[key]
+
+    def close(self):
+        self._dmatrices.clear()
+        self._loaded.clear()
+        shutil.rmtree(self.folder, ignore_errors=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def load_fold(path):
+    return joblib.load(path, mmap_mode="r")
+
+
+def _fit_score_fold(estimator, fold_path, scoring):
+    """Worker: fit one configuration on one cached fold; returns (score, fit_s, score_s)."""
+    from sklearn.metrics import get_scorer
+    X_tr, y_tr, X_val, y_val = load_fold(fold_path)
+    started = time.perf_counter()
+    estimator.fit(X_tr, y_tr)
+    fitted = time.perf_counter()
+    score = get_scorer(scoring)(estimator, X_val, y_val)
+    return score, fitted - started, time.perf_counter() - fitted
+
+
+def _booster_params(estimator, n_classes):
+    params = {k: v for k, v in estimator.get_xgb_params().items()
+              if v is not None and k not in ("use_label_encoder", "sample_weight")}
+    if "n_jobs" in params:
+        params["nthread"] = params.pop("n_jobs")
+    params.setdefault("tree_method", "hist")
+    if n_classes > 2:
+        params.update(objective="multi:softprob", num_class=n_classes)
+    return params
+
+
+def _xgb_fit_score_fold(estimator, cache, i, scoring, n_classes):
+    """Train a configuration on fold i's cached DMatrix and score it through its sklearn class."""
+    import xgboost as xgb
+    from sklearn.base import clone
+    from sklearn.metrics import get_scorer
+    params = _booster_params(estimator, n_classes)
+    dtrain, _ = cache.dmatrices(i, estimator.get_params().get("enable_categorical", False),
+                                params.get("max_bin"))
+    started = time.perf_counter()
+    booster = xgb.train(params, dtrain, num_boost_round=estimator.get_num_boosting_rounds())
+    fitted = time.perf_counter()
+    model = clone(estimator)
+    model.load_model(bytearray(booster.save_raw("ubj")))
+    _, _, X_val, y_val = cache.fold(i)
+    score = get_scorer(scoring)(model, X_val, y_val)
+    return score, fitted - started, time.perf_counter() - fitted
+
+
+def cached_random_search(estimator, param_distributions, X, y, problem_type, scoring, n_iter=20, cv=3,
+                         n_jobs=-1, random_state=42, family=None, on_result=None):
+    """
+    RandomizedSearchCV equivalent on a FoldCache.
+
+    Configurations come from the same ParameterSampler, folds from the same
+    split, and the best mean-score configuration is refitted on all of X, y.
+    XGBoost trains in threads of this process on per-fold QuantileDMatrix
+    objects built once, each booster with an equal share of the CPUs; other
+    families fit (configuration, fold) pairs in joblib workers that open
+    the memory-mapped folds by path.
+
+    `on_result(i, params, mean_score)` is called as soon as configuration i
+    has been scored on every fold (in sampling order).
+
+    Returns (best_estimator, cv_results) with cv_results holding "params",
+    "mean_test_score", "mean_fit_time" and "mean_score_time" per configuration.
+    """
+    from sklearn.base import clone
+    from sklearn.model_selection import ParameterSampler
+    configs = list(ParameterSampler(param_distributions, n_iter, random_state=random_state))
+    is_xgb = family == "XGBoost" or type(estimator).__module__.startswith("xgboost")
+    with FoldCache(X, y, problem_type, n_splits=cv) as cache:
+        if is_xgb:
+            n_classes = len(np.unique(y)) if problem_type == "classification" else 0
+            n_workers = max(1, min(effective_n_jobs(n_jobs), len(configs) * cv))
+            threads = max(1, (os.cpu_count() or 1) // n_workers)
+            base = estimator.get_params()
+            for i in range(cv):
+                # Built up front so the worker threads only read them
+                cache.fold(i)
+                cache.dmatrices(i, base.get("enable_categorical", False), base.get("max_bin"))
+            out = Parallel(n_jobs=n_workers, prefer="threads", return_as="generator")(
+                delayed(_xgb_fit_score_fold)(clone(estimator).set_params(**p, n_jobs=threads), cache, i, scoring,
+                                             n_classes)
+                for p in configs for i in range(cv)
+            )
+        else:
+            out = Parallel(n_jobs=n_jobs, return_as="generator")(
+                delayed(_fit_score_fold)(clone(estimator).set_params(**p), path, scoring)
+                for p in configs for path in cache.paths
+            )
+        results = []
+        for k, fold_result in enumerate(out):
+            results.append(fold_result)
+            if on_result is not None and (k + 1) % cv == 0:
+                i = k // cv
+                on_result(i, configs[i], float(np.mean([r[0] for r in results[-cv:]])))
+    out = np.asarray(results, dtype=float).reshape(len(configs), cv, 3)
+    cv_results = {
+        "params": configs,
+        "mean_test_score": out[:, :, 0].mean(axis=1),
+        "mean_fit_time": out[:, :, 1].mean(axis=1),
+        "mean_score_time": out[:, :, 2].mean(axis=1),
+    }
+    best = int(np.nanargmax(cv_results["mean_test_score"]))
+    best_estimator = clone(estimator).set_params(**configs[best]).fit(X, y)
+    return best_estimator, cv_results
@@ -0,0 +1,98 @@
+# upload_stream.py
+import io
+import os
+import csv
+import hashlib
+
+# -----------------------------
+# Defaults
+# -----------------------------
+UPLOAD_CHUNK_BYTES = 1024 * 1024
+MAX_UPLOAD_BYTES = int(os.environ.get("AUTOML_MAX_UPLOAD_BYTES", 10 * 1024 ** 3))
+SNIFF_BYTES = 1024 * 1024
+# Hard cap on the bytes read to find the header and the first row
+SNIFF_MAX_BYTES = int(os.environ.get("AUTOML_SNIFF_MAX_BYTES", 64 * 1024 ** 2))
+
+
+class UploadTooLarge(Exception):
+    """Raised when an upload exceeds the configured maximum size."""
+
+
+class HeaderTooLong(ValueError):
+    """Raised when the CSV header (or first row) doesn't end within SNIFF_MAX_BYTES."""
+
+
+async def stream_upload_to_disk(upload, dest_path, max_bytes=MAX_UPLOAD_BYTES,
+                                chunk_size=UPLOAD_CHUNK_BYTES):
+    """
+    Copy an UploadFile to `dest_path` in fixed-size chunks, hashing as it goes.
+
+    Only one chunk is held in memory at a time. The partial file is removed
+    if the upload exceeds `max_bytes`.
+
+    Returns (size_bytes, sha256_hexdigest).
+    """
+    h = hashlib.sha256()
+    size = 0
+    try:
+        with open(dest_path, "wb") as f:
+            while True:
+                block = await upload.read(chunk_size)
+                if not block:
+                    break
+                size += len(block)
+                if size > max_bytes:
+                    raise UploadTooLarge(f"Upload exceeds the {max_bytes} byte limit.")
+                h.update(block)
+                f.write(block)
+    except BaseException:
+        if os.path.exists(dest_path):
+            os.remove(dest_path)
+        raise
+    return size, h.hexdigest()
+
+
+def sniff_csv(path, sample_bytes=SNIFF_BYTES, encoding="utf-8-sig", max_bytes=SNIFF_MAX_BYTES):
+    """
+    Read the header and estimate the row count from the first `sample_bytes`.
+
+    Rows in the sample are parsed with the csv module (so quoted newlines are
+    handled) and the average row width is extrapolated to the file size. For
+    files smaller than the sample the count is exact. Very wide files are
+    read further, up to `max_bytes`, until the sample holds the header and
+    one complete row; HeaderTooLong is raised when they don't fit.
+    """
+    file_size = os.path.getsize(path)
+    with open(path, "rb") as f:
+        raw = f.read(sample_bytes)
+        while len(raw) < file_size and raw.count(b"\n") < 2:
+            if len(raw) >= max_bytes:
+                part = "header" if b"\n" not in raw else "first row"
+                raise HeaderTooLong(f"CSV {part} is longer than {max_bytes} bytes")
+            raw += f.read(sample_bytes)
+
+    complete = raw if len(raw) == file_size else raw[:raw.rfind(b"\n") + 1]
+    text = complete.decode(encoding, errors="replace")
+    reader = csv.reader(io.StringIO(text))
+    try:
+        header = next(reader)
+    except StopIteration:
+        raise ValueError("Dataset is empty")
+
+    header_bytes = len(complete.split(b"\n", 1)[0]) + 1
+    rows = sum(1 for row in reader if row)
+    if rows == 0:
+        raise ValueError("Dataset is empty")
+
+    if len(raw) == file_size:
+        row_estimate, exact = rows, True
+    else:
+        avg_row_bytes = (len(complete) - header_bytes) / rows
+        row_estimate, exact = int((file_size - header_bytes) / avg_row_bytes), False
+
+    return {
+        "columns": header,
+        "row_estimate": row_estimate,
+        "row_count_exact": exact,
+        "size_bytes": file_size,
+    }
@@ -0,0 +1,41 @@
+# warmup.py
+import os
+import time
+import importlib
+
+# -----------------------------
+# Defaults
+# -----------------------------
+# Which processes import the heavy stack ahead of the first request:
+# "none", "workers" (job pool processes), "api" (the API process) or "all"
+PREWARM = os.environ.get("AUTOML_PREWARM", "none")
+
+# What a job worker needs for a training run
+TRAINING_MODULES = ("functions", "preprocessing", "screening", "search", "tuning", "incremental",
+                    "sklearn.ensemble", "sklearn.linear_model", "sklearn.svm", "xgboost")
+# What the API process loads on its first prediction / plot request
+SERVING_MODULES = ("preprocessing", "sklearn.ensemble", "sklearn.linear_model", "sklearn.svm", "xgboost",
+                   "matplotlib.figure", "matplotlib.backends.backend_agg", "seaborn")
+
+
+def prewarm(modules=TRAINING_MODULES):
+    """
+    Import `modules` now instead of in the first stage that needs them.
+    Returns {module: seconds}, None for modules that aren't installed.
+    """
+    timings = {}
+    for name in modules:
+        started = time.perf_counter()
+        try:
+            importlib.import_module(name)
+        except ImportError:
+            timings[name] = None
+            continue
+        timings[name] = time.perf_counter() - started
+    return timings
+
+
+def prewarms(target, mode=None):
+    """Whether `target` ("workers" or "api") is pre-warmed under `mode` (default AUTOML_PREWARM)."""
+    mode = (mode or PREWARM).lower()
+    return mode == "all" or mode == target